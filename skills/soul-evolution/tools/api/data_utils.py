@@ -1,7 +1,10 @@
 import json
 import os
 import re
-import glob
+import hashlib
+import threading
+from core.record_index import RecordIndex
+from core.workspace_store import FileCache, WorkspaceStore, load_json, load_jsonl
 
 def parse_soul_md(content: str) -> list:
     nodes = []
@@ -27,59 +30,225 @@ def parse_soul_md(content: str) -> list:
             elif nodes: nodes[-1]["children"].append(bullet)
     return nodes
 
-def load_json(fp):
-    if not os.path.exists(fp): return {}
-    try:
-        with open(fp, "r") as f: return json.load(f)
-    except: return {}
-
-def load_jsonl(fp):
-    items = []
-    if not os.path.exists(fp): return items
-    try:
-        with open(fp, "r") as f:
-            for line in f:
-                if line.strip():
-                    try: items.append(json.loads(line))
-                    except: pass
-    except: pass
-    return items
+def _load_soul(fp):
+    with open(fp, "r") as f: content = f.read()
+    return content, parse_soul_md(content)
 
-def collect_data(workspace: str) -> dict:
+_cache = FileCache()
+
+# Documents read by handlers go through the server's WorkspaceStore once registered;
+# paths are absolute, so the stand-in store never needs to know the workspace
+_store = WorkspaceStore(os.getcwd(), cache=_cache)
+
+def use_store(store):
+    global _store, _cache
+    _store, _cache = store, store.cache
+
+def read_document(fp):
+    """Cached load_json(); hot documents come from memory. The result must not be mutated."""
+    return _store.read_json(fp)
+
+def tail_records(fp, n, predicate=None):
+    """The last n records of a log (oldest first), read backwards from EOF."""
+    return _store.tail_jsonl(fp, n, predicate)
+
+def count_records(fp):
+    """Non-empty lines of a log, recounted only when the file changes."""
+    return _cache.get(fp, _count_records, default=0)
+
+def update_document(fp, fn):
+    """Read-modify-write: fn(data) edits a private copy in place."""
+    _store.update_json(fp, fn)
+
+def merge_document(fp, delta):
+    _store.merge_json(fp, delta)
+
+def write_document(fp, data):
+    _store.write_json(fp, data)
+
+def transaction():
+    """Writes several documents with one sync: with transaction() as tx: tx.write_json(...)"""
+    return _store.transaction()
+
+_record_indexes = {}
+_record_lock = threading.Lock()
+
+def record_index(workspace):
+    """The workspace's experience/reflection index (sidecar in memory/cache/), opened once per process."""
+    with _record_lock:
+        if workspace not in _record_indexes:
+            _record_indexes[workspace] = RecordIndex(os.path.join(workspace, "memory"))
+        return _record_indexes[workspace]
+
+# Page sections backed by a single reality document (memory/reality/<file>)
+REALITY_SECTIONS = {
+    "physique": "physique.json",
+    "interests": "interests.json",
+    "world_state": "world_state.json",
+    "reputation": "reputation.json",
+    "news": "news.json",
+    "social_events": "social_events.json",
+    "vault_state": "vault_state.json",
+    "interior": "interior.json",
+    "inventory": "inventory.json",
+    "wardrobe": "wardrobe.json",
+    "skills": "skills.json",
+}
+
+# Page sections backed by an append-only log (relative to memory/)
+JSONL_SECTIONS = {
+    "changes": "soul_changes.jsonl",
+    "reflections": "reflections.jsonl",
+    "proposals_pending": os.path.join("proposals", "pending.jsonl"),
+    "significant": os.path.join("significant", "significant.jsonl"),
+}
+
+SECTIONS = ["soul_tree", "identity_raw", "changes", "experiences", "reflections", "proposals_pending",
+            "significant", *REALITY_SECTIONS, "photos", "system_config"]
+
+# Sections whose record counts are part of the bootstrap payload
+COUNTED_SECTIONS = ["experiences", "reflections", "changes", "proposals_pending", "significant", "photos"]
+
+def section_sources(workspace: str, name: str) -> list:
+    """Files and directories a single page section is built from."""
     memory_dir = os.path.join(workspace, "memory")
     reality_dir = os.path.join(memory_dir, "reality")
-    
-    soul_path = os.path.join(workspace, "SOUL.md")
-    soul_content = ""
-    if os.path.exists(soul_path):
-        with open(soul_path, "r") as f: soul_content = f.read()
-    
-    data = {
-        "soul_tree": parse_soul_md(soul_content),
-        "identity_raw": soul_content,
-        "changes": load_jsonl(os.path.join(memory_dir, "soul_changes.jsonl")),
-        "experiences": [],
-        "reflections": load_jsonl(os.path.join(memory_dir, "reflections.jsonl")),
-        "proposals_pending": load_jsonl(os.path.join(memory_dir, "proposals", "pending.jsonl")),
-        "significant": load_jsonl(os.path.join(memory_dir, "significant", "significant.jsonl")),
-        "physique": load_json(os.path.join(reality_dir, "physique.json")),
-        "interests": load_json(os.path.join(reality_dir, "interests.json")),
-        "world_state": load_json(os.path.join(reality_dir, "world_state.json")),
-        "reputation": load_json(os.path.join(reality_dir, "reputation.json")),
-        "news": load_json(os.path.join(reality_dir, "news.json")),
-        "social_events": load_json(os.path.join(reality_dir, "social_events.json")),
-        "vault_state": load_json(os.path.join(reality_dir, "vault_state.json")),
-        "interior": load_json(os.path.join(reality_dir, "interior.json")),
-        "inventory": load_json(os.path.join(reality_dir, "inventory.json")),
-        "wardrobe": load_json(os.path.join(reality_dir, "wardrobe.json")),
-        "skills": load_json(os.path.join(reality_dir, "skills.json")),
-        "photos": [os.path.basename(f) for f in glob.glob(os.path.join(reality_dir, "photos", "*.png"))],
-        "system_config": {"openai_ok": True, "anthropic_ok": True}
-    }
-
     exp_dir = os.path.join(memory_dir, "experiences")
-    if os.path.isdir(exp_dir):
-        for fp in sorted(glob.glob(os.path.join(exp_dir, "*.jsonl")))[-7:]:
-            data["experiences"].extend(load_jsonl(fp))
-            
+    if name in ("soul_tree", "identity_raw"):
+        return [os.path.join(workspace, "SOUL.md")]
+    if name in JSONL_SECTIONS:
+        return [os.path.join(memory_dir, JSONL_SECTIONS[name])]
+    if name in REALITY_SECTIONS:
+        return [os.path.join(reality_dir, REALITY_SECTIONS[name])]
+    if name == "photos":
+        return [os.path.join(reality_dir, "photos")]
+    if name == "experiences":
+        return [exp_dir] + [os.path.join(exp_dir, n) for n in _cache.listdir(exp_dir, "*.jsonl")[-7:]]
+    return []
+
+def source_paths(workspace: str) -> list:
+    """Every file and directory collect_data reads, in a stable order."""
+    paths = []
+    for name in SECTIONS:
+        paths += [fp for fp in section_sources(workspace, name) if fp not in paths]
+    return paths
+
+def _signature(fp):
+    # Hot documents change in memory long before they are flushed to disk
+    if _store.hot and _store.hot.for_path(fp): return ("hot", _store.version(fp))
+    return FileCache.signature(fp)
+
+def _version(paths) -> str:
+    h = hashlib.blake2b(digest_size=12)
+    for fp in paths:
+        h.update(repr((fp, _signature(fp))).encode())
+    return h.hexdigest()
+
+def data_version(workspace: str) -> str:
+    """Cheap fingerprint of collect_data's inputs: one stat() per source, no reads."""
+    return _version(source_paths(workspace))
+
+def section_version(workspace: str, name: str) -> str:
+    return _version(section_sources(workspace, name))
+
+def _count_records(fp):
+    with open(fp, "rb") as f:
+        return sum(1 for line in f if line.strip())
+
+def load_section(workspace: str, name: str):
+    """Builds one page section from its (cached) sources."""
+    sources = section_sources(workspace, name)
+    if name in ("soul_tree", "identity_raw"):
+        soul_content, soul_tree = _cache.get(sources[0], _load_soul, default=("", []))
+        return soul_tree if name == "soul_tree" else soul_content
+    if name in JSONL_SECTIONS:
+        return _cache.get_jsonl(sources[0])
+    if name in REALITY_SECTIONS:
+        return _store.read_json(sources[0])
+    if name == "photos":
+        return _cache.listdir(sources[0], "*.png")
+    if name == "experiences":
+        items = []
+        for fp in sources[1:]: items.extend(_cache.get_jsonl(fp))
+        return items
+    if name == "system_config":
+        return {"openai_ok": True, "anthropic_ok": True}
+    raise KeyError(name)
+
+def count_section(workspace: str, name: str) -> int:
+    """Record count of a section without JSON-decoding its logs."""
+    if name == "photos":
+        return len(load_section(workspace, name))
+    paths = section_sources(workspace, name)
+    if name == "experiences": paths = paths[1:]
+    return sum(_cache.get(fp, _count_records, default=0) for fp in paths)
+
+def collect_bootstrap(workspace: str) -> dict:
+    """
+    Minimal first-paint payload: the soul tree plus headline state.
+    Everything else is fetched per section from /api/core/sections/<name>.
+    """
+    data = {name: load_section(workspace, name) for name in BOOTSTRAP_SECTIONS}
+    data["counts"] = {name: count_section(workspace, name) for name in COUNTED_SECTIONS}
+    data["sections"] = SECTIONS
     return data
+
+class FragmentCache:
+    """
+    Serialized JSON bytes per page section, keyed by the section's source
+    versions. A section is only re-encoded after one of its files changed;
+    pages and section responses are assembled from the cached bytes.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.encodes = 0
+
+    def get(self, key, version, build):
+        """Returns (version, bytes), calling build() only when version moved."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                self.hits += 1
+                return entry
+        body = json.dumps(build(), default=str).encode()
+        with self._lock:
+            self.encodes += 1
+            self._entries[key] = (version, body)
+        return version, body
+
+    def stats(self):
+        with self._lock:
+            return {"fragments": len(self._entries), "bytes": sum(len(e[1]) for e in self._entries.values()),
+                    "hits": self.hits, "encodes": self.encodes}
+
+_fragments = FragmentCache()
+
+# Sections inlined into the page; the rest load lazily from /api/core/sections/<name>
+BOOTSTRAP_SECTIONS = ["soul_tree", "identity_raw", "physique", "system_config"]
+_SECTIONS_JSON = json.dumps(SECTIONS).encode()
+
+def section_fragment(workspace: str, name: str):
+    """(version, serialized bytes) of one page section."""
+    return _fragments.get((workspace, name), section_version(workspace, name), lambda: load_section(workspace, name))
+
+def counts_fragment(workspace: str):
+    paths = []
+    for name in COUNTED_SECTIONS: paths += section_sources(workspace, name)
+    return _fragments.get((workspace, "#counts"), _version(paths),
+                          lambda: {name: count_section(workspace, name) for name in COUNTED_SECTIONS})
+
+def bootstrap_fragment(workspace: str) -> bytes:
+    """collect_bootstrap() as JSON bytes, concatenated from cached section fragments."""
+    parts = [b'"' + name.encode() + b'": ' + section_fragment(workspace, name)[1] for name in BOOTSTRAP_SECTIONS]
+    parts.append(b'"counts": ' + counts_fragment(workspace)[1])
+    parts.append(b'"sections": ' + _SECTIONS_JSON)
+    return b"{" + b", ".join(parts) + b"}"
+
+def fragment_stats() -> dict:
+    return _fragments.stats()
+
+def collect_data(workspace: str) -> dict:
+    return {name: load_section(workspace, name) for name in SECTIONS}
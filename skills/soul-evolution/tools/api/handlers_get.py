@@ -2,107 +2,161 @@ import json
 import os
 import subprocess
 from urllib.parse import parse_qs, urlparse
-from .data_utils import load_json, load_jsonl
-
-def handle_get_request(handler, workspace):
-    path = handler.path
-    res_data = {"status": "error", "message": "Unknown endpoint"}
-    
-    # 1. OpenClaw Models
-    if path == "/api/openclaw/models":
-        models = []
-        try:
-            result = subprocess.run(["openclaw", "models", "list", "--json"], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                raw = json.loads(result.stdout).get("models", [])
-                models = [{"id": m.get("key"), "name": f"{m.get('key').split('/')[0].upper()} - {m.get('name', m.get('key'))}"} for m in raw if m.get("key")]
-        except: pass
-        res_data = {"models": models}
-    
-    # 2. Model Config (Masked)
-    elif path == "/api/model/config":
-        p = os.path.join(workspace, "memory", "reality", "model_config.json")
-        res_data = load_json(p)
-        for k in ["api_key", "key_anthropic", "key_gemini", "key_xai", "key_minimax", "key_venice", "key_fal", "key_gemini_img"]:
-            if res_data.get(k): res_data[k] = "****"
-    
-    # 3. Simulation Config
-    elif path == "/api/config/all" or path == "/api/config/simulation":
-        p = os.path.join(workspace, "memory", "reality", "simulation_config.json")
-        res_data = load_json(p)
-    
-    # 4. Vault & Economy Status
-    elif path == "/api/vault/status" or path == "/api/economy/state":
-        try:
-            res = subprocess.run(["python3", os.path.join(os.path.dirname(__import__("os").path.realpath(__file__)), "..", "vault_bridge.py"), "status"], capture_output=True, text=True, timeout=10)
-            res_data = json.loads(res.stdout) if res.returncode == 0 else load_json(os.path.join(workspace, "memory", "reality", "vault_state.json"))
-        except: res_data = load_json(os.path.join(workspace, "memory", "reality", "vault_state.json"))
-
-    # 5. Fixed Reality Data Maps
-    elif path in ["/api/presence/state", "/api/hardware/resonance", "/api/interests", "/api/avatar/config", "/api/avatar/state", "/api/wizard/status", "/api/godmode/physique"]:
-        file_map = {
-            "/api/presence/state": "presence_state.json",
-            "/api/hardware/resonance": "hardware_resonance.json",
-            "/api/interests": "interests.json",
-            "/api/avatar/config": "avatar_config.json",
-            "/api/avatar/state": "avatar_state.json",
-            "/api/wizard/status": "simulation_config.json",
-            "/api/godmode/physique": "physique.json"
-        }
-        reality_dir = os.path.join(workspace, "memory", "reality")
-        res_data = load_json(os.path.join(reality_dir, file_map[path]))
-        if path == "/api/wizard/status":
-            res_data = {"setup_complete": res_data.get("wizard_completed", False)}
-
-    # 6. Profiles, Backups & Genesis
-    elif path == "/api/profiles/list":
-        p_dir = os.path.join(workspace, "memory", "profiles")
-        res_data = [d for d in os.listdir(p_dir) if os.path.isdir(os.path.join(p_dir, d))] if os.path.exists(p_dir) else []
-    
-    elif path == "/api/backups/list":
-        b_dir = os.path.join(workspace, "memory", "backups")
-        res_data = sorted([d for d in os.listdir(b_dir) if os.path.isdir(os.path.join(b_dir, d))], reverse=True) if os.path.exists(b_dir) else []
-
-    elif path == "/api/genesis/status":
-        p = os.path.join(workspace, "memory", "reality", "simulation_config.json")
-        res_data = {"enabled": load_json(p).get("genesis_enabled", False)}
-
-    # 7. Wizard Health & Avatar Check
-    elif path.startswith("/api/wizard/check/health"):
-        bridges = ["soul-viz.py", "vault_bridge.py", "visual_browser.py"]
-        results = []
-        tools_dir = os.path.join(workspace, "skills", "soul-evolution", "tools")
-        for b in bridges:
-            f_path = os.path.join(tools_dir, b)
-            exists = os.path.exists(f_path)
-            results.append({"name": b, "exists": exists, "executable": os.access(f_path, os.X_OK) if exists else False})
-        res_data = {"success": all(r["exists"] for r in results), "bridges": results}
-
-    elif path.startswith("/api/wizard/check/avatar"):
-        query = parse_qs(urlparse(path).query)
-        avatar_path = query.get("path", [""])[0]
-        full_path = os.path.join(workspace, avatar_path) if avatar_path else ""
-        exists = os.path.exists(full_path) if full_path else False
-        res_data = {"verified": exists, "exists": exists, "path": avatar_path, "message": "Model found" if exists else "Model not found"}
-
-    # 8. Dreams & Telemetry
-    elif path == "/api/dreams":
-        dreams = load_jsonl(os.path.join(workspace, "memory", "dreams.jsonl"))
-        res_data = {"count": len(dreams), "dreams": dreams[-10:]}
-
-    elif path.startswith("/api/telemetry/vitals"):
-        # Ensure we return a list for the charts
-        res_data = load_jsonl(os.path.join(workspace, "memory", "telemetry", "vitals.jsonl"))[-50:]
-
-    elif path.startswith("/api/logs/recent"):
-        query = parse_qs(urlparse(path).query)
-        lvl = query.get("level", [""])[0]
-        logs = load_jsonl(os.path.join(workspace, "memory", "genesis_debug.jsonl"))
-        if lvl: logs = [l for l in logs if l.get("level") == lvl]
-        res_data = logs[-100:]
-
-    # Final Response
-    handler.send_response(200)
-    handler.send_header("Content-Type", "application/json")
-    handler.end_headers()
-    handler.wfile.write(json.dumps(res_data).encode())
+from core.http_utils import send_json
+from core.log_store import log_store
+from core.telemetry_ring import vitals_telemetry
+from .data_utils import count_records, read_document, record_index, tail_records
+
+# 1. OpenClaw Models
+def openclaw_models(handler, workspace):
+    models = []
+    try:
+        result = subprocess.run(["openclaw", "models", "list", "--json"], capture_output=True, text=True, timeout=5)
+        if result.returncode == 0:
+            raw = json.loads(result.stdout).get("models", [])
+            models = [{"id": m.get("key"), "name": f"{m.get('key').split('/')[0].upper()} - {m.get('name', m.get('key'))}"} for m in raw if m.get("key")]
+    except: pass
+    return {"models": models}
+
+# 2. Model Config (Masked)
+def model_config(handler, workspace):
+    p = os.path.join(workspace, "memory", "reality", "model_config.json")
+    res_data = dict(read_document(p))
+    for k in ["api_key", "key_anthropic", "key_gemini", "key_xai", "key_minimax", "key_venice", "key_fal", "key_gemini_img"]:
+        if res_data.get(k): res_data[k] = "****"
+    return res_data
+
+# 3. Simulation Config
+def simulation_config(handler, workspace):
+    p = os.path.join(workspace, "memory", "reality", "simulation_config.json")
+    return read_document(p)
+
+# 4. Vault & Economy Status
+def vault_status(handler, workspace):
+    try:
+        res = subprocess.run(["python3", os.path.join(os.path.dirname(__import__("os").path.realpath(__file__)), "..", "vault_bridge.py"), "status"], capture_output=True, text=True, timeout=10)
+        return json.loads(res.stdout) if res.returncode == 0 else read_document(os.path.join(workspace, "memory", "reality", "vault_state.json"))
+    except: return read_document(os.path.join(workspace, "memory", "reality", "vault_state.json"))
+
+# 5. Fixed Reality Data Maps
+REALITY_FILE_MAP = {
+    "/api/presence/state": "presence_state.json",
+    "/api/hardware/resonance": "hardware_resonance.json",
+    "/api/interests": "interests.json",
+    "/api/avatar/config": "avatar_config.json",
+    "/api/avatar/state": "avatar_state.json",
+    "/api/godmode/physique": "physique.json"
+}
+
+def reality_document(filename):
+    def endpoint(handler, workspace):
+        return read_document(os.path.join(workspace, "memory", "reality", filename))
+    endpoint.__name__ = "reality_document"
+    return endpoint
+
+def wizard_status(handler, workspace):
+    res_data = read_document(os.path.join(workspace, "memory", "reality", "simulation_config.json"))
+    return {"setup_complete": res_data.get("wizard_completed", False)}
+
+# 6. Profiles, Backups & Genesis
+def profiles_list(handler, workspace):
+    p_dir = os.path.join(workspace, "memory", "profiles")
+    return [d for d in os.listdir(p_dir) if os.path.isdir(os.path.join(p_dir, d))] if os.path.exists(p_dir) else []
+
+def backups_list(handler, workspace):
+    b_dir = os.path.join(workspace, "memory", "backups")
+    return sorted([d for d in os.listdir(b_dir) if os.path.isdir(os.path.join(b_dir, d))], reverse=True) if os.path.exists(b_dir) else []
+
+def genesis_status(handler, workspace):
+    p = os.path.join(workspace, "memory", "reality", "simulation_config.json")
+    return {"enabled": read_document(p).get("genesis_enabled", False)}
+
+# 7. Wizard Health & Avatar Check
+def wizard_check_health(handler, workspace):
+    bridges = ["soul-viz.py", "vault_bridge.py", "visual_browser.py"]
+    results = []
+    tools_dir = os.path.join(workspace, "skills", "soul-evolution", "tools")
+    for b in bridges:
+        f_path = os.path.join(tools_dir, b)
+        exists = os.path.exists(f_path)
+        results.append({"name": b, "exists": exists, "executable": os.access(f_path, os.X_OK) if exists else False})
+    return {"success": all(r["exists"] for r in results), "bridges": results}
+
+def wizard_check_avatar(handler, workspace):
+    query = parse_qs(urlparse(handler.path).query)
+    avatar_path = query.get("path", [""])[0]
+    full_path = os.path.join(workspace, avatar_path) if avatar_path else ""
+    exists = os.path.exists(full_path) if full_path else False
+    return {"verified": exists, "exists": exists, "path": avatar_path, "message": "Model found" if exists else "Model not found"}
+
+# 8. Dreams & Telemetry
+def dreams(handler, workspace):
+    fp = os.path.join(workspace, "memory", "dreams.jsonl")
+    return {"count": count_records(fp), "dreams": tail_records(fp, 10)}
+
+def telemetry_vitals(handler, workspace):
+    # Ensure we return a list for the charts: the newest points of the vitals ring, as {"timestamp", "needs"}
+    return vitals_telemetry(os.path.join(workspace, "memory", "telemetry")).last(50)
+
+def logs_recent(handler, workspace):
+    # Optional ?level=&module=&since=&until= (ISO timestamps); only matching segments are opened
+    query = parse_qs(urlparse(handler.path).query)
+    arg = lambda name: query.get(name, [""])[0] or None
+    return log_store(os.path.join(workspace, "memory")).query(100, arg("level"), arg("since"), arg("until"), arg("module"))
+
+def records(handler, workspace):
+    # /api/records/<id> fetches one record; /api/records?significance=&reflected=&kind=&limit= lists them
+    url = urlparse(handler.path)
+    index = record_index(workspace)
+    rid = url.path[len("/api/records"):].strip("/")
+    if rid:
+        return index.get(rid) or {"status": "error", "message": f"Unknown record '{rid}'"}
+    query = parse_qs(url.query)
+    reflected = query.get("reflected", [""])[0]
+    kind = query.get("kind", [""])[0]
+    limit = query.get("limit", ["50"])[0]
+    items = index.select(query.get("significance", [None])[0], {"true": True, "false": False}.get(reflected),
+                         {"experiences": "experiences" + os.sep, "reflections": "reflections.jsonl"}.get(kind),
+                         int(limit) if limit.isdigit() else 50)
+    return {"count": len(items), "records": items}
+
+def unknown_endpoint(handler, workspace):
+    return {"status": "error", "message": "Unknown endpoint"}
+
+# Bridge-backed endpoints: capped per bridge, concurrent identical GETs share one fork
+VAULT_BRIDGE = {"concurrency": "subprocess", "max_inflight": 2, "limit_key": "vault_bridge", "coalesce": True}
+OPENCLAW_CLI = {"concurrency": "subprocess", "max_inflight": 1, "limit_key": "openclaw_models", "coalesce": True}
+
+# (path, endpoint, options) - prefix routes also match anything below the path
+GET_ROUTES = [
+    ("/api/openclaw/models", openclaw_models, OPENCLAW_CLI),
+    ("/api/model/config", model_config, {}),
+    ("/api/config/all", simulation_config, {}),
+    ("/api/config/simulation", simulation_config, {}),
+    ("/api/vault/status", vault_status, VAULT_BRIDGE),
+    ("/api/economy/state", vault_status, VAULT_BRIDGE),
+    *[(path, reality_document(name), {"document": name}) for path, name in REALITY_FILE_MAP.items()],
+    ("/api/wizard/status", wizard_status, {}),
+    ("/api/profiles/list", profiles_list, {}),
+    ("/api/backups/list", backups_list, {}),
+    ("/api/genesis/status", genesis_status, {}),
+    ("/api/wizard/check/health", wizard_check_health, {"prefix": True}),
+    ("/api/wizard/check/avatar", wizard_check_avatar, {"prefix": True}),
+    ("/api/dreams", dreams, {}),
+    ("/api/telemetry/vitals", telemetry_vitals, {"prefix": True}),
+    ("/api/logs/recent", logs_recent, {"prefix": True}),
+    ("/api/records", records, {"prefix": True}),
+    # Unmatched /api/ GETs keep answering with an error document
+    ("/api/", unknown_endpoint, {"prefix": True}),
+]
+
+def json_route(endpoint, workspace):
+    def route_handler(handler, rest):
+        send_json(handler, endpoint(handler, workspace))
+    return route_handler
+
+def register_get_routes(router, workspace):
+    for path, endpoint, options in GET_ROUTES:
+        options = dict(options)
+        router.add(path, json_route(endpoint, workspace), methods=("GET",), prefix=options.pop("prefix", False),
+                   endpoint=endpoint.__name__, **options)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Dashboard Load Test
+Starts soul-viz.py against a synthetic workspace, drives it with concurrent
+keep-alive clients over a weighted mix of page, API and plugin routes, and
+reports throughput and latency percentiles against a stored baseline.
+
+Usage:
+  python3 bench/load_test.py --size medium --clients 8 --duration 15
+  python3 bench/load_test.py --workspace /tmp/genesis-bench --save-baseline
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+TOOLS_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+from make_workspace import generate_workspace
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+MIN_ROUTE_SAMPLES = 200
+
+SIZES = {
+    "small": dict(days=7, per_day=10, reflections=50, changes=20, photos=5, log_lines=2000, vitals=500),
+    "medium": dict(days=60, per_day=30, reflections=500, changes=200, photos=40, log_lines=50000, vitals=5000),
+    "large": dict(days=365, per_day=60, reflections=3000, changes=1000, photos=200, log_lines=500000, vitals=50000),
+}
+
+# (path, weight): roughly what an open dashboard tab requests
+ROUTE_MIX = [
+    ("/", 1),
+    ("/web/css/main.css", 1),
+    ("/api/core/plugins", 1),
+    ("/api/core/sections/experiences", 2),
+    ("/api/core/sections/reflections", 1),
+    ("/api/core/sections/changes", 1),
+    ("/api/avatar/state", 6),
+    ("/api/presence/state", 3),
+    ("/api/hardware/resonance", 2),
+    ("/api/plugins/godmode/physique", 3),
+    ("/api/plugins/life_stream/photos", 1),
+    ("/api/plugins/identity_journal/dreams", 1),
+    ("/api/dreams", 1),
+    ("/api/telemetry/vitals", 2),
+    ("/api/logs/recent?level=ERROR", 1),
+    ("/media/thumbs/256/photo_0000.png", 1),
+]
+
+def percentile(sorted_ms, q):
+    if not sorted_ms: return None
+    return round(sorted_ms[min(len(sorted_ms) - 1, int(q * len(sorted_ms)))], 3)
+
+def summarize(samples):
+    ms = sorted(samples)
+    return {"requests": len(ms), "p50_ms": percentile(ms, 0.50), "p95_ms": percentile(ms, 0.95), "p99_ms": percentile(ms, 0.99)}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_server(workspace, port, workers):
+    cmd = [sys.executable, os.path.join(TOOLS_DIR, "soul-viz.py"), workspace, "--serve", str(port), "--workers", str(workers)]
+    # cwd=workspace: bridges resolve memory/ relative to it
+    proc = subprocess.Popen(cmd, cwd=workspace, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/api/core/plugins")
+            conn.getresponse().read()
+            conn.close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("soul-viz.py did not come up")
+
+def client(port, deadline, seed, results, errors, lock):
+    rng = random.Random(seed)
+    paths, weights = zip(*ROUTE_MIX)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    local, local_errors = {}, {}
+    while time.time() < deadline:
+        path = rng.choices(paths, weights)[0]
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path, headers={"Accept-Encoding": "gzip, br", "Accept": "image/webp,*/*"})
+            resp = conn.getresponse()
+            resp.read()
+            ok = resp.status < 500
+            if resp.will_close:
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        except (OSError, http.client.HTTPException):
+            ok = False
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        elapsed = (time.perf_counter() - start) * 1000
+        if ok: local.setdefault(path, []).append(elapsed)
+        else: local_errors[path] = local_errors.get(path, 0) + 1
+    conn.close()
+    with lock:
+        for path, samples in local.items(): results.setdefault(path, []).extend(samples)
+        for path, n in local_errors.items(): errors[path] = errors.get(path, 0) + n
+
+def run_load(port, clients, duration, warmup=2.0):
+    # Warm-up pass fills the parse caches and precompressed variants first
+    for phase, secs in (("warmup", warmup), ("measure", duration)):
+        results, errors, lock = {}, {}, threading.Lock()
+        deadline = time.time() + secs
+        threads = [threading.Thread(target=client, args=(port, deadline, i, results, errors, lock)) for i in range(clients)]
+        started = time.perf_counter()
+        for t in threads: t.start()
+        for t in threads: t.join()
+        wall = time.perf_counter() - started
+    total = sum(len(s) for s in results.values())
+    every = [ms for s in results.values() for ms in s]
+    return {
+        "requests": total,
+        "errors": sum(errors.values()),
+        "throughput_rps": round(total / wall, 1),
+        "overall": summarize(every),
+        "routes": {path: dict(summarize(s), errors=errors.get(path, 0)) for path, s in sorted(results.items())},
+    }
+
+def compare(report, baseline, tolerance):
+    """Prints deltas against the baseline and returns the list of regressions."""
+    regressions = []
+    def check(label, new, old, higher_is_better=False, samples=None):
+        if new is None or not old: return
+        delta = (new - old) / old
+        worse = -delta if higher_is_better else delta
+        # A p95 over a handful of requests is noise; those routes are shown but never flagged
+        flag = "  REGRESSION" if worse > tolerance and (samples is None or samples >= MIN_ROUTE_SAMPLES) else ""
+        if flag: regressions.append(label)
+        print(f"  {label:<48} {old:>10} -> {new:>10}  ({delta:+.1%}){flag}")
+
+    print(f"\nAgainst baseline ({baseline.get('recorded', '?')}):")
+    check("throughput_rps", report["throughput_rps"], baseline["throughput_rps"], higher_is_better=True)
+    check("overall p95_ms", report["overall"]["p95_ms"], baseline["overall"]["p95_ms"])
+    for path, stats in report["routes"].items():
+        old = baseline["routes"].get(path)
+        if old: check(f"{path} p95_ms", stats["p95_ms"], old["p95_ms"], samples=min(stats["requests"], old["requests"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the Genesis dashboard")
+    parser.add_argument("--workspace", help="Existing workspace (default: generate one of --size)")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds (after a 2s warm-up)")
+    parser.add_argument("--workers", type=int, default=16, help="soul-viz.py --workers")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline for its scenario")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="Allowed slowdown before flagging (0.20 = 20%%)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args()
+
+    scenario = f"{'custom' if args.workspace else args.size}-c{args.clients}"
+    tmp = None
+    workspace = args.workspace
+    if not workspace:
+        tmp = tempfile.TemporaryDirectory(prefix="genesis-bench-")
+        workspace = tmp.name
+        print(f"Generating {args.size} workspace in {workspace} ...")
+        generate_workspace(workspace, **SIZES[args.size])
+
+    port = free_port()
+    proc = start_server(os.path.abspath(workspace), port, args.workers)
+    try:
+        print(f"Driving {args.clients} clients for {args.duration}s (scenario {scenario}) ...")
+        report = run_load(port, args.clients, args.duration)
+    finally:
+        proc.terminate()
+        proc.wait(10)
+        if tmp: tmp.cleanup()
+
+    report["scenario"] = scenario
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        o = report["overall"]
+        print(f"\n{report['requests']} requests, {report['errors']} errors, {report['throughput_rps']} req/s")
+        print(f"overall p50 {o['p50_ms']}ms  p95 {o['p95_ms']}ms  p99 {o['p99_ms']}ms\n")
+        print(f"  {'route':<42} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for path, s in report["routes"].items():
+            print(f"  {path:<42} {s['requests']:>6} {s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8}")
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f: baselines = json.load(f)
+
+    regressions = []
+    if scenario in baselines and not args.save_baseline:
+        regressions = compare(report, baselines[scenario], args.tolerance)
+    elif not args.save_baseline:
+        print(f"\nNo baseline stored for {scenario} (run with --save-baseline)")
+
+    if args.save_baseline:
+        baselines[scenario] = dict(report, recorded=time.strftime("%Y-%m-%d %H:%M"))
+        with open(args.baseline, "w") as f: json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"\n✓ Baseline for {scenario} saved to {args.baseline}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Synthetic Workspace Generator
+Builds a throwaway Genesis workspace of configurable size for load tests:
+SOUL.md, daily experience logs, reflections, soul changes, proposals,
+reality documents, photos, dreams, vitals telemetry and a long debug log.
+
+Usage: python3 bench/make_workspace.py /tmp/genesis-bench --days 90 --per-day 40
+"""
+
+import argparse
+import json
+import os
+import random
+import struct
+import zlib
+from datetime import datetime, timedelta
+
+# Record shapes follow references/schema.md, so the validators accept a generated workspace
+SOURCES = ["conversation", "moltbook", "x", "heartbeat", "other"]
+SIGNIFICANCE = ["routine"] * 8 + ["notable"] * 3 + ["pivotal"]
+REFLECTION_TYPES = ["routine_batch"] * 3 + ["notable_batch"] * 2 + ["pivotal_immediate"]
+TRIGGERS = ["gap", "drift", "contradiction", "growth", "refinement"]
+LEVELS = ["DEBUG"] * 6 + ["INFO"] * 3 + ["WARN", "ERROR"]
+MODULES = ["genesis", "metabolism", "economy", "social", "presence", "hardware", "dream"]
+NEEDS = ["energy", "hunger", "thirst", "hygiene", "bladder", "bowel", "stress", "arousal", "libido"]
+WORDS = ("quiet morning light coffee code window rain music memory question friend market walk "
+         "idea mirror screen dream city night focus tired curious warm signal thought").split()
+
+def _sentence(rng, n=12):
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+def _png(rng, size=64):
+    # Minimal valid RGB PNG with random noise, no imaging library needed
+    rows = b"".join(b"\0" + bytes(rng.getrandbits(8) for _ in range(size * 3)) for _ in range(size))
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+def _write_json(fp, data):
+    os.makedirs(os.path.dirname(fp), exist_ok=True)
+    with open(fp, "w") as f: json.dump(data, f, indent=2)
+
+def _write_jsonl(fp, records):
+    os.makedirs(os.path.dirname(fp), exist_ok=True)
+    with open(fp, "w") as f:
+        for r in records: f.write(json.dumps(r) + "\n")
+
+def _daily_ids(prefix, width, times):
+    """Schema ids (<prefix>-YYYYMMDD-NNN...) numbered per day, one per timestamp."""
+    counters, ids = {}, []
+    for t in times:
+        day = f"{t:%Y%m%d}"
+        counters[day] = counters.get(day, 0) + 1
+        ids.append(f"{prefix}-{day}-{counters[day]:0{width}d}")
+    return ids
+
+def _soul_md(rng, sections=6, bullets=8):
+    lines = ["# SOUL.md - Who You Are", "", "_This file is generated for benchmarks._", ""]
+    for s in range(sections):
+        lines += [f"## Section {s + 1}", ""]
+        for sub in range(2):
+            lines += [f"### Aspect {s + 1}.{sub + 1}"]
+            for _ in range(bullets):
+                lines.append(f"- {_sentence(rng, 10)} [{rng.choice(['CORE', 'MUTABLE'])}]")
+            lines.append("")
+    return "\n".join(lines)
+
+def generate_workspace(root, days=30, per_day=20, reflections=200, changes=100, photos=20,
+                       log_lines=20000, dreams=50, vitals=2000, seed=42):
+    """Writes a synthetic workspace under root and returns a summary of what was generated."""
+    rng = random.Random(seed)
+    memory = os.path.join(root, "memory")
+    reality = os.path.join(memory, "reality")
+    start = datetime(2026, 1, 1)
+    os.makedirs(root, exist_ok=True)
+
+    with open(os.path.join(root, "SOUL.md"), "w") as f: f.write(_soul_md(rng))
+
+    exp_ids, significant = [], []
+    for d in range(days):
+        day = start + timedelta(days=d)
+        records = []
+        for i in range(per_day):
+            ts = day + timedelta(minutes=i * (1440 // max(1, per_day)))
+            records.append({
+                "id": f"EXP-{day:%Y%m%d}-{i + 1:04d}", "timestamp": ts.isoformat() + "Z", "source": rng.choice(SOURCES),
+                "content": _sentence(rng, rng.randint(10, 40)), "significance": rng.choice(SIGNIFICANCE),
+                "significance_reason": _sentence(rng, 6), "reflected": rng.random() < 0.6,
+                "somatic_context": {n: rng.randint(0, 100) for n in rng.sample(NEEDS, 3)},
+            })
+        exp_ids += [r["id"] for r in records]
+        significant += [r for r in records if r["significance"] != "routine"]
+        _write_jsonl(os.path.join(memory, "experiences", f"{day:%Y-%m-%d}.jsonl"), records)
+
+    end = start + timedelta(days=max(1, days))
+    def moment(i, n):
+        return start + (end - start) * (i / max(1, n))
+    def stamp(i, n):
+        return moment(i, n).isoformat() + "Z"
+
+    ref_ids = _daily_ids("REF", 3, [moment(i, reflections) for i in range(reflections)])
+    prop_ids = _daily_ids("PROP", 3, [moment(i, 10) for i in range(10)])
+    _write_jsonl(os.path.join(memory, "reflections.jsonl"), [{
+        "id": rid, "timestamp": stamp(i, reflections), "type": rng.choice(REFLECTION_TYPES),
+        "experience_ids": rng.sample(exp_ids, min(5, len(exp_ids))), "summary": _sentence(rng, 30),
+        "insights": [_sentence(rng, 8) for _ in range(3)], "soul_relevance": _sentence(rng, 12),
+        "proposal_decision": {"should_propose": False, "triggers_fired": [], "reasoning": _sentence(rng, 15)},
+        "proposals": [],
+    } for i, rid in enumerate(ref_ids)])
+
+    _write_jsonl(os.path.join(memory, "soul_changes.jsonl"), [{
+        "id": cid, "timestamp": stamp(i, changes), "proposal_id": None, "reflection_id": rng.choice(ref_ids) if ref_ids else None,
+        "experience_ids": rng.sample(exp_ids, min(2, len(exp_ids))), "section": f"## Section {rng.randint(1, 6)}",
+        "subsection": None, "change_type": rng.choice(["add", "modify", "remove"]), "before": _sentence(rng, 8),
+        "after": _sentence(rng, 8), "governance_level": "autonomous", "resolved_by": "auto",
+    } for i, cid in enumerate(_daily_ids("CHG", 3, [moment(i, changes) for i in range(changes)]))])
+
+    _write_jsonl(os.path.join(memory, "proposals", "pending.jsonl"), [{
+        "id": pid, "timestamp": stamp(i, 10), "reflection_id": rng.choice(ref_ids) if ref_ids else None,
+        "target_section": "## Section 1", "target_subsection": "### Aspect 1.1", "change_type": "add",
+        "current_content": None, "proposed_content": f"- {_sentence(rng, 10)} [MUTABLE]", "tag": "[MUTABLE]",
+        "reason": _sentence(rng, 12), "experience_ids": rng.sample(exp_ids, min(2, len(exp_ids))),
+        "status": "pending", "resolved_at": None, "resolved_by": None,
+    } for i, pid in enumerate(prop_ids)])
+    promoted = significant[-50:]
+    _write_jsonl(os.path.join(memory, "significant", "significant.jsonl"), [{
+        "id": "SIG-" + e["id"][4:], "experience_id": e["id"], "timestamp": e["timestamp"], "source": e["source"],
+        "significance": e["significance"], "content": e["content"], "context": _sentence(rng, 10), "reflected": e["reflected"],
+    } for e in promoted])
+
+    _write_jsonl(os.path.join(memory, "dreams.jsonl"),
+                 [{"timestamp": stamp(i, dreams), "text": _sentence(rng, 40)} for i in range(dreams)])
+    _write_jsonl(os.path.join(memory, "telemetry", "vitals.jsonl"), [dict(
+        {n: rng.randint(0, 100) for n in NEEDS}, timestamp=stamp(i, vitals)) for i in range(vitals)])
+    _write_jsonl(os.path.join(memory, "genesis_debug.jsonl"), [{
+        "timestamp": stamp(i, log_lines), "level": rng.choice(LEVELS), "module": rng.choice(MODULES),
+        "message": _sentence(rng, 8), "data": {"tick": i},
+    } for i in range(log_lines)])
+
+    needs = {n: rng.randint(0, 100) for n in NEEDS}
+    _write_json(os.path.join(reality, "physique.json"), {"current_location": "home_bedroom", "current_outfit": ["Hoodie"], "needs": needs})
+    _write_json(os.path.join(reality, "avatar_state.json"), {"blendShapes": {"neutral": 1, "joy": 0}, "pose": "idle"})
+    _write_json(os.path.join(reality, "avatar_config.json"), {"vrm_path": "avatars/bench.vrm"})
+    _write_json(os.path.join(reality, "presence_state.json"), {"status": "online", "mood": "focused"})
+    _write_json(os.path.join(reality, "hardware_resonance.json"), {"cpu": 23.5, "ram": 61.2, "temp": 48})
+    _write_json(os.path.join(reality, "interests.json"), {"hobbies": [{"name": w, "level": rng.randint(1, 10)} for w in WORDS[:8]]})
+    _write_json(os.path.join(reality, "world_state.json"), {"weather": "rain", "season": "winter", "time_of_day": "night"})
+    _write_json(os.path.join(reality, "social.json"), {"entities": [{"id": f"npc_{i}", "name": f"Person {i}", "bond": rng.randint(-50, 100)} for i in range(25)]})
+    _write_json(os.path.join(reality, "social_events.json"), {"pending": []})
+    _write_json(os.path.join(reality, "vault_state.json"), {"balance": 1000.0, "positions": []})
+    _write_json(os.path.join(reality, "wardrobe.json"), {"items": [{"name": f"Item {i}"} for i in range(40)]})
+    _write_json(os.path.join(reality, "inventory.json"), {"items": [{"name": f"Thing {i}"} for i in range(40)]})
+    _write_json(os.path.join(reality, "interior.json"), {"rooms": [{"name": "bedroom", "objects": []}]})
+    _write_json(os.path.join(reality, "skills.json"), {"skills": [{"name": w, "xp": rng.randint(0, 1000)} for w in WORDS[:12]]})
+    _write_json(os.path.join(reality, "simulation_config.json"), {"wizard_completed": True, "genesis_enabled": False})
+    _write_json(os.path.join(reality, "model_config.json"), {"api_key": "bench"})
+    _write_json(os.path.join(reality, "cycle.json"), {"day": 12})
+
+    photo_dir = os.path.join(reality, "photos")
+    os.makedirs(photo_dir, exist_ok=True)
+    for i in range(photos):
+        with open(os.path.join(photo_dir, f"photo_{i:04d}.png"), "wb") as f: f.write(_png(rng))
+
+    return {"root": root, "days": days, "experiences": len(exp_ids), "reflections": reflections,
+            "changes": changes, "photos": photos, "log_lines": log_lines, "dreams": dreams, "vitals": vitals}
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Genesis workspace for benchmarks")
+    parser.add_argument("root", help="Target directory (created if missing)")
+    parser.add_argument("--days", type=int, default=30, help="Days of experience logs")
+    parser.add_argument("--per-day", type=int, default=20, help="Experiences per day")
+    parser.add_argument("--reflections", type=int, default=200)
+    parser.add_argument("--changes", type=int, default=100, help="Soul change records")
+    parser.add_argument("--photos", type=int, default=20)
+    parser.add_argument("--log-lines", type=int, default=20000, help="Lines in genesis_debug.jsonl")
+    parser.add_argument("--dreams", type=int, default=50)
+    parser.add_argument("--vitals", type=int, default=2000, help="Vitals telemetry samples")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    summary = generate_workspace(args.root, args.days, args.per_day, args.reflections, args.changes, args.photos,
+                                 args.log_lines, args.dreams, args.vitals, args.seed)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
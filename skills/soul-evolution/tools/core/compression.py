@@ -0,0 +1,106 @@
+import gzip
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this go out uncompressed; the framing overhead isn't worth it
+MIN_COMPRESS_SIZE = 1024
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+STATIC_EXTENSIONS = (".html", ".css", ".js", ".json", ".svg")
+
+def available_encodings():
+    return ["br", "gzip"] if brotli else ["gzip"]
+
+def is_compressible(content_type):
+    return any(content_type.startswith(t) for t in COMPRESSIBLE_TYPES)
+
+def choose_encoding(accept_encoding):
+    """Picks the best encoding the client accepts (q > 0), preferring brotli."""
+    if not isinstance(accept_encoding, str) or not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try: q = float(params[2:])
+            except ValueError: q = 0.0
+        accepted[token.strip().lower()] = q
+    for enc in available_encodings():
+        if accepted.get(enc, accepted.get("*", 0)) > 0:
+            return enc
+    return None
+
+def compress(body, encoding, level=None):
+    if encoding == "br":
+        return brotli.compress(body, quality=level if level is not None else 5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level if level is not None else 6, mtime=0)
+    return body
+
+def variant_etag(etag, encoding):
+    """Each encoded representation needs its own strong validator."""
+    return f'{etag[:-1]}-{encoding}"' if encoding else etag
+
+
+class StaticAssetCache:
+    """
+    Precompressed variants of the dashboard's static assets.
+    Filled at startup and refreshed lazily when a file's mtime or size changes.
+    """
+
+    def __init__(self, roots):
+        self.roots = [os.path.abspath(r) for r in roots]
+        self._variants = {}
+        self._lock = threading.Lock()
+
+    def warm(self):
+        count = 0
+        for root in self.roots:
+            for dirpath, _, files in os.walk(root):
+                for name in files:
+                    if name.endswith(STATIC_EXTENSIONS):
+                        fp = os.path.join(dirpath, name)
+                        try: st = os.stat(fp)
+                        except OSError: continue
+                        if self._load(fp, st): count += 1
+        return count
+
+    def _load(self, fp, st):
+        if st.st_size < MIN_COMPRESS_SIZE:
+            return None
+        with open(fp, "rb") as f: raw = f.read()
+        # Static files are compressed once, so spend the CPU on the highest level
+        variants = {enc: compress(raw, enc, level=11 if enc == "br" else 9) for enc in available_encodings()}
+        with self._lock:
+            self._variants[fp] = ((st.st_mtime_ns, st.st_size), variants)
+        return variants
+
+    def get(self, fp, st, encoding):
+        """Returns the encoded bytes of fp, or None if it shouldn't be compressed."""
+        fp = os.path.abspath(fp)
+        if not encoding or st.st_size < MIN_COMPRESS_SIZE or not fp.endswith(STATIC_EXTENSIONS):
+            return None
+        if not any(fp.startswith(r + os.sep) for r in self.roots):
+            return None
+        with self._lock:
+            entry = self._variants.get(fp)
+        if entry and entry[0] == (st.st_mtime_ns, st.st_size):
+            variants = entry[1]
+        else:
+            variants = self._load(fp, st)
+        return variants.get(encoding) if variants else None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "files": len(self._variants),
+                "raw_bytes": sum(e[0][1] for e in self._variants.values()),
+                "encoded_bytes": {enc: sum(len(e[1].get(enc, b"")) for e in self._variants.values()) for enc in available_encodings()},
+            }
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Documents whose content must never be pushed (the REST endpoint masks them)
+PRIVATE_DOCUMENTS = {"reality/model_config.json"}
+
+
+class EventStream:
+    """
+    Numbered backlog of workspace change events for /api/stream.
+    Clients resume from the last id they saw; if it has already fallen out
+    of the backlog they get a reset and must refetch.
+    """
+
+    def __init__(self, memory_dir, backlog=512):
+        self.memory_dir = os.path.abspath(memory_dir)
+        self._events = deque(maxlen=backlog)
+        self._cond = threading.Condition()
+        self._last_id = 0
+        self.clients = 0
+        self.published = 0
+
+    @property
+    def last_id(self):
+        with self._cond:
+            return self._last_id
+
+    def add_client(self, limit):
+        with self._cond:
+            if self.clients >= limit:
+                return False
+            self.clients += 1
+            return True
+
+    def remove_client(self):
+        with self._cond:
+            self.clients -= 1
+
+    def on_changes(self, paths):
+        """FileWatcher callback: turns changed paths into stream events."""
+        for fp in sorted(paths):
+            rel = os.path.relpath(fp, self.memory_dir).replace(os.sep, "/")
+            if rel.startswith(".."): continue
+            exists = os.path.exists(fp)
+
+            if rel in PRIVATE_DOCUMENTS:
+                self.publish("document", {"doc": rel, "data": None, "private": True})
+            elif rel.endswith(".json"):
+                if not exists:
+                    self.publish("document", {"doc": rel, "data": None, "deleted": True})
+                    continue
+                try:
+                    with open(fp, "r") as f: data = json.load(f)
+                except (OSError, ValueError):
+                    continue  # Caught mid-write by the polling backend; the next change re-fires
+                self.publish("document", {"doc": rel, "data": data})
+            elif rel.endswith(".jsonl"):
+                self.publish("append", {"doc": rel, "size": os.path.getsize(fp) if exists else 0})
+            else:
+                self.publish("file", {"doc": rel, "deleted": not exists})
+
+    def publish(self, event, payload):
+        with self._cond:
+            self._last_id += 1
+            payload["ts"] = time.time()
+            self._events.append((self._last_id, event, payload))
+            self.published += 1
+            self._cond.notify_all()
+
+    def since(self, last_id, timeout=15.0):
+        """
+        Blocks until there are events newer than last_id (or timeout).
+        Returns (events, reset) where reset means events were missed.
+        """
+        with self._cond:
+            if last_id > self._last_id:
+                return [], True  # Ids from before a server restart
+            self._cond.wait_for(lambda: self._last_id > last_id, timeout)
+            if not self._events or self._last_id <= last_id:
+                return [], False
+            oldest = self._events[0][0]
+            reset = last_id < oldest - 1
+            return [e for e in self._events if e[0] > last_id], reset
+
+    def stats(self):
+        with self._cond:
+            return {
+                "clients": self.clients,
+                "last_id": self._last_id,
+                "backlog": len(self._events),
+                "published": self.published,
+            }
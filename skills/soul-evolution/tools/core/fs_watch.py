@@ -0,0 +1,155 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Directories that are snapshots or derived caches, not live state
+IGNORED_DIRS = {"backups", "cache", "__pycache__"}
+
+def _ignored(name):
+    return name.startswith(".") or name.endswith((".tmp", ".swp", "~"))
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1  # noqa: attribute probe
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """
+    Watches a directory tree and reports batches of changed file paths.
+    Uses inotify where available and falls back to periodic stat() polling.
+    """
+
+    def __init__(self, root, poll_interval=1.0, debounce=0.05):
+        self.root = os.path.abspath(root)
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self._callbacks = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._libc = _load_libc()
+        self.backend = "inotify" if self._libc else "polling"
+        self.batches = 0
+
+    def subscribe(self, callback):
+        """callback(paths) receives a set of absolute paths that changed."""
+        self._callbacks.append(callback)
+
+    def start(self):
+        if self._thread: return
+        target = self._run_inotify if self._libc else self._run_polling
+        self._thread = threading.Thread(target=target, name="genesis-fswatch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _emit(self, paths):
+        if not paths: return
+        self.batches += 1
+        for cb in list(self._callbacks):
+            try: cb(paths)
+            except Exception as e: print(f"  ⚠ File watcher callback error: {e}")
+
+    # --- inotify backend ---
+
+    def _run_inotify(self):
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            print(f"  ⚠ inotify unavailable (errno {ctypes.get_errno()}), polling instead")
+            self.backend = "polling"
+            return self._run_polling()
+
+        watches = {}
+
+        def add_tree(path):
+            for dirpath, dirnames, _ in os.walk(path):
+                dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS and not _ignored(d)]
+                wd = self._libc.inotify_add_watch(fd, os.fsencode(dirpath), WATCH_MASK)
+                if wd >= 0: watches[wd] = dirpath
+
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            add_tree(self.root)
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd], [], [], 1.0)
+                if not ready: continue
+                # Let a burst of writes settle into a single batch
+                time.sleep(self.debounce)
+                changed = set()
+                try:
+                    buf = os.read(fd, 65536)
+                except BlockingIOError:
+                    continue
+                offset = 0
+                while offset < len(buf):
+                    wd, mask, _, name_len = _EVENT_HEADER.unpack_from(buf, offset)
+                    offset += _EVENT_HEADER.size
+                    name = os.fsdecode(buf[offset:offset + name_len].rstrip(b"\0"))
+                    offset += name_len
+                    if mask & IN_Q_OVERFLOW:
+                        changed.add(self.root)
+                        continue
+                    if mask & IN_IGNORED:
+                        watches.pop(wd, None)
+                        continue
+                    base = watches.get(wd)
+                    if base is None or not name or _ignored(name): continue
+                    fp = os.path.join(base, name)
+                    if mask & IN_ISDIR:
+                        if mask & (IN_CREATE | IN_MOVED_TO) and name not in IGNORED_DIRS:
+                            add_tree(fp)
+                        continue
+                    changed.add(fp)
+                self._emit(changed)
+        finally:
+            os.close(fd)
+
+    # --- polling backend ---
+
+    def _snapshot(self):
+        snap = {}
+        for dirpath, dirnames, files in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS and not _ignored(d)]
+            for name in files:
+                if _ignored(name): continue
+                fp = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(fp)
+                    snap[fp] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    pass
+        return snap
+
+    def _run_polling(self):
+        prev = self._snapshot()
+        while not self._stop.wait(self.poll_interval):
+            cur = self._snapshot()
+            changed = {fp for fp, sig in cur.items() if prev.get(fp) != sig}
+            changed |= set(prev) - set(cur)
+            prev = cur
+            self._emit(changed)
@@ -0,0 +1,193 @@
+import copy
+import json
+import os
+import threading
+import time
+
+# Reality documents rewritten on every update; these live in memory
+HOT_DOCUMENTS = ["avatar_state.json", "physique.json", "presence_state.json", "hardware_resonance.json"]
+FLUSH_DELAY = 0.5
+
+
+class HotDocument:
+    """
+    Authoritative in-memory copy of one JSON document, written behind.
+    Updates replace the state object, so a dict handed to a reader is never
+    mutated afterwards (readers must not mutate it either). Dirty state is
+    written at most flush_delay after the first change, and at shutdown.
+    While clean, edits made by other processes (the engine writes these
+    files too) are picked up on the next read or watcher event; an edit that
+    lands while we are dirty is overwritten by our flush and counted as a
+    conflict.
+    """
+
+    def __init__(self, path, flush_delay=FLUSH_DELAY):
+        self.path = os.path.abspath(path)
+        self.flush_delay = flush_delay
+        self._lock = threading.Lock()
+        # Serializes flushes: the timer, flush_all() and a shutdown may race for the same .tmp
+        self._flush_lock = threading.Lock()
+        self._flushed = 0  # Version last written to disk
+        self._timer = None
+        self._listeners = []
+        self._signature = None
+        self.state = {}
+        self.version = 0
+        self.dirty = False
+        self.reads = 0
+        self.updates = 0
+        self.flushes = 0
+        self.reloads = 0
+        self.conflicts = 0
+        self._reload()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _reload(self):
+        sig = self._stat()
+        try:
+            with open(self.path, "r") as f: data = json.load(f)
+        except (OSError, ValueError):
+            data = {} if sig is None else None  # Unreadable mid-write: keep what we have
+        if data is None: return False
+        self.state, self._signature = data, sig
+        self.version += 1
+        self.reloads += 1
+        return True
+
+    def subscribe(self, callback):
+        """callback(delta) after every change; delta is None when the whole document was replaced."""
+        self._listeners.append(callback)
+
+    def _notify(self, delta):
+        for cb in list(self._listeners):
+            try: cb(delta)
+            except Exception as e: print(f"  ⚠ Hot document listener error: {e}")
+
+    # --- readers ---
+
+    def read(self):
+        self.refresh()
+        with self._lock:
+            self.reads += 1
+            return self.state
+
+    def refresh(self):
+        """Adopts an outside edit if the file changed and nothing of ours is pending."""
+        if self.dirty or self._stat() == self._signature: return False
+        with self._lock:
+            if self.dirty or self._stat() == self._signature: return False
+            changed = self._reload()
+        if changed: self._notify(None)
+        return changed
+
+    # --- writers ---
+
+    def merge(self, delta):
+        """Shallow update, the same semantics as dict.update() on the loaded file."""
+        self.refresh()
+        with self._lock:
+            state = dict(self.state)
+            state.update(delta)
+            self._commit(state)
+        self._notify(delta)
+
+    def update(self, fn):
+        """fn(state) edits a private copy in place; the copy becomes the new state."""
+        self.refresh()
+        with self._lock:
+            state = copy.deepcopy(self.state)
+            fn(state)
+            self._commit(state)
+        self._notify(None)
+
+    def replace(self, data):
+        with self._lock:
+            self._commit(dict(data))
+        self._notify(None)
+
+    def _commit(self, state):
+        self.state = state
+        self.version += 1
+        self.updates += 1
+        self.dirty = True
+        if not self._timer:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self):
+        with self._lock:
+            if self._timer: self._timer.cancel()
+            self._timer = None
+            # Only a snapshot newer than what is on disk gets published
+            if not self.dirty or self.version <= self._flushed: return False
+            data = json.dumps(self.state, indent=2)
+            version = self.version
+            if self._stat() != self._signature:
+                self.conflicts += 1
+                print(f"  ⚠ {os.path.basename(self.path)} changed on disk while edits were pending; overwriting it")
+        tmp = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, "w") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"  ⚠ Could not write {os.path.basename(self.path)}: {e}")
+            return False
+        with self._lock:
+            self._signature = self._stat()
+            self._flushed = version
+            self.flushes += 1
+            # Changed again while we were writing: stay dirty, the next flush is already due
+            if self.version == version: self.dirty = False
+            elif not self._timer:
+                self._timer = threading.Timer(self.flush_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return True
+
+    def stats(self):
+        return {"version": self.version, "dirty": self.dirty, "reads": self.reads, "updates": self.updates,
+                "flushes": self.flushes, "reloads": self.reloads, "conflicts": self.conflicts}
+
+
+class HotDocuments:
+    """The hot documents of one reality directory, keyed by file name."""
+
+    def __init__(self, reality_dir, names=HOT_DOCUMENTS, flush_delay=FLUSH_DELAY):
+        self.reality_dir = os.path.abspath(reality_dir)
+        self.docs = {name: HotDocument(os.path.join(self.reality_dir, name), flush_delay) for name in names}
+        self._by_path = {doc.path: doc for doc in self.docs.values()}
+
+    def get(self, name):
+        return self.docs.get(name)
+
+    def for_path(self, path):
+        return self._by_path.get(os.path.abspath(path))
+
+    def on_changes(self, paths):
+        """FileWatcher callback: pushes outside edits to listeners without waiting for a read."""
+        for fp in paths:
+            doc = self._by_path.get(fp)
+            if doc: doc.refresh()
+
+    def flush_all(self):
+        start = time.perf_counter()
+        written = sum(1 for doc in self.docs.values() if doc.flush())
+        if written: print(f"  ✓ Flushed {written} hot documents in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def stats(self):
+        return {name: doc.stats() for name, doc in self.docs.items()}
@@ -0,0 +1,108 @@
+import hashlib
+import json
+from email.utils import formatdate, parsedate_to_datetime
+from core.compression import MIN_COMPRESS_SIZE, available_encodings, choose_encoding, compress, is_compressible, variant_etag
+
+def file_etag(st):
+    """Strong validator for a file on disk, derived from its stat result."""
+    return f'"{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+def content_etag(body):
+    """Strong validator for a generated body."""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+def http_date(ts):
+    return formatdate(ts, usegmt=True)
+
+def _header(handler, name):
+    value = handler.headers.get(name)
+    return value if isinstance(value, str) else None
+
+def is_not_modified(handler, etag=None, last_modified=None):
+    """
+    Evaluates If-None-Match / If-Modified-Since for a GET or HEAD request.
+    If-None-Match takes precedence, as required by RFC 9110.
+    """
+    if handler.command not in ("GET", "HEAD"):
+        return False
+
+    inm = _header(handler, "If-None-Match")
+    if inm is not None:
+        if not etag: return False
+        tags = {t.strip().removeprefix("W/") for t in inm.split(",")}
+        # A cached encoded variant of the same entity is just as fresh
+        candidates = {etag} | {variant_etag(etag, enc) for enc in available_encodings()}
+        return "*" in tags or bool(tags & candidates)
+
+    ims = _header(handler, "If-Modified-Since")
+    if ims and last_modified is not None:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(ims).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def send_not_modified(handler, etag=None, last_modified=None, cache_control="no-cache", headers=None):
+    handler.send_response(304)
+    if etag: handler.send_header("ETag", etag)
+    if last_modified is not None: handler.send_header("Last-Modified", http_date(last_modified))
+    if cache_control: handler.send_header("Cache-Control", cache_control)
+    for name, value in (headers or {}).items(): handler.send_header(name, value)
+    handler.end_headers()
+
+def send_body(handler, body, content_type, status=200, etag=None, last_modified=None, cache_control="no-cache", headers=None):
+    """
+    Writes a complete response, answering 304 when the client's copy is still valid.
+    Compressible bodies above the size threshold are encoded per Accept-Encoding.
+    Every response carries Content-Type and Content-Length so the connection
+    can be kept alive for the next request.
+    """
+    encoding = None
+    if len(body) >= MIN_COMPRESS_SIZE and is_compressible(content_type):
+        encoding = choose_encoding(_header(handler, "Accept-Encoding"))
+        if etag: etag = variant_etag(etag, encoding)
+
+    if status == 200 and (etag or last_modified is not None) and is_not_modified(handler, etag, last_modified):
+        send_not_modified(handler, etag, last_modified, cache_control)
+        return
+
+    if encoding: body = compress(body, encoding)
+    handler.send_response(status)
+    handler.send_header("Content-Type", content_type)
+    handler.send_header("Content-Length", str(len(body)))
+    if encoding: handler.send_header("Content-Encoding", encoding)
+    if is_compressible(content_type): handler.send_header("Vary", "Accept-Encoding")
+    if etag: handler.send_header("ETag", etag)
+    if last_modified is not None: handler.send_header("Last-Modified", http_date(last_modified))
+    if cache_control: handler.send_header("Cache-Control", cache_control)
+    for name, value in (headers or {}).items(): handler.send_header(name, value)
+    handler.end_headers()
+    if handler.command != "HEAD":
+        handler.wfile.write(body)
+
+def send_json(handler, data, status=200, headers=None):
+    """Serializes data and sends it with a content-hash ETag."""
+    body = json.dumps(data).encode()
+    send_body(handler, body, "application/json", status=status, etag=content_etag(body), headers=headers)
+
+def send_text(handler, text, status=200):
+    send_body(handler, text.encode(), "text/plain; charset=utf-8", status=status, cache_control=None)
+
+def send_empty(handler, status, headers=None):
+    """A body-less response (405, 416, 503 ...) that still frames correctly on a kept-alive connection."""
+    handler.send_response(status)
+    handler.send_header("Content-Length", "0")
+    for name, value in (headers or {}).items(): handler.send_header(name, value)
+    handler.end_headers()
+
+def discard_body(handler, limit=1 << 20):
+    """
+    Consumes an unread request body so the next request on the connection
+    parses cleanly; bodies above limit just close the connection instead.
+    """
+    try: length = int(handler.headers.get("Content-Length") or 0)
+    except (TypeError, ValueError): length = 0
+    if length > limit:
+        handler.close_connection = True
+    elif length > 0:
+        handler.rfile.read(length)
@@ -0,0 +1,295 @@
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from core.workspace_store import tail_jsonl
+
+# The TS logger appends to memory/genesis_debug.jsonl and renames it to genesis_debug_<ts>.jsonl at 50 MB
+ACTIVE_LOG = "genesis_debug.jsonl"
+ARCHIVE_PREFIX = "genesis_debug_"
+SEGMENT_BYTES = 8 * 1024 * 1024
+SEGMENT_SECONDS = 6 * 3600
+# A renamed log may still receive an append that opened it just before the rename
+CLOSE_GRACE = 2.0
+MAINTAIN_INTERVAL = 60
+
+
+def _stamp(dt):
+    # Same file naming as the TS logger's archives, so both sort by rotation time
+    return dt.strftime("%Y-%m-%dT%H-%M-%S-") + f"{dt.microsecond // 1000:03d}Z"
+
+def _parse_time(ts):
+    try: return datetime.fromisoformat(str(ts).replace("Z", "+00:00"))
+    except ValueError: return None
+
+def _matches(record, level, since, until, module):
+    if level and record.get("level") != level: return False
+    if module and record.get("module") != module: return False
+    ts = str(record.get("timestamp", ""))
+    return (not since or ts >= since) and (not until or ts <= until)
+
+
+class LogStore:
+    """
+    Segmented store for the debug log. The active file stays where the TS
+    logger writes it; once it passes segment_bytes or holds more than
+    segment_seconds of history it is moved to memory/logs/ and closed into
+    a gzip segment. logs/index.json keeps, per segment, its record count,
+    level counts and first/last timestamp, so a query by level or time
+    window only decompresses the segments that can contain a match.
+
+    Nothing is ever deleted unless keep_days is set: then segments whose
+    newest record is older than that go (segments without timestamps are
+    kept). The TS logger's own archives stay where it wrote them and are
+    read in place, unless adopt_archives lets the store compress them.
+    """
+
+    def __init__(self, memory_dir, segment_bytes=SEGMENT_BYTES, segment_seconds=SEGMENT_SECONDS,
+                 keep_days=None, adopt_archives=False, grace=CLOSE_GRACE):
+        self.memory_dir = os.path.abspath(memory_dir)
+        self.active_path = os.path.join(self.memory_dir, ACTIVE_LOG)
+        self.log_dir = os.path.join(self.memory_dir, "logs")
+        self.index_path = os.path.join(self.log_dir, "index.json")
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.keep_days = keep_days
+        self.adopt_archives = adopt_archives
+        self.grace = grace
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.segments = self._load_index()  # name -> {"first", "last", "count", "levels", "bytes"}
+        self.rotations = 0
+        self.queries = 0
+        self.opened = 0
+        self.skipped = 0
+
+    # --- index ---
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r") as f: return json.load(f).get("segments", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _save_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f: json.dump({"segments": self.segments}, f, indent=1)
+        os.replace(tmp, self.index_path)
+
+    @staticmethod
+    def _summarize(records):
+        levels = {}
+        for r in records: levels[r.get("level")] = levels.get(r.get("level"), 0) + 1
+        stamps = [str(r["timestamp"]) for r in records if r.get("timestamp")]
+        return {"first": min(stamps, default=None), "last": max(stamps, default=None),
+                "count": len(records), "levels": levels}
+
+    # --- rotation ---
+
+    def _first_time(self, fp):
+        try:
+            with open(fp, "rb") as f: return _parse_time(json.loads(f.readline()).get("timestamp"))
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _due(self, now):
+        try: size = os.path.getsize(self.active_path)
+        except OSError: return False
+        if not size: return False
+        if size >= self.segment_bytes: return True
+        first = self._first_time(self.active_path)
+        return bool(first and first.tzinfo and (now - first).total_seconds() >= self.segment_seconds)
+
+    def _segment_path(self, dt):
+        return os.path.join(self.log_dir, f"{ARCHIVE_PREFIX}{_stamp(dt)}.jsonl")
+
+    def _close_segment(self, fp):
+        """Compresses one open segment into <name>.gz and records it in the index."""
+        with open(fp, "rb") as f: raw = f.read()
+        name = os.path.basename(fp) + ".gz"
+        tmp = os.path.join(self.log_dir, name + ".tmp")
+        with gzip.open(tmp, "wb", compresslevel=6) as f: f.write(raw)
+        os.replace(tmp, os.path.join(self.log_dir, name))
+        os.remove(fp)
+        self.segments[name] = dict(self._summarize(_parse_lines(raw)), raw_bytes=len(raw),
+                                   bytes=os.path.getsize(os.path.join(self.log_dir, name)))
+
+    def _reindex_segment(self, name):
+        # A closed segment the index does not know about (index lost or written by an older run)
+        fp = os.path.join(self.log_dir, name)
+        with gzip.open(fp, "rb") as f: raw = f.read()
+        self.segments[name] = dict(self._summarize(_parse_lines(raw)), raw_bytes=len(raw), bytes=os.path.getsize(fp))
+
+    def maintain(self, now=None):
+        """Rotates the active log when due, closes pending segments and applies retention."""
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            os.makedirs(self.log_dir, exist_ok=True)
+            changed = False
+            if self._due(now):
+                stamp = now
+                # Two rotations within a millisecond (or a clock step back) must not overwrite a segment
+                while any(os.path.exists(self._segment_path(stamp) + ext) for ext in ("", ".gz")):
+                    stamp += timedelta(milliseconds=1)
+                try:
+                    os.rename(self.active_path, self._segment_path(stamp))
+                    self.rotations += 1
+                except OSError as e:
+                    print(f"  ⚠ Could not rotate debug log: {e}")
+            # Archives rotated by the TS logger join the store only when allowed
+            if self.adopt_archives:
+                for name in self._archives():
+                    try: os.rename(os.path.join(self.memory_dir, name), os.path.join(self.log_dir, name))
+                    except OSError: pass
+            for name in sorted(os.listdir(self.log_dir)):
+                fp = os.path.join(self.log_dir, name)
+                if not name.startswith(ARCHIVE_PREFIX): continue
+                try:
+                    if name.endswith(".jsonl.gz") and name not in self.segments:
+                        self._reindex_segment(name)
+                        changed = True
+                    elif name.endswith(".jsonl") and time.time() - os.path.getmtime(fp) >= self.grace:
+                        self._close_segment(fp)
+                        changed = True
+                except (OSError, EOFError) as e:
+                    print(f"  ⚠ Could not close log segment {name}: {e}")
+            cutoff = None
+            if self.keep_days is not None:
+                cutoff = (now - timedelta(days=self.keep_days)).isoformat().replace("+00:00", "Z")
+            for name, seg in list(self.segments.items()):
+                path = os.path.join(self.log_dir, name)
+                if not os.path.exists(path):
+                    del self.segments[name]
+                    changed = True
+                elif cutoff and seg["last"] and seg["last"] < cutoff:
+                    try: os.remove(path)
+                    except OSError: continue
+                    del self.segments[name]
+                    changed = True
+            if changed: self._save_index()
+            return changed
+
+    def start(self, interval=MAINTAIN_INTERVAL):
+        if self._thread: return
+        def run():
+            while True:
+                try: self.maintain()
+                except Exception as e: print(f"  ⚠ Log maintenance failed: {e}")
+                if self._stop.wait(interval): return
+        self._thread = threading.Thread(target=run, name="genesis-logstore", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # --- queries ---
+
+    def _archives(self):
+        try: return [n for n in os.listdir(self.memory_dir) if n.startswith(ARCHIVE_PREFIX) and n.endswith(".jsonl")]
+        except OSError: return []
+
+    def _sources(self):
+        """
+        Newest first: the active log, then every older file by its rotation
+        stamp (open segments, the logger's archives read in place, closed segments).
+        """
+        try: names = os.listdir(self.log_dir)
+        except OSError: names = []
+        older = [(n, os.path.join(self.log_dir, n), None) for n in names if n.startswith(ARCHIVE_PREFIX) and n.endswith(".jsonl")]
+        older += [(n, os.path.join(self.memory_dir, n), None) for n in self._archives()]
+        with self._lock:
+            older += [(n[:-len(".gz")], os.path.join(self.log_dir, n), seg) for n, seg in self.segments.items()]
+        older.sort(key=lambda item: item[0], reverse=True)
+        return [(self.active_path, None)] + [(fp, seg) for _, fp, seg in older]
+
+    def _relevant(self, seg, level, since, until):
+        if level and not seg["levels"].get(level): return False
+        if since and (seg["last"] or "") < since: return False
+        if until and (seg["first"] or "") > until: return False
+        return True
+
+    def query(self, n=100, level=None, since=None, until=None, module=None):
+        """
+        The last n records (oldest first) matching every given filter.
+        since/until are ISO timestamps; segments outside the window or
+        without the level are never opened.
+        """
+        self.queries += 1
+        predicate = None
+        if level or since or until or module:
+            predicate = lambda r: isinstance(r, dict) and _matches(r, level, since, until, module)
+        out = []
+        for fp, seg in self._sources():
+            if len(out) >= n: break
+            if seg is None and fp != self.active_path and not os.path.exists(fp):
+                # Closed while we were listing: read it from its segment instead
+                name = os.path.basename(fp) + ".gz"
+                fp, seg = os.path.join(self.log_dir, name), self.segments.get(name)
+                if seg is None: continue
+            if seg is None:
+                out = tail_jsonl(fp, n - len(out), predicate) + out
+                continue
+            if not self._relevant(seg, level, since, until):
+                self.skipped += 1
+                continue
+            self.opened += 1
+            try:
+                with gzip.open(fp, "rb") as f: lines = f.read().split(b"\n")
+            except (OSError, EOFError):
+                continue
+            found = []
+            for line in reversed(lines):
+                if not line.strip(): continue
+                try: record = json.loads(line)
+                except ValueError: continue
+                if predicate and not predicate(record): continue
+                found.append(record)
+                if len(found) + len(out) >= n: break
+            found.reverse()
+            out = found + out
+            # Older segments end before this one began; nothing further back can be inside the window
+            if since and (seg["first"] or "") < since: break
+        return out
+
+    def level_counts(self, since=None, until=None):
+        """Per-level totals over closed segments overlapping the window (the active log is not counted)."""
+        totals = {}
+        with self._lock:
+            for seg in self.segments.values():
+                if not self._relevant(seg, None, since, until): continue
+                for level, count in seg["levels"].items(): totals[level] = totals.get(level, 0) + count
+        return totals
+
+    def stats(self):
+        with self._lock:
+            return {"segments": len(self.segments), "bytes": sum(s["bytes"] for s in self.segments.values()),
+                    "raw_bytes": sum(s.get("raw_bytes", 0) for s in self.segments.values()),
+                    "rotations": self.rotations, "queries": self.queries, "opened": self.opened, "skipped": self.skipped}
+
+
+def _parse_lines(raw):
+    records = []
+    for line in raw.split(b"\n"):
+        if not line.strip(): continue
+        try: record = json.loads(line)
+        except ValueError: continue
+        if isinstance(record, dict): records.append(record)
+    return records
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def log_store(memory_dir, **options):
+    """
+    The process-wide LogStore of a memory/ directory, shared by core handlers
+    and plugins. options (keep_days, adopt_archives) apply when it is created.
+    """
+    key = os.path.abspath(memory_dir)
+    with _stores_lock:
+        if key not in _stores: _stores[key] = LogStore(key, **options)
+        return _stores[key]
@@ -0,0 +1,91 @@
+import bisect
+import threading
+import time
+
+# Latency bucket upper bounds in ms: 0.1ms .. ~100s, four buckets per doubling (<19% error)
+BUCKET_BOUNDS = [0.1 * 2 ** (i / 4) for i in range(81)]
+
+
+class Histogram:
+    """Fixed log-spaced latency buckets; percentiles are read off bucket bounds."""
+
+    __slots__ = ("counts", "total", "sum_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q):
+        if not self.total: return None
+        rank, seen = q * self.total, 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                # The top bucket's bound can overshoot what was actually seen
+                return round(min(BUCKET_BOUNDS[i], self.max_ms) if i < len(BUCKET_BOUNDS) else self.max_ms, 3)
+        return round(self.max_ms, 3)
+
+    def summary(self):
+        return {
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "mean_ms": round(self.sum_ms / self.total, 3) if self.total else None,
+        }
+
+
+class _Series:
+    __slots__ = ("requests", "errors", "bytes", "latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency = Histogram()
+
+    def record(self, ms, status, sent):
+        self.requests += 1
+        if status >= 500: self.errors += 1
+        self.bytes += sent
+        self.latency.observe(ms)
+
+    def summary(self):
+        return {"requests": self.requests, "errors": self.errors, "bytes": self.bytes, **self.latency.summary()}
+
+
+class RequestMetrics:
+    """
+    Request counts, 5xx counts, bytes sent and latency histograms, kept
+    per route pattern and per plugin id.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._plugins = {}
+        self.started_at = time.time()
+
+    def record(self, route_key, ms, status, sent, plugin=None):
+        with self._lock:
+            self._routes.setdefault(route_key, _Series()).record(ms, status, sent)
+            if plugin:
+                self._plugins.setdefault(plugin, _Series()).record(ms, status, sent)
+
+    def snapshot(self):
+        with self._lock:
+            routes = {k: s.summary() for k, s in self._routes.items()}
+            plugins = {k: s.summary() for k, s in self._plugins.items()}
+        return {
+            "since": self.started_at,
+            "routes": dict(sorted(routes.items(), key=lambda kv: -kv[1]["requests"])),
+            "plugins": plugins,
+        }
@@ -2,69 +2,198 @@ import os
 import json
 import importlib.util
 import sys
+import threading
+import time
+from core.http_utils import send_json
+from core.workspace_store import workspace_store
 
 class PluginManager:
-    def __init__(self, workspace, plugins_dir):
+    """
+    Reads every plugin manifest at startup but imports backend.py only on
+    the first request to the plugin (or from warm(), once the server is up).
+    on_changes() hot-reloads plugins whose manifest or Python files changed.
+    Backends reach the shared WorkspaceStore through workspace_store(), where
+    the manager registers the store it was given.
+    """
+
+    def __init__(self, workspace, plugins_dir, store=None):
         self.workspace = workspace
-        self.plugins_dir = plugins_dir
+        self.plugins_dir = os.path.abspath(plugins_dir)
         self.plugins = {}
+        self.reloads = {}  # plugin id -> reload counters
+        self.router = None
+        self.store = workspace_store(workspace, store)
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
         self.load_plugins()
 
     def load_plugins(self):
         if not os.path.exists(self.plugins_dir):
             return
 
-        for entry in os.listdir(self.plugins_dir):
-            plugin_path = os.path.join(self.plugins_dir, entry)
-            manifest_path = os.path.join(plugin_path, "manifest.json")
-            
-            if os.path.isdir(plugin_path) and os.path.exists(manifest_path):
+        for entry in sorted(os.listdir(self.plugins_dir)):
+            if os.path.exists(os.path.join(self.plugins_dir, entry, "manifest.json")):
                 try:
-                    with open(manifest_path, "r") as f:
-                        manifest = json.load(f)
-                    
-                    plugin_id = entry
-                    manifest["id"] = plugin_id
-                    manifest["path"] = plugin_path
-                    
-                    # Try to load backend logic if defined
-                    backend_file = manifest.get("backend_file", "backend.py")
-                    backend_path = os.path.join(plugin_path, backend_file)
-                    
-                    handler_module = None
-                    if os.path.exists(backend_path):
-                        spec = importlib.util.spec_from_file_location(f"plugin_{plugin_id}", backend_path)
-                        handler_module = importlib.util.module_from_spec(spec)
-                        sys.modules[f"plugin_{plugin_id}"] = handler_module
-                        spec.loader.exec_module(handler_module)
-                    
-                    self.plugins[plugin_id] = {
-                        "manifest": manifest,
-                        "handler": handler_module
-                    }
-                    print(f"  ✓ Plugin loaded: {manifest.get('name', plugin_id)} (v{manifest.get('version', '1.0.0')})")
+                    plugin = self._read_plugin(entry)
+                    self.plugins[entry] = plugin
+                    manifest = plugin["manifest"]
+                    print(f"  ✓ Plugin registered: {manifest.get('name', entry)} (v{manifest.get('version', '1.0.0')})")
                 except Exception as e:
                     print(f"  ✗ Failed to load plugin {entry}: {e}")
 
+    def _read_plugin(self, plugin_id):
+        plugin_path = os.path.join(self.plugins_dir, plugin_id)
+        with open(os.path.join(plugin_path, "manifest.json"), "r") as f:
+            manifest = json.load(f)
+        manifest["id"] = plugin_id
+        manifest["path"] = plugin_path
+        backend_path = os.path.join(plugin_path, manifest.get("backend_file", "backend.py"))
+        return {
+            "manifest": manifest,
+            "backend_path": backend_path if os.path.exists(backend_path) else None,
+            "handler": None,
+            "load_ms": None,
+            "error": None,
+        }
+
+    def _import_backend(self, plugin_id, backend_path):
+        name = f"plugin_{plugin_id}"
+        previous = sys.modules.get(name)
+        spec = importlib.util.spec_from_file_location(name, backend_path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+            if not hasattr(module, "handle_request"):
+                raise ImportError(f"{os.path.basename(backend_path)} defines no handle_request()")
+        except BaseException:
+            # A broken import must not evict the module that is still serving
+            if previous is not None: sys.modules[name] = previous
+            else: sys.modules.pop(name, None)
+            raise
+        return module
+
+    def backend(self, plugin_id):
+        """The plugin's backend module, imported on first use; None if it has none or failed."""
+        plugin = self.plugins.get(plugin_id)
+        if not plugin or not plugin["backend_path"]:
+            return None
+        if plugin["handler"] or plugin["error"]:
+            return plugin["handler"]
+        with self._lock:
+            if plugin["handler"] or plugin["error"]:
+                return plugin["handler"]
+            start = time.perf_counter()
+            try:
+                plugin["handler"] = self._import_backend(plugin_id, plugin["backend_path"])
+                plugin["load_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            except Exception as e:
+                plugin["error"] = str(e)
+                print(f"  ✗ Failed to import backend of plugin {plugin_id}: {e}")
+        return plugin["handler"]
+
+    def warm(self):
+        """Imports every backend in a background thread so first requests don't pay for it."""
+        def run():
+            start = time.perf_counter()
+            for plugin_id in list(self.plugins): self.backend(plugin_id)
+            print(f"  ✓ Plugin backends warmed in {(time.perf_counter() - start) * 1000:.0f} ms")
+        threading.Thread(target=run, name="genesis-plugin-warmup", daemon=True).start()
+
+    # --- hot reload ---
+
+    def on_changes(self, paths):
+        """FileWatcher callback: reloads each plugin with a changed manifest or .py file."""
+        changed = set()
+        for fp in paths:
+            rel = os.path.relpath(fp, self.plugins_dir)
+            plugin_id, _, name = rel.partition(os.sep)
+            if rel.startswith("..") or not name: continue
+            if name == "manifest.json" or name.endswith(".py"):
+                changed.add(plugin_id)
+        return {plugin_id: self.reload(plugin_id) for plugin_id in sorted(changed)}
+
+    def reload(self, plugin_id):
+        """
+        Re-reads the manifest and re-imports the backend, then swaps plugin
+        entry and routes in one step. If anything fails, the previous
+        version keeps serving. Returns "reloaded", "added", "removed" or "failed".
+        """
+        with self._reload_lock:
+            start = time.perf_counter()
+            counters = self.reloads.setdefault(plugin_id, {"reloads": 0, "failures": 0, "last_ms": None,
+                                                           "last_error": None, "last_at": None})
+            old = self.plugins.get(plugin_id)
+            if not os.path.exists(os.path.join(self.plugins_dir, plugin_id, "manifest.json")):
+                if not old: return None
+                if self.router: self.router.remove_owner(plugin_id)
+                self.plugins.pop(plugin_id, None)
+                print(f"  ✓ Plugin removed: {plugin_id}")
+                return "removed"
+            try:
+                plugin = self._read_plugin(plugin_id)
+                if plugin["backend_path"]:
+                    plugin["handler"] = self._import_backend(plugin_id, plugin["backend_path"])
+                    plugin["load_ms"] = round((time.perf_counter() - start) * 1000, 2)
+                if self.router: self.router.replace_owner(plugin_id, self._route_specs(plugin_id, plugin))
+            except Exception as e:
+                counters["failures"] += 1
+                counters["last_error"] = f"{type(e).__name__}: {e}"
+                counters["last_at"] = time.time()
+                print(f"  ⚠ Reload of plugin {plugin_id} failed, keeping previous version: {e}")
+                return "failed"
+            self.plugins[plugin_id] = plugin
+            counters["reloads"] += 1
+            counters["last_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            counters["last_error"] = None
+            counters["last_at"] = time.time()
+            print(f"  ✓ Plugin {'reloaded' if old else 'added'}: {plugin_id} ({counters['last_ms']} ms)")
+            return "reloaded" if old else "added"
+
+    def stats(self):
+        out = {}
+        for pid, p in self.plugins.items():
+            out[pid] = {"backend": bool(p["backend_path"]), "loaded": p["handler"] is not None,
+                        "load_ms": p["load_ms"], "error": p["error"]}
+            if pid in self.reloads: out[pid]["reload"] = dict(self.reloads[pid])
+        return out
+
     def get_manifests(self):
         return [p["manifest"] for p in self.plugins.values()]
 
-    def handle_api(self, handler, method):
-        # Route format: /api/plugins/[plugin_id]/[action]
-        parts = handler.path.split('/')
-        if len(parts) < 5 or parts[2] != "plugins":
-            return False
-            
-        plugin_id = parts[3]
-        action = "/".join(parts[4:])
-        
-        if plugin_id in self.plugins:
-            plugin = self.plugins[plugin_id]
-            if plugin["handler"] and hasattr(plugin["handler"], "handle_request"):
-                try:
-                    plugin["handler"].handle_request(handler, method, action, self.workspace)
-                    return True
-                except Exception as e:
-                    print(f"  ⚠ Plugin {plugin_id} execution error: {e}")
-                    return False
-        return False
+    def register_routes(self, router):
+        """Registers /api/plugins/<id>/ for every plugin with a backend."""
+        self.router = router
+        for plugin_id, plugin in self.plugins.items():
+            for spec in self._route_specs(plugin_id, plugin):
+                router.add(spec.pop("path"), spec.pop("handler"), owner=plugin_id, **spec)
+
+    def _route_specs(self, plugin_id, plugin):
+        if not plugin["backend_path"]:
+            return []
+        base = f"/api/plugins/{plugin_id}/"
+        dispatch = self._dispatcher(plugin_id)
+        specs = [dict(path=base, handler=dispatch, methods=("GET", "POST"), prefix=True, plugin=plugin_id)]
+        # Actions with manifest route metadata (admission class, max_inflight,
+        # limit_key, coalesce) get their own exact route
+        for action, meta in plugin["manifest"].get("routes", {}).items():
+            specs.append(dict(meta, path=base + action, handler=dispatch, methods=("GET", "POST"),
+                              plugin=plugin_id, action=action))
+        return specs
+
+    def _dispatcher(self, plugin_id):
+        prefix_len = len(f"/api/plugins/{plugin_id}/")
+
+        def dispatch(handler, rest):
+            module = self.backend(plugin_id)
+            if not hasattr(module, "handle_request"):
+                send_json(handler, {"status": "error", "message": f"Plugin {plugin_id} backend unavailable"}, status=500)
+                return
+            action = handler.path.split("?", 1)[0][prefix_len:]
+            method = "GET" if handler.command == "HEAD" else handler.command
+            try:
+                module.handle_request(handler, method, action, self.workspace)
+            except Exception as e:
+                print(f"  ⚠ Plugin {plugin_id} execution error: {e}")
+                send_json(handler, {"status": "error", "message": f"Plugin {plugin_id} failed: {e}"}, status=500)
+        return dispatch
@@ -0,0 +1,83 @@
+import cProfile
+import os
+import re
+import threading
+import time
+
+PROFILE_HEADER = "X-Genesis-Profile"
+PROFILE_QUERY = "__profile=1"
+
+
+class RequestProfiler:
+    """
+    Wraps single requests in cProfile on demand. Off unless the server was
+    started with --allow-profiling; a request then opts in with the
+    X-Genesis-Profile: 1 header or a __profile=1 query parameter. Dumps go
+    to profile_dir as <timestamp>_<method>_<route>.prof, newest `keep` kept.
+    """
+
+    def __init__(self, profile_dir, enabled=False, keep=50):
+        self.profile_dir = profile_dir
+        self.enabled = enabled
+        self.keep = keep
+        # One profiler at a time: cProfile is per-thread and newer Pythons refuse to nest them
+        self._lock = threading.Lock()
+
+    def wanted(self, handler):
+        if not self.enabled: return False
+        header = handler.headers.get(PROFILE_HEADER)
+        return header == "1" or PROFILE_QUERY in handler.path.partition("?")[2].split("&")
+
+    def run(self, method, route_path, fn):
+        """Calls fn() under cProfile; returns the dump's file name, or None if busy."""
+        if not self._lock.acquire(blocking=False):
+            fn()
+            return None
+        try:
+            prof = cProfile.Profile()
+            prof.enable()
+            try:
+                fn()
+            finally:
+                prof.disable()
+                name = self._write(prof, method, route_path)
+        finally:
+            self._lock.release()
+        return name
+
+    def _write(self, prof, method, route_path):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", route_path).strip("-") or "root"
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}"
+        name, n = f"{stamp}_{method}_{slug}.prof", 1
+        while os.path.exists(os.path.join(self.profile_dir, name)):
+            # Two dumps within one millisecond must not overwrite each other
+            name, n = f"{stamp}.{n}_{method}_{slug}.prof", n + 1
+        fp = os.path.join(self.profile_dir, name)
+        prof.dump_stats(fp + ".tmp")
+        os.replace(fp + ".tmp", fp)
+        self._prune()
+        return name
+
+    def _prune(self):
+        for old in self.list()[self.keep:]:
+            try: os.remove(os.path.join(self.profile_dir, old["file"]))
+            except OSError: pass
+
+    def list(self):
+        """Profile dumps, newest first."""
+        if not os.path.isdir(self.profile_dir): return []
+        out = []
+        for name in os.listdir(self.profile_dir):
+            if not name.endswith(".prof"): continue
+            try: st = os.stat(os.path.join(self.profile_dir, name))
+            except OSError: continue
+            stamp, _, rest = name[:-len(".prof")].partition("_")
+            method, _, route = rest.partition("_")
+            out.append({"file": name, "method": method, "route": route, "bytes": st.st_size, "created": st.st_mtime})
+        return sorted(out, key=lambda p: p["created"], reverse=True)
+
+    def dump_path(self, name):
+        """Full path of a listed dump, or None for any other name."""
+        if name not in {p["file"] for p in self.list()}: return None
+        return os.path.join(self.profile_dir, name)
@@ -0,0 +1,251 @@
+import json
+import os
+import threading
+import zlib
+
+# Logs covered by the dashboard's index, relative to memory/ (directories: every *.jsonl inside)
+INDEXED_SOURCES = ["experiences", "reflections.jsonl"]
+
+
+class RecordIndex:
+    """
+    Sidecar index of JSONL records by id: id -> (file, offset, length) plus
+    the significance and reflected flags, so a record is fetched with one
+    seek and filtered views never parse the logs. The index follows its logs
+    by scanning only the bytes appended since the last refresh; a log that was
+    rewritten (e.g. experiences marked reflected) is re-scanned on its own.
+    The sidecar itself is append-only JSONL and is compacted when it has
+    accumulated more superseded lines than live ones.
+
+    The id map keeps the last record of a duplicated id; count() tallies
+    every record line instead, duplicates and records without an id included.
+    Other processes (the validators) open the index read_only: they follow
+    the logs from the dashboard's sidecar but never write it.
+
+    Sidecar lines: ["id", file, offset, length, significance, reflected] per
+    record, then {"file", "ino", "mtime", "end", "last", "tally"} once the
+    records of a scan are written; {"file", "reset": true} drops a file's
+    earlier entries.
+    """
+
+    def __init__(self, base_dir, sources=INDEXED_SOURCES, index_path=None, read_only=False):
+        self.base_dir = os.path.abspath(base_dir)
+        self.sources = sources
+        self.index_path = index_path or os.path.join(self.base_dir, "cache", "records.idx.jsonl")
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        self._entries = {}  # id -> (file, offset, length, significance, reflected)
+        self._files = {}    # file -> {"ino", "mtime", "end", "last": [offset, length, crc], "tally"}
+        self._lines = 0
+        self.appends = 0
+        self.rescans = 0
+        self.fetches = 0
+        self._load()
+
+    # --- sidecar ---
+
+    def _load(self):
+        try:
+            f = open(self.index_path, "rb")
+        except OSError:
+            return
+        with f:
+            for line in f:
+                try: item = json.loads(line)
+                except ValueError: continue  # Torn last line; its records are re-scanned
+                self._lines += 1
+                if isinstance(item, list):
+                    self._entries[item[0]] = tuple(item[1:])
+                elif item.get("reset"):
+                    self._drop(item["file"])
+                    self._files.pop(item["file"], None)
+                else:
+                    self._files[item.pop("file")] = item
+        # Records written after the last checkpoint of their file are simply found again
+        for rid, entry in list(self._entries.items()):
+            state = self._files.get(entry[0])
+            if not state or entry[1] >= state["end"]: del self._entries[rid]
+
+    def _append(self, lines):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        with open(self.index_path, "a") as f:
+            f.write("".join(json.dumps(item, separators=(",", ":")) + "\n" for item in lines))
+        self._lines += len(lines)
+
+    def _compact(self):
+        lines = [[rid, *entry] for rid, entry in self._entries.items()]
+        lines += [dict(state, file=name) for name, state in self._files.items()]
+        tmp = self.index_path + ".tmp"
+        os.makedirs(os.path.dirname(tmp), exist_ok=True)
+        with open(tmp, "w") as f:
+            f.write("".join(json.dumps(item, separators=(",", ":")) + "\n" for item in lines))
+        os.replace(tmp, self.index_path)
+        self._lines = len(lines)
+
+    # --- following the logs ---
+
+    def _log_files(self):
+        names = []
+        for rel in self.sources:
+            fp = os.path.join(self.base_dir, rel)
+            if os.path.isdir(fp):
+                try: names += sorted(os.path.join(rel, n) for n in os.listdir(fp) if n.endswith(".jsonl"))
+                except OSError: pass
+            else:
+                names.append(rel)
+        return names
+
+    def _drop(self, name):
+        for rid in [rid for rid, entry in self._entries.items() if entry[0] == name]:
+            del self._entries[rid]
+
+    def _tail_intact(self, f, state):
+        # The last indexed line is still where we left it, so the file only grew
+        offset, length, crc = state["last"] or (0, 0, 0)
+        if not length: return True
+        f.seek(offset)
+        return zlib.crc32(f.read(length)) == crc
+
+    def _scan(self, name, st, state):
+        """New sidecar lines for one log, or None when it is unchanged."""
+        fp = os.path.join(self.base_dir, name)
+        out, start = [], 0
+        try:
+            f = open(fp, "rb")
+        except OSError:
+            return None
+        with f:
+            # Checkpoints written before tallies existed are scanned again
+            if state and state["ino"] == st.st_ino and st.st_size >= state["end"] and "tally" in state:
+                if st.st_size == state["end"] and st.st_mtime_ns == state["mtime"]: return None
+                if st.st_size > state["end"] and self._tail_intact(f, state): start = state["end"]
+            if state and not start:
+                self._drop(name)
+                out.append({"file": name, "reset": True})
+                self.rescans += 1
+            f.seek(start)
+            chunk = f.read(st.st_size - start)
+        # Only complete lines (or a last record missing its newline); a half-written one is picked up next time
+        end = chunk.rfind(b"\n") + 1
+        try:
+            if chunk[end:].strip() and isinstance(json.loads(chunk[end:]), dict): end = len(chunk)
+        except ValueError:
+            pass
+        last = state["last"] if start else None
+        tally = {(sig, refl): n for sig, refl, n in state["tally"]} if start else {}
+        pos = start
+        for line in chunk[:end].split(b"\n"):
+            offset, pos = pos, pos + len(line) + 1
+            if not line.strip(): continue
+            try: record = json.loads(line)
+            except ValueError: continue
+            last = [offset, len(line), zlib.crc32(line)]
+            if not isinstance(record, dict): continue
+            sig, refl = record.get("significance"), record.get("reflected")
+            key = (sig if isinstance(sig, str) else None, refl if isinstance(refl, bool) else None)
+            tally[key] = tally.get(key, 0) + 1
+            if "id" not in record: continue
+            entry = (name, offset, len(line), record.get("significance"), record.get("reflected"))
+            self._entries[str(record["id"])] = entry
+            out.append([str(record["id"]), *entry])
+        self.appends += 1
+        self._files[name] = {"ino": st.st_ino, "mtime": st.st_mtime_ns, "end": start + end, "last": last,
+                             "tally": [[sig, refl, n] for (sig, refl), n in tally.items()]}
+        out.append(dict(self._files[name], file=name))
+        return out
+
+    def refresh(self):
+        """Brings the index up to date with its logs: one stat() per log, reads only what changed."""
+        with self._lock:
+            lines, seen = [], set()
+            for name in self._log_files():
+                try: st = os.stat(os.path.join(self.base_dir, name))
+                except OSError: continue
+                seen.add(name)
+                lines += self._scan(name, st, self._files.get(name)) or []
+            for name in [n for n in self._files if n not in seen]:
+                self._drop(name)
+                del self._files[name]
+                lines.append({"file": name, "reset": True})
+            if not lines: return False
+            if self.read_only: return True
+            try:
+                if self._lines + len(lines) > 2 * (len(self._entries) + len(self._files)) + 64: self._compact()
+                else: self._append(lines)
+            except OSError as e:
+                print(f"  ⚠ Could not write record index: {e}")
+            return True
+
+    # --- queries ---
+
+    def locate(self, rid):
+        """(file, offset, length, significance, reflected) of a record, or None."""
+        self.refresh()
+        with self._lock:
+            return self._entries.get(rid)
+
+    def _read(self, rid):
+        """One record from its indexed offset, without refreshing; None when it moved."""
+        with self._lock:
+            entry = self._entries.get(rid)
+        if not entry: return None
+        try:
+            with open(os.path.join(self.base_dir, entry[0]), "rb") as f:
+                f.seek(entry[1])
+                record = json.loads(f.read(entry[2]))
+            if record.get("id") == rid:
+                self.fetches += 1
+                return record
+        except (OSError, ValueError, AttributeError):
+            pass
+        # Rewritten in place without a visible stat change: have refresh() re-scan the file
+        with self._lock:
+            state = self._files.get(entry[0])
+            if state: state["ino"] = None
+        return None
+
+    def _fetch(self, ids):
+        """Records for ids already current in the index; one more refresh only if some moved."""
+        records = {rid: self._read(rid) for rid in ids}
+        missing = [rid for rid, r in records.items() if r is None]
+        if missing and self.refresh():
+            for rid in missing: records[rid] = self._read(rid)
+        return [records[rid] for rid in ids if records[rid] is not None]
+
+    def get(self, rid):
+        """One record by id, read with a single seek."""
+        self.refresh()
+        found = self._fetch([rid])
+        return found[0] if found else None
+
+    def ids(self, significance=None, reflected=None, prefix=None):
+        """Ids in file order, filtered on the indexed flags and/or the file path (e.g. "experiences/")."""
+        self.refresh()
+        with self._lock:
+            matches = [(e[0], e[1], rid) for rid, e in self._entries.items()
+                       if (significance is None or e[3] == significance)
+                       and (reflected is None or e[4] is reflected)
+                       and (prefix is None or e[0].startswith(prefix))]
+        return [rid for _, _, rid in sorted(matches)]
+
+    def select(self, significance=None, reflected=None, prefix=None, limit=None):
+        """The matching records themselves; with a limit, the most recent ones. One refresh per call."""
+        ids = self.ids(significance, reflected, prefix)
+        if limit is not None: ids = ids[-limit:] if limit > 0 else []
+        return self._fetch(ids)
+
+    def count(self, significance=None, reflected=None, prefix=None):
+        """Record lines matching the flags, like a scan of the logs would count them (duplicates included)."""
+        self.refresh()
+        with self._lock:
+            return sum(n for name, state in self._files.items() if prefix is None or name.startswith(prefix)
+                       for sig, refl, n in state["tally"]
+                       if (significance is None or sig == significance) and (reflected is None or refl is reflected))
+
+    def __contains__(self, rid):
+        return self.locate(rid) is not None
+
+    def stats(self):
+        with self._lock:
+            return {"records": len(self._entries), "files": len(self._files), "sidecar_lines": self._lines,
+                    "appends": self.appends, "rescans": self.rescans, "fetches": self.fetches}
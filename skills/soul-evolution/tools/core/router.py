@@ -0,0 +1,125 @@
+import threading
+
+
+class Route:
+    """A registered endpoint: handler(request_handler, rest) plus metadata."""
+
+    __slots__ = ("path", "handler", "methods", "prefix", "owner", "meta")
+
+    def __init__(self, path, handler, methods, prefix, owner, meta):
+        self.path = path
+        self.handler = handler
+        self.methods = methods
+        self.prefix = prefix
+        self.owner = owner
+        self.meta = meta
+
+    def describe(self):
+        return {
+            "path": self.path,
+            "methods": sorted(self.methods),
+            "match": "prefix" if self.prefix else "exact",
+            "owner": self.owner,
+            **{k: v for k, v in self.meta.items() if isinstance(v, (str, int, float, bool, type(None)))},
+        }
+
+
+class _Node:
+    __slots__ = ("children", "routes")
+
+    def __init__(self):
+        self.children = {}
+        self.routes = {}  # method -> Route
+
+
+def _segments(path):
+    return [s for s in path.split("/") if s]
+
+
+class Router:
+    """
+    Route registry built once at startup: an exact-match dict plus a
+    segment trie for prefix routes. Resolution is one dict lookup, or one
+    walk down the trie keeping the longest matching prefix.
+    """
+
+    def __init__(self):
+        self._exact = {}  # path -> {method: Route}
+        self._trie = _Node()
+        self._routes = []
+        self._lock = threading.Lock()
+
+    def add(self, path, handler, methods=("GET",), prefix=False, owner="core", **meta):
+        route = Route(path, handler, {m.upper() for m in methods}, prefix, owner, meta)
+        with self._lock:
+            self._insert(self._exact, self._trie, route)
+            self._routes.append(route)
+        return route
+
+    @staticmethod
+    def _insert(exact, trie, route):
+        if route.prefix:
+            node = trie
+            for seg in _segments(route.path):
+                node = node.children.setdefault(seg, _Node())
+            table = node.routes
+        else:
+            table = exact.setdefault(route.path, {})
+        clash = route.methods & set(table)
+        if clash:
+            raise ValueError(f"Route {sorted(clash)} {route.path} already registered by {table[next(iter(clash))].owner}")
+        for m in route.methods: table[m] = route
+
+    def remove_owner(self, owner):
+        """Drops every route registered by owner (e.g. a plugin being removed)."""
+        return self.replace_owner(owner, [])
+
+    def replace_owner(self, owner, routes):
+        """
+        Atomically swaps owner's routes for `routes`, a list of add() keyword
+        dicts. On a clash nothing changes and ValueError is raised.
+        """
+        with self._lock:
+            keep = [r for r in self._routes if r.owner != owner]
+            new = []
+            for spec in routes:
+                spec = dict(spec)
+                path, handler = spec.pop("path"), spec.pop("handler")
+                methods, prefix = spec.pop("methods", ("GET",)), spec.pop("prefix", False)
+                new.append(Route(path, handler, {m.upper() for m in methods}, prefix, owner, spec))
+            exact, trie = {}, _Node()
+            for r in keep + new: self._insert(exact, trie, r)
+            removed = len(self._routes) - len(keep)
+            # Swap whole tables so concurrent lookups never see a half-built registry
+            self._exact, self._trie, self._routes = exact, trie, keep + new
+        return removed
+
+    def resolve(self, method, path):
+        """
+        Returns (route, rest, allowed). rest is the part of the path below a
+        prefix route; allowed lists the methods the path does support when
+        the requested one does not match (for 405 responses).
+        """
+        method = "GET" if method == "HEAD" else method
+        table = self._exact.get(path)
+        if table and method in table:
+            return table[method], "", None
+        allowed = set(table or ())
+
+        node, best, best_depth, covering = self._trie, None, 0, self._trie.routes
+        segs = _segments(path)
+        if method in node.routes: best = node.routes[method]
+        for depth, seg in enumerate(segs, 1):
+            node = node.children.get(seg)
+            if node is None: break
+            if node.routes: covering = node.routes
+            if method in node.routes:
+                best, best_depth = node.routes[method], depth
+        if best:
+            return best, "/".join(segs[best_depth:]), None
+        allowed |= set(covering)
+        return None, "", sorted(allowed) or None
+
+    def describe(self):
+        with self._lock:
+            return [r.describe() for r in self._routes]
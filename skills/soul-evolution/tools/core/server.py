@@ -0,0 +1,257 @@
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Seconds an idle HTTP/1.1 connection may hold a pool worker
+KEEPALIVE_TIMEOUT = 15
+
+# name -> (workers, queue_limit, queue_timeout seconds)
+DEFAULT_CLASSES = {
+    "read": (8, 64, 5.0),
+    "subprocess": (2, 8, 15.0),
+    "write": (1, 32, 10.0),
+}
+
+# Per-endpoint limits (route meta "max_inflight") queue this many and wait this long
+ENDPOINT_QUEUE_LIMIT = 4
+ENDPOINT_QUEUE_TIMEOUT = 10.0
+
+
+class ServerBusy(Exception):
+    """Raised when a concurrency class cannot admit another request."""
+
+    def __init__(self, class_name, retry_after=1):
+        super().__init__(f"Concurrency class '{class_name}' is saturated")
+        self.class_name = class_name
+        self.retry_after = retry_after
+
+
+def classify_request(method, concurrency=None):
+    """
+    Maps a request onto one of the concurrency classes. Routes declare
+    their class in metadata (e.g. "subprocess" for bridge calls); the
+    rest fall back on the method.
+    """
+    if concurrency:
+        return concurrency
+    if method == "POST":
+        return "write"
+    return "read"
+
+
+class ConcurrencyClass:
+    """A bounded slot pool with a bounded wait queue in front of it."""
+
+    def __init__(self, name, workers, queue_limit, queue_timeout):
+        self.name = name
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @contextmanager
+    def slot(self):
+        acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                if self.queued >= self.queue_limit:
+                    self.rejected += 1
+                    raise ServerBusy(self.name)
+                self.queued += 1
+                self.peak_queued = max(self.peak_queued, self.queued)
+
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+            with self._lock:
+                self.queued -= 1
+                if not acquired:
+                    self.timed_out += 1
+                    self.rejected += 1
+            if not acquired:
+                raise ServerBusy(self.name, retry_after=int(self.queue_timeout))
+
+        with self._lock:
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "active": self.active,
+                "queued": self.queued,
+                "queue_limit": self.queue_limit,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first caller
+    runs fn, everyone arriving while it is in flight gets its result (or
+    its exception) instead of starting another run. Followers wait at most
+    `timeout` seconds, then give up with ServerBusy like a full queue would.
+    """
+
+    def __init__(self, timeout=ENDPOINT_QUEUE_TIMEOUT):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> [done Event, result, exception]
+        self.leaders = 0
+        self.shared = 0
+        self.timed_out = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = [threading.Event(), None, None]
+                self.leaders += 1
+            else:
+                self.shared += 1
+        if not leader:
+            if not call[0].wait(self.timeout):
+                with self._lock:
+                    self.timed_out += 1
+                raise ServerBusy("coalesced", retry_after=int(self.timeout))
+        else:
+            try:
+                call[1] = fn()
+            except BaseException as e:
+                call[2] = e
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call[0].set()
+        if call[2] is not None:
+            raise call[2]
+        return call[1]
+
+    def stats(self):
+        with self._lock:
+            return {"in_flight": len(self._calls), "leaders": self.leaders, "shared": self.shared, "timed_out": self.timed_out}
+
+
+class EndpointLimits:
+    """Lazily created slot pools for routes that declare max_inflight, keyed by limit_key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = {}
+
+    def slot(self, key, limit):
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = ConcurrencyClass(f"endpoint:{key}", limit, ENDPOINT_QUEUE_LIMIT, ENDPOINT_QUEUE_TIMEOUT)
+        return pool.slot()
+
+    def stats(self):
+        with self._lock:
+            return {key: pool.stats() for key, pool in self._pools.items()}
+
+
+class PooledHTTPServer(socketserver.TCPServer):
+    """
+    TCP server that hands every connection to a bounded thread pool.
+    Request handlers then claim a slot in their concurrency class, so a
+    slow bridge call can only ever block its own class.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, connection_workers=16, max_pending=128, classes=None):
+        super().__init__(server_address, handler_class)
+        self.connection_workers = connection_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=connection_workers, thread_name_prefix="genesis-http")
+        self._pending_lock = threading.Lock()
+        self.pending = 0
+        self.dropped_connections = 0
+        self.started_at = time.time()
+        self.classes = {
+            name: ConcurrencyClass(name, *cfg)
+            for name, cfg in (classes or DEFAULT_CLASSES).items()
+        }
+        self.endpoints = EndpointLimits()
+
+    def process_request(self, request, client_address):
+        with self._pending_lock:
+            if self.pending >= self.max_pending:
+                self.dropped_connections += 1
+                self.shutdown_request(request)
+                return
+            self.pending += 1
+        self._executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._pending_lock:
+                self.pending -= 1
+
+    def admission(self, method, concurrency=None):
+        return self.classes[classify_request(method, concurrency)].slot()
+
+    def endpoint_slot(self, key, limit):
+        return self.endpoints.slot(key, limit)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._pending_lock:
+            connections = {
+                "workers": self.connection_workers,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "dropped": self.dropped_connections,
+            }
+        return {
+            "mode": "pooled",
+            "keepalive_timeout_s": KEEPALIVE_TIMEOUT,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "connections": connections,
+            "classes": {name: c.stats() for name, c in self.classes.items()},
+            "endpoints": self.endpoints.stats(),
+        }
+
+
+class SingleThreadedHTTPServer(socketserver.TCPServer):
+    """Legacy serial server, kept behind --single-thread for debugging."""
+
+    allow_reuse_address = True
+
+    @contextmanager
+    def admission(self, method, concurrency=None):
+        yield
+
+    @contextmanager
+    def endpoint_slot(self, key, limit):
+        yield
+
+    def stats(self):
+        return {"mode": "single-threaded"}
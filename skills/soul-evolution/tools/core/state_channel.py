@@ -0,0 +1,141 @@
+import json
+import os
+import select
+import threading
+import time
+from datetime import datetime
+
+from core.websocket import OP_TEXT, WebSocketClosed
+
+BROADCAST_HZ = 30
+PING_INTERVAL = 20.0
+
+
+class Viewer:
+    """One connected socket: deltas merge here until its next send slot."""
+
+    def __init__(self):
+        self.pending = {}
+        self.snapshot = False
+        self.last_sent = 0.0
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_w, False)  # A full pipe already means "wake up"
+
+    def push(self, delta=None, snapshot=False):
+        if snapshot: self.snapshot, self.pending = True, {}
+        elif delta: self.pending.update(delta)
+        try: os.write(self._wake_w, b"x")
+        except OSError: pass
+
+    def drain_wakeups(self):
+        try: os.read(self._wake_r, 4096)
+        except OSError: pass
+
+    def close(self):
+        for fd in (self._wake_r, self._wake_w):
+            try: os.close(fd)
+            except OSError: pass
+
+
+class StateChannel:
+    """
+    Fans changes of one HotDocument (avatar_state.json) out to WebSocket
+    viewers. Every writer of the document is covered, not only socket
+    messages; each viewer gets the accumulated delta at most hz times a second.
+    """
+
+    def __init__(self, doc, max_viewers=4, hz=BROADCAST_HZ):
+        self.doc = doc
+        self.max_viewers = max_viewers
+        self.interval = 1.0 / hz
+        self._lock = threading.Lock()
+        self._viewers = set()
+        self.frames = 0
+        doc.subscribe(self._on_doc_change)
+
+    def _on_doc_change(self, delta):
+        with self._lock:
+            for viewer in self._viewers:
+                if delta is None: viewer.push(snapshot=True)
+                else: viewer.push(delta)
+
+    def apply(self, delta, stamp=True):
+        """Merges a shallow delta (same semantics as the REST update)."""
+        if not isinstance(delta, dict) or not delta: return
+        delta = dict(delta)
+        if stamp: delta["timestamp"] = datetime.now().isoformat()
+        self.doc.merge(delta)
+
+    # --- viewers ---
+
+    def serve(self, ws):
+        """Runs one WebSocket session on the calling (connection) thread until it closes."""
+        viewer = Viewer()
+        with self._lock:
+            if len(self._viewers) >= self.max_viewers:
+                viewer.close()
+                ws.close(1013)
+                return False
+            self._viewers.add(viewer)
+            viewer.push(snapshot=True)
+        try:
+            self._loop(ws, viewer)
+        except (WebSocketClosed, OSError):
+            pass
+        finally:
+            with self._lock: self._viewers.discard(viewer)
+            viewer.close()
+            ws.close()
+        return True
+
+    def _loop(self, ws, viewer):
+        last_ping = time.monotonic()
+        while not ws.closed:
+            now = time.monotonic()
+            due = viewer.last_sent + self.interval
+            has_pending = viewer.snapshot or viewer.pending
+            # Rate cap: pending deltas wait for the next slot instead of waking us again
+            wait = max(0.0, due - now) if has_pending else PING_INTERVAL
+            watch = [ws.sock] if has_pending else [ws.sock, viewer._wake_r]
+            readable = [ws.sock] if ws._buf else select.select(watch, [], [], wait)[0]
+
+            if ws.sock in readable:
+                opcode, payload = ws.recv()
+                if opcode == OP_TEXT: self._on_message(ws, payload)
+            if viewer._wake_r in readable:
+                viewer.drain_wakeups()
+
+            now = time.monotonic()
+            if (viewer.snapshot or viewer.pending) and now >= viewer.last_sent + self.interval:
+                with self._lock:
+                    if viewer.snapshot: frame = {"type": "snapshot", "seq": self.doc.version, "data": self.doc.state}
+                    else: frame = {"type": "delta", "seq": self.doc.version, "data": viewer.pending}
+                    text = json.dumps(frame)
+                    viewer.pending, viewer.snapshot = {}, False
+                ws.send_text(text)
+                viewer.last_sent = now
+                self.frames += 1
+            elif now - last_ping >= PING_INTERVAL:
+                ws.ping()
+                last_ping = now
+
+    def _on_message(self, ws, payload):
+        # {"type": "update", "data": {...}} or a bare delta object
+        try:
+            msg = json.loads(payload)
+        except ValueError:
+            return
+        if not isinstance(msg, dict): return
+        if msg.get("type") == "update": msg = msg.get("data")
+        elif msg.get("type") is not None: return
+        self.apply(msg)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "viewers": len(self._viewers),
+                "max_viewers": self.max_viewers,
+                "seq": self.doc.version,
+                "frames": self.frames,
+                "max_hz": round(1.0 / self.interval, 1),
+            }
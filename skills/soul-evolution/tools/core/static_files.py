@@ -0,0 +1,124 @@
+import os
+import re
+from core.compression import choose_encoding, is_compressible, variant_etag
+from core.http_utils import file_etag, http_date, is_not_modified, send_empty, send_not_modified
+
+CONTENT_TYPES = {
+    ".html": "text/html", ".css": "text/css", ".js": "application/javascript", ".json": "application/json",
+    ".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp",
+    ".gif": "image/gif", ".svg": "image/svg+xml",
+    ".wav": "audio/wav", ".mp3": "audio/mpeg", ".ogg": "audio/ogg",
+    ".vrm": "model/gltf-binary", ".glb": "model/gltf-binary",
+}
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def content_type_for(path):
+    return CONTENT_TYPES.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+
+def parse_range(header, size):
+    """
+    Parses a single-range 'Range: bytes=...' header.
+    Returns (start, end) inclusive, None to serve the whole file, or
+    False when the range cannot be satisfied.
+    """
+    if not isinstance(header, str):
+        return None
+    m = _RANGE_RE.match(header.strip())
+    if not m:
+        return None  # Multi-range or malformed: a full 200 response is always allowed
+    first, last = m.groups()
+    if not first and not last:
+        return None
+    if size == 0:
+        return False if first else None  # No byte of an empty file can be addressed; a suffix gets it whole
+    if not first:
+        length = int(last)
+        if length == 0: return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+def _range_applies(handler, etag, mtime):
+    # If-Range: only honour the range when the client's copy is still current
+    cond = handler.headers.get("If-Range")
+    if not isinstance(cond, str):
+        return True
+    cond = cond.strip()
+    if cond.startswith('"') or cond.startswith("W/"):
+        return cond == etag
+    return cond == http_date(mtime)
+
+def serve_file(handler, path, static_cache=None, chunk_size=1 << 20, negotiated=None):
+    """
+    Serves a file with validators, optional precompressed variants and
+    single-range requests. Bodies are streamed with sendfile, so memory
+    use per request stays constant whatever the file size. `negotiated`
+    names a representation chosen from the Accept header (a thumbnail
+    format): it is part of the ETag and the response varies on Accept.
+    """
+    ct = content_type_for(path)
+    try:
+        f = open(path, "rb")
+    except OSError:
+        handler.send_error(404)
+        return
+
+    with f:
+        st = os.fstat(f.fileno())
+        base_etag, mtime = variant_etag(file_etag(st), negotiated), int(st.st_mtime)
+        range_header = handler.headers.get("Range")
+
+        # Encoded variants only for whole-file requests; ranges address identity bytes
+        encoding, data = None, None
+        if static_cache and is_compressible(ct) and not isinstance(range_header, str):
+            encoding = choose_encoding(handler.headers.get("Accept-Encoding"))
+            data = static_cache.get(path, st, encoding)
+            if data is None: encoding = None
+        etag = variant_etag(base_etag, encoding)
+        vary = ", ".join((["Accept"] if negotiated else []) + (["Accept-Encoding"] if is_compressible(ct) else []))
+
+        if is_not_modified(handler, etag, mtime):
+            send_not_modified(handler, etag, mtime, headers={"Vary": vary} if vary else None)
+            return
+
+        byte_range = None
+        if not encoding and _range_applies(handler, base_etag, mtime):
+            byte_range = parse_range(range_header, st.st_size)
+        if byte_range is False:
+            send_empty(handler, 416, {"Content-Range": f"bytes */{st.st_size}"})
+            return
+
+        start, end = byte_range or (0, st.st_size - 1)
+        length = len(data) if encoding else max(0, end - start + 1)
+
+        handler.send_response(206 if byte_range else 200)
+        handler.send_header("Content-Type", ct)
+        handler.send_header("Content-Length", str(length))
+        handler.send_header("Accept-Ranges", "bytes")
+        if byte_range: handler.send_header("Content-Range", f"bytes {start}-{end}/{st.st_size}")
+        if encoding: handler.send_header("Content-Encoding", encoding)
+        if vary: handler.send_header("Vary", vary)
+        handler.send_header("ETag", etag)
+        handler.send_header("Last-Modified", http_date(mtime))
+        handler.send_header("Cache-Control", "no-cache")
+        handler.end_headers()
+
+        if handler.command == "HEAD" or length == 0:
+            return
+        if encoding:
+            handler.wfile.write(data)
+            return
+        # socket.sendfile uses os.sendfile where possible and falls back to send()
+        handler.wfile.flush()
+        sent = 0
+        while sent < length:
+            n = handler.connection.sendfile(f, start + sent, min(chunk_size, length - sent))
+            if not n: break
+            sent += n
+        if sent < length:
+            # File shrank mid-send: the framing is broken, so the connection can't be reused
+            handler.close_connection = True
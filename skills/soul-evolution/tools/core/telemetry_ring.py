@@ -0,0 +1,275 @@
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime, timezone
+
+# Needs tracked by the engine (src/types/simulation.ts); a missing value is stored as NaN
+VITAL_COLUMNS = ["energy", "hunger", "thirst", "hygiene", "bladder", "bowel", "stress", "arousal", "libido", "joy", "social"]
+CAPACITY = 65536
+RETENTION_DAYS = 30
+
+MAGIC = b"GVRING01"
+HEADER_SIZE = 4096
+# magic, column count, capacity, records ever written, length of the JSON metadata that follows
+_HEADER = struct.Struct("<8sIIQI")
+
+
+def _epoch(ts):
+    try: return datetime.fromisoformat(str(ts).replace("Z", "+00:00")).timestamp()
+    except (ValueError, OverflowError): return None
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class TelemetryRing:
+    """
+    Fixed-width ring file of telemetry samples: each record is a float64
+    timestamp followed by one float32 per column, in a memory-mapped file
+    holding the last `capacity` samples. Reading the latest points is a
+    slice of the mapping, never a parse of history. New JSONL lines are
+    imported incrementally; the byte offset reached in each source is kept
+    in the header, and samples not newer than the last one are skipped, so
+    an import can be repeated safely. Sources imported together are merged
+    by timestamp first, so overlapping files interleave.
+    """
+
+    def __init__(self, path, columns=VITAL_COLUMNS, capacity=CAPACITY, retention_days=RETENTION_DAYS):
+        self.path = path
+        self.columns = list(columns)
+        self.capacity = capacity
+        self.retention = retention_days * 86400
+        self.record = struct.Struct("<d%df" % len(self.columns))
+        self._lock = threading.Lock()
+        self.imported = 0
+        self._open()
+
+    # --- file ---
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        size = HEADER_SIZE + self.capacity * self.record.size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            header = os.pread(fd, HEADER_SIZE, 0)
+            meta = self._read_header(header)
+            if meta is None or meta.get("columns") != self.columns or os.fstat(fd).st_size != size:
+                # New file, or a different layout: start over (sources are re-imported from scratch)
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+                meta, self.total = {"columns": self.columns, "sources": {}}, 0
+            self._mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self.sources = meta["sources"]  # file name -> [inode, offset]
+        self._write_header()
+
+    def _read_header(self, header):
+        if len(header) < _HEADER.size: return None
+        magic, ncols, capacity, total, meta_len = _HEADER.unpack_from(header)
+        if magic != MAGIC or capacity != self.capacity or ncols != len(self.columns): return None
+        try: meta = json.loads(header[_HEADER.size:_HEADER.size + meta_len])
+        except ValueError: return None
+        self.total = total
+        return meta
+
+    def _write_header(self):
+        meta = json.dumps({"columns": self.columns, "sources": self.sources}, separators=(",", ":")).encode()
+        if _HEADER.size + len(meta) > HEADER_SIZE:
+            # Keep the cursors of the newest sources; older ones are finished anyway
+            self.sources = dict(sorted(self.sources.items())[-16:])
+            meta = json.dumps({"columns": self.columns, "sources": self.sources}, separators=(",", ":")).encode()
+        self._mm[:_HEADER.size + len(meta)] = _HEADER.pack(MAGIC, len(self.columns), self.capacity, self.total, len(meta)) + meta
+
+    def close(self):
+        with self._lock:
+            self._mm.flush()
+            self._mm.close()
+
+    # --- writes ---
+
+    def _last_time(self):
+        if not self.total: return None
+        return self.record.unpack_from(self._mm, self._offset(self.total - 1))[0]
+
+    def _offset(self, seq):
+        return HEADER_SIZE + (seq % self.capacity) * self.record.size
+
+    def _append(self, epoch, values):
+        self.record.pack_into(self._mm, self._offset(self.total), epoch, *values)
+        self.total += 1
+
+    def append(self, sample):
+        """Stores one sample dict (ISO "timestamp", values flat or under "needs"); False if not newer."""
+        with self._lock:
+            added = self._add(sample, self._last_time())
+            if added: self._write_header()
+            return added
+
+    def _add(self, sample, last):
+        if not isinstance(sample, dict): return False
+        epoch = _epoch(sample.get("timestamp"))
+        if epoch is None or (last is not None and epoch <= last): return False
+        values = sample.get("needs") if isinstance(sample.get("needs"), dict) else sample
+        row = []
+        for col in self.columns:
+            try: row.append(float(values[col]))
+            except (KeyError, TypeError, ValueError): row.append(math.nan)
+        self._append(epoch, row)
+        return True
+
+    def _read_new(self, fp):
+        """(samples in the complete lines appended since the last import, new cursor) or None."""
+        try:
+            st = os.stat(fp)
+        except OSError:
+            return None
+        ino, offset = self.sources.get(os.path.basename(fp), (None, 0))
+        if ino != st.st_ino or st.st_size < offset: offset = 0  # Replaced or truncated: read it again
+        if st.st_size == offset: return None
+        try:
+            with open(fp, "rb") as f:
+                f.seek(offset)
+                chunk = f.read(st.st_size - offset)
+        except OSError:
+            return None
+        end = chunk.rfind(b"\n") + 1
+        samples = []
+        for line in chunk[:end].splitlines():
+            if not line.strip(): continue
+            try: samples.append(json.loads(line))
+            except ValueError: continue
+        return samples, [st.st_ino, offset + end]
+
+    def import_jsonl(self, *fps):
+        """
+        Imports the complete lines appended to each file since its last import,
+        merged by timestamp; returns the number of samples added.
+        """
+        with self._lock:
+            pending, cursors = [], {}
+            for fp in fps:
+                read = self._read_new(fp)
+                if read is None: continue
+                samples, cursors[os.path.basename(fp)] = read
+                pending += [(_epoch(s.get("timestamp")), s) for s in samples if isinstance(s, dict)]
+            if not cursors: return 0
+            # Stable: at equal timestamps the file listed first wins
+            pending.sort(key=lambda item: item[0] if item[0] is not None else -math.inf)
+            added, last = 0, self._last_time()
+            for epoch, sample in pending:
+                if self._add(sample, last):
+                    added += 1
+                    last = epoch
+            self.sources.update(cursors)
+            self._write_header()
+            self.imported += added
+            return added
+
+    # --- reads ---
+
+    def _rows(self, count):
+        """The last `count` stored rows, oldest first: one slice of the mapping (two after a wrap)."""
+        count = min(count, self.total, self.capacity)
+        if count <= 0: return []
+        first = self.total - count
+        start, stop = self._offset(first), self._offset(self.total - 1) + self.record.size
+        if start < stop:
+            return list(self.record.iter_unpack(self._mm[start:stop]))
+        # Wrapped around the end of the ring: two slices
+        return list(self.record.iter_unpack(self._mm[start:] + self._mm[HEADER_SIZE:stop]))
+
+    def _recent(self, n):
+        # The window is measured back from the newest sample, so a paused engine still has a chart
+        with self._lock:
+            rows = self._rows(n)
+        return [r for r in rows if r[0] >= rows[-1][0] - self.retention] if rows else []
+
+    def _sample(self, row):
+        needs = {col: round(v, 3) for col, v in zip(self.columns, row[1:]) if not math.isnan(v)}
+        return {"timestamp": _iso(row[0]), "needs": needs}
+
+    def last(self, n):
+        """The newest n samples within the retention window (oldest first), as {"timestamp", "needs"}."""
+        return [self._sample(r) for r in self._recent(n)]
+
+    def column(self, name, n):
+        """(timestamps, values) of one column over the newest n samples, for charts."""
+        i = self.columns.index(name) + 1
+        rows = self._recent(n)
+        return [r[0] for r in rows], [r[i] for r in rows]
+
+    def stats(self):
+        with self._lock:
+            return {"records": min(self.total, self.capacity), "capacity": self.capacity, "written": self.total,
+                    "record_bytes": self.record.size, "imported": self.imported, "sources": len(self.sources)}
+
+
+class VitalsTelemetry:
+    """
+    Vitals ring for one workspace, fed from memory/telemetry/: the engine's
+    daily vitality_<date>.jsonl files and the legacy vitals.jsonl (which the
+    engine no longer writes). All of them are merged by timestamp when the
+    ring is built, so overlapping samples interleave.
+    """
+
+    def __init__(self, telemetry_dir, capacity=CAPACITY, retention_days=RETENTION_DAYS):
+        self.telemetry_dir = os.path.abspath(telemetry_dir)
+        self.ring = TelemetryRing(os.path.join(self.telemetry_dir, "vitals.ring"), VITAL_COLUMNS, capacity, retention_days)
+        self._signatures = {}
+        self._listing = (None, [])  # directory mtime, source names
+
+    def _source_files(self):
+        """Source names and whether the directory changed since the last listing."""
+        try: mtime = os.stat(self.telemetry_dir).st_mtime_ns
+        except OSError: return [], False
+        if mtime == self._listing[0]: return self._listing[1], False
+        try: names = os.listdir(self.telemetry_dir)
+        except OSError: return [], False
+        daily = sorted(n for n in names if n.startswith("vitality_") and n.endswith(".jsonl"))
+        self._listing = (mtime, (["vitals.jsonl"] if "vitals.jsonl" in names else []) + daily)
+        return self._listing[1], True
+
+    def sync(self):
+        """
+        Imports whatever the sources gained since the last call, in one merged
+        import. Past days and the legacy vitals.jsonl are finished, so unless a
+        file was added or replaced (the directory changed) only the newest
+        daily file is checked. A legacy sample older than what the ring
+        already holds is not inserted afterwards.
+        """
+        names, relisted = self._source_files()
+        if not relisted:
+            names = [n for n in names if n != "vitals.jsonl"][-1:]
+        changed = []
+        for name in names:
+            fp = os.path.join(self.telemetry_dir, name)
+            try: st = os.stat(fp)
+            except OSError: continue
+            sig = (st.st_ino, st.st_mtime_ns, st.st_size)
+            if self._signatures.get(name) != sig: changed.append((name, fp, sig))
+        if not changed: return 0
+        added = self.ring.import_jsonl(*[fp for _, fp, _ in changed])
+        for name, _, sig in changed: self._signatures[name] = sig
+        return added
+
+    def last(self, n):
+        self.sync()
+        return self.ring.last(n)
+
+    def stats(self):
+        return self.ring.stats()
+
+
+_vitals = {}
+_vitals_lock = threading.Lock()
+
+def vitals_telemetry(telemetry_dir):
+    """The process-wide vitals ring of a telemetry directory."""
+    key = os.path.abspath(telemetry_dir)
+    with _vitals_lock:
+        if key not in _vitals: _vitals[key] = VitalsTelemetry(key)
+        return _vitals[key]
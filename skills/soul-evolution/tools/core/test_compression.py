@@ -0,0 +1,85 @@
+import sys
+import os
+import gzip
+import tempfile
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import core.compression as compression
+from core.compression import StaticAssetCache, choose_encoding
+from core.http_utils import send_body
+
+def fake_brotli():
+    # Brotli is optional; a stand-in shows which encoding was picked
+    br = MagicMock()
+    br.compress.side_effect = lambda body, quality: b"BR" + body[:8]
+    return br
+
+def make_handler(headers=None):
+    handler = MagicMock()
+    handler.command = "GET"
+    handler.headers = headers or {}
+    handler.sent = {}
+    handler.send_header.side_effect = lambda k, v: handler.sent.__setitem__(k, v)
+    return handler
+
+def test_choose_encoding():
+    print("[TEST] Compression: Accept-Encoding negotiation...")
+    with patch.object(compression, "brotli", None):
+        assert choose_encoding("gzip, deflate, br") == "gzip"
+        assert choose_encoding("br") is None
+        assert choose_encoding("gzip;q=0") is None
+        assert choose_encoding("*") == "gzip"
+        assert choose_encoding("") is None and choose_encoding(None) is None
+    with patch.object(compression, "brotli", fake_brotli()):
+        assert choose_encoding("gzip, deflate, br") == "br"
+        assert choose_encoding("br;q=0, gzip;q=0.5") == "gzip"
+        assert choose_encoding("identity") is None
+    print("  ✓ Negotiation test passed.")
+
+def test_send_body_compresses_large_text():
+    print("[TEST] Compression: encoded responses...")
+    body = b'{"items": [' + b'"entry", ' * 300 + b'"end"]}'
+    with patch.object(compression, "brotli", None):
+        handler = make_handler({"Accept-Encoding": "gzip"})
+        send_body(handler, body, "application/json", etag='"abc"')
+        assert handler.sent["Content-Encoding"] == "gzip" and handler.sent["Vary"] == "Accept-Encoding"
+        assert handler.sent["ETag"] == '"abc-gzip"'
+        assert gzip.decompress(handler.wfile.write.call_args[0][0]) == body
+
+        # Small bodies and binary types go out as they are
+        for content, ct in ((b"{}", "application/json"), (body, "image/png")):
+            handler = make_handler({"Accept-Encoding": "gzip"})
+            send_body(handler, content, ct, etag='"abc"')
+            assert "Content-Encoding" not in handler.sent and handler.sent["ETag"] == '"abc"'
+    with patch.object(compression, "brotli", fake_brotli()):
+        handler = make_handler({"Accept-Encoding": "gzip, br"})
+        send_body(handler, body, "text/html", etag='"abc"')
+        assert handler.sent["Content-Encoding"] == "br" and handler.wfile.write.call_args[0][0] == b"BR" + body[:8]
+    print("  ✓ Encoded response test passed.")
+
+def test_static_asset_cache():
+    print("[TEST] Compression: precompressed static assets...")
+    root = tempfile.mkdtemp()
+    css = os.path.join(root, "main.css")
+    with open(css, "w") as f: f.write("body { color: red; }\n" * 100)
+    with patch.object(compression, "brotli", None):
+        cache = StaticAssetCache([root])
+        assert cache.warm() == 1
+        st = os.stat(css)
+        assert gzip.decompress(cache.get(css, st, "gzip")).startswith(b"body")
+        assert cache.get(css, st, None) is None and cache.get(css, st, "br") is None
+
+        # A changed file is compressed again on the next request
+        with open(css, "w") as f: f.write("p { margin: 0; }\n" * 100)
+        assert gzip.decompress(cache.get(css, os.stat(css), "gzip")).startswith(b"p {")
+
+        outside = os.path.join(tempfile.mkdtemp(), "main.css")
+        with open(outside, "w") as f: f.write("x" * 2000)
+        assert cache.get(outside, os.stat(outside), "gzip") is None
+    print("  ✓ Static asset test passed.")
+
+if __name__ == "__main__":
+    test_choose_encoding()
+    test_send_body_compresses_large_text()
+    test_static_asset_cache()
@@ -0,0 +1,33 @@
+import sys
+import os
+import json
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.event_stream import EventStream
+
+def test_stream_resume_and_reset():
+    print("[TEST] EventStream: resume by id...")
+    with tempfile.TemporaryDirectory() as memory_dir:
+        os.makedirs(os.path.join(memory_dir, "reality"))
+        doc = os.path.join(memory_dir, "reality", "presence_state.json")
+        with open(doc, "w") as f: json.dump({"isActive": True}, f)
+
+        stream = EventStream(memory_dir, backlog=2)
+        stream.on_changes({doc})
+        events, reset = stream.since(0, timeout=0)
+        assert not reset and events[0][1] == "document"
+        assert events[0][2]["doc"] == "reality/presence_state.json"
+        assert events[0][2]["data"] == {"isActive": True}
+
+        # Resuming from the newest id only waits, it never replays
+        assert stream.since(events[-1][0], timeout=0) == ([], False)
+
+        # A client that fell behind the backlog is told to refetch
+        for _ in range(3): stream.publish("file", {"doc": "x"})
+        _, reset = stream.since(1, timeout=0)
+        assert reset
+        print("  ✓ EventStream test passed.")
+
+if __name__ == "__main__":
+    test_stream_resume_and_reset()
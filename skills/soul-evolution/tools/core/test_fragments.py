@@ -0,0 +1,68 @@
+import sys
+import os
+import json
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import api.data_utils as data_utils
+from api.data_utils import FragmentCache, bootstrap_fragment, collect_bootstrap, section_fragment, use_store
+from core.hot_documents import HotDocuments
+from core.workspace_store import WorkspaceStore
+
+def make_workspace():
+    workspace = tempfile.mkdtemp()
+    os.makedirs(os.path.join(workspace, "memory", "reality"))
+    with open(os.path.join(workspace, "SOUL.md"), "w") as f: f.write("# SOUL.md\n\n## Core\n- Honest [CORE]\n")
+    with open(os.path.join(workspace, "memory", "reflections.jsonl"), "w") as f: f.write('{"id": "REF-20260301-001"}\n')
+    return workspace
+
+def test_encodes_only_on_version_change():
+    print("[TEST] FragmentCache: re-encoding on version change...")
+    cache, builds = FragmentCache(), []
+    def build():
+        builds.append(1)
+        return {"n": len(builds)}
+    assert cache.get("physique", "v1", build) == ("v1", b'{"n": 1}')
+    assert cache.get("physique", "v1", build) == ("v1", b'{"n": 1}')
+    assert cache.get("physique", "v2", build) == ("v2", b'{"n": 2}')
+    assert cache.get("skills", "v2", build)[1] == b'{"n": 3}'
+    assert cache.stats() == {"fragments": 2, "bytes": 16, "hits": 1, "encodes": 3}
+    print("  ✓ Version test passed.")
+
+def test_sections_and_bootstrap_from_fragments():
+    print("[TEST] FragmentCache: section and bootstrap bytes...")
+    workspace = make_workspace()
+    version, body = section_fragment(workspace, "reflections")
+    assert json.loads(body) == [{"id": "REF-20260301-001"}]
+    assert section_fragment(workspace, "reflections")[1] is body  # Unchanged: the same cached bytes
+
+    with open(os.path.join(workspace, "memory", "reflections.jsonl"), "a") as f: f.write('{"id": "REF-20260301-002"}\n')
+    new_version, new_body = section_fragment(workspace, "reflections")
+    assert new_version != version and len(json.loads(new_body)) == 2
+
+    # The concatenated page payload is the same document collect_bootstrap() builds
+    assert json.loads(bootstrap_fragment(workspace)) == json.loads(json.dumps(collect_bootstrap(workspace)))
+    print("  ✓ Fragment assembly test passed.")
+
+def test_hot_sections_follow_memory():
+    print("[TEST] FragmentCache: hot documents before their flush...")
+    workspace = make_workspace()
+    with open(os.path.join(workspace, "memory", "reality", "physique.json"), "w") as f: json.dump({"needs": {"energy": 40}}, f)
+    hot = HotDocuments(os.path.join(workspace, "memory", "reality"), names=["physique.json"], flush_delay=60)
+    previous = data_utils._store
+    use_store(WorkspaceStore(workspace, hot))
+    try:
+        version, _ = section_fragment(workspace, "physique")
+        hot.get("physique.json").merge({"needs": {"energy": 90}})
+        new_version, body = section_fragment(workspace, "physique")
+        # Served from memory while the file on disk still holds the old state
+        assert new_version != version and json.loads(body) == {"needs": {"energy": 90}}
+        assert json.loads(bootstrap_fragment(workspace))["physique"] == {"needs": {"energy": 90}}
+    finally:
+        use_store(previous)
+    print("  ✓ Hot section test passed.")
+
+if __name__ == "__main__":
+    test_encodes_only_on_version_change()
+    test_sections_and_bootstrap_from_fragments()
+    test_hot_sections_follow_memory()
@@ -0,0 +1,69 @@
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.hot_documents import HotDocument, HotDocuments
+
+def test_write_behind_and_shutdown_flush():
+    print("[TEST] HotDocument: write-behind...")
+    path = os.path.join(tempfile.mkdtemp(), "physique.json")
+    with open(path, "w") as f: json.dump({"needs": {"energy": 50}}, f)
+    doc = HotDocument(path, flush_delay=0.2)
+    seen = []
+    doc.subscribe(seen.append)
+    for i in range(100): doc.merge({"tick": i})
+    doc.update(lambda ph: ph["needs"].update(energy=10))
+    assert doc.read()["tick"] == 99 and doc.read()["needs"]["energy"] == 10
+    with open(path) as f: assert "tick" not in json.load(f)
+    time.sleep(0.4)
+    with open(path) as f: assert json.load(f) == {"needs": {"energy": 10}, "tick": 99}
+    assert doc.flushes == 1 and not doc.dirty and len(seen) == 101 and seen[-1] is None
+
+    doc.merge({"tick": 100})
+    doc.flush()
+    with open(path) as f: assert json.load(f)["tick"] == 100
+    print("  ✓ Write-behind test passed.")
+
+def test_outside_edits_are_adopted_when_clean():
+    print("[TEST] HotDocuments: outside edits...")
+    reality = tempfile.mkdtemp()
+    docs = HotDocuments(reality, names=["avatar_state.json"], flush_delay=60)
+    doc = docs.get("avatar_state.json")
+    assert doc.read() == {}
+    with open(doc.path, "w") as f: json.dump({"pose": "sitting"}, f)
+    assert doc.read() == {"pose": "sitting"}
+
+    # A pending change of ours wins until it is flushed
+    doc.merge({"pose": "idle"})
+    with open(doc.path, "w") as f: json.dump({"pose": "lying", "x": 1}, f)
+    docs.on_changes({doc.path})
+    assert doc.read() == {"pose": "idle"}
+    docs.flush_all()
+    with open(doc.path) as f: assert json.load(f) == {"pose": "idle"}
+    assert doc.conflicts == 1
+    print("  ✓ Outside edit test passed.")
+
+def test_concurrent_flushes_keep_the_newest():
+    print("[TEST] HotDocument: concurrent flushes...")
+    path = os.path.join(tempfile.mkdtemp(), "presence_state.json")
+    doc = HotDocument(path, flush_delay=60)
+    def writer(n):
+        for i in range(50):
+            doc.merge({"tick": n * 100 + i})
+            doc.flush()
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    doc.flush()
+    with open(path) as f: assert json.load(f) == doc.read()
+    assert not doc.dirty and doc.conflicts == 0 and not os.path.exists(path + ".tmp")
+    print("  ✓ Concurrent flush test passed.")
+
+if __name__ == "__main__":
+    test_write_behind_and_shutdown_flush()
+    test_outside_edits_are_adopted_when_clean()
+    test_concurrent_flushes_keep_the_newest()
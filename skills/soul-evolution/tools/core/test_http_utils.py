@@ -0,0 +1,64 @@
+import sys
+import os
+import time
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.http_utils import content_etag, http_date, is_not_modified, send_body, send_json
+
+def make_handler(headers=None, command="GET"):
+    handler = MagicMock()
+    handler.command = command
+    handler.headers = headers or {}
+    handler.sent = {}
+    handler.send_header.side_effect = lambda k, v: handler.sent.__setitem__(k, v)
+    return handler
+
+def test_conditional_requests():
+    print("[TEST] HTTP utils: If-None-Match / If-Modified-Since...")
+    etag, mtime = content_etag(b"{}"), int(time.time()) - 60
+    assert is_not_modified(make_handler({"If-None-Match": etag}), etag)
+    assert is_not_modified(make_handler({"If-None-Match": f'"other", W/{etag}'}), etag)
+    assert is_not_modified(make_handler({"If-None-Match": "*"}), etag)
+    assert not is_not_modified(make_handler({"If-None-Match": '"other"'}), etag)
+    assert not is_not_modified(make_handler({"If-None-Match": etag}, command="POST"), etag)
+    # A cached gzip copy of the same entity is still fresh
+    assert is_not_modified(make_handler({"If-None-Match": etag[:-1] + '-gzip"'}), etag)
+
+    assert is_not_modified(make_handler({"If-Modified-Since": http_date(mtime)}), None, mtime)
+    assert not is_not_modified(make_handler({"If-Modified-Since": http_date(mtime - 10)}), None, mtime)
+    assert not is_not_modified(make_handler({"If-Modified-Since": "garbage"}), None, mtime)
+    # If-None-Match wins over a matching date
+    assert not is_not_modified(make_handler({"If-None-Match": '"other"', "If-Modified-Since": http_date(mtime)}), etag, mtime)
+    print("  ✓ Conditional request test passed.")
+
+def test_send_body_304_and_head():
+    print("[TEST] HTTP utils: 304 and HEAD responses...")
+    handler = make_handler()
+    send_json(handler, {"pose": "idle"})
+    handler.send_response.assert_called_once_with(200)
+    etag = handler.sent["ETag"]
+    assert etag == content_etag(b'{"pose": "idle"}') and handler.sent["Content-Length"] == "16"
+
+    handler = make_handler({"If-None-Match": etag})
+    send_json(handler, {"pose": "idle"})
+    handler.send_response.assert_called_once_with(304)
+    handler.wfile.write.assert_not_called()
+    assert handler.sent["ETag"] == etag and "Content-Length" not in handler.sent
+
+    # HEAD: the GET headers, no body
+    handler = make_handler(command="HEAD")
+    send_body(handler, b"x" * 10, "text/plain", etag=etag)
+    handler.send_response.assert_called_once_with(200)
+    assert handler.sent["Content-Length"] == "10"
+    handler.wfile.write.assert_not_called()
+
+    # Only successful responses are answered with 304
+    handler = make_handler({"If-None-Match": etag})
+    send_body(handler, b"{}", "application/json", status=404, etag=etag)
+    handler.send_response.assert_called_once_with(404)
+    print("  ✓ 304/HEAD test passed.")
+
+if __name__ == "__main__":
+    test_conditional_requests()
+    test_send_body_304_and_head()
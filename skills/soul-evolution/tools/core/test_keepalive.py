@@ -0,0 +1,62 @@
+import sys
+import os
+import http.client
+import http.server
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.http_utils import discard_body, send_empty, send_json, send_text
+from core.server import PooledHTTPServer
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = 5
+
+    def log_message(self, *args): pass
+
+    def do_GET(self):
+        if self.path == "/missing":
+            send_empty(self, 404)
+        else:
+            send_json(self, {"path": self.path})
+
+    def do_POST(self):
+        # Rejected without reading the body: it must be drained for the next request
+        discard_body(self)
+        send_empty(self, 405, {"Allow": "GET"})
+
+    def do_PUT(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        send_text(self, "OK")
+
+def test_requests_share_one_connection():
+    print("[TEST] Keep-alive: several requests on one connection...")
+    httpd = PooledHTTPServer(("127.0.0.1", 0), Handler, connection_workers=2)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=5)
+        conn.request("GET", "/a")
+        first = conn.getresponse()
+        assert first.status == 200 and first.getheader("Content-Length")
+        sock = conn.sock
+        assert b'"path": "/a"' in first.read()
+
+        conn.request("POST", "/a", body=b"x" * 5000)
+        rejected = conn.getresponse()
+        assert rejected.status == 405 and rejected.read() == b""
+        conn.request("GET", "/missing")
+        missing = conn.getresponse()
+        assert missing.status == 404 and missing.read() == b""
+        conn.request("PUT", "/a", body=b"{}")
+        assert conn.getresponse().read() == b"OK"
+        conn.request("GET", "/b")
+        assert b'"path": "/b"' in conn.getresponse().read()
+        assert conn.sock is sock  # Never reconnected
+        conn.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    print("  ✓ Keep-alive test passed.")
+
+if __name__ == "__main__":
+    test_requests_share_one_connection()
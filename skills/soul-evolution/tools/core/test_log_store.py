@@ -0,0 +1,78 @@
+import sys
+import os
+import json
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.log_store import LogStore
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+def append_logs(memory_dir, hour, levels):
+    with open(os.path.join(memory_dir, "genesis_debug.jsonl"), "a") as f:
+        for i, level in enumerate(levels):
+            f.write(json.dumps({"timestamp": f"2026-03-01T{hour:02d}:{i:02d}:00.000Z", "level": level,
+                                "module": "engine", "message": f"{hour}/{i}"}) + "\n")
+
+def test_rotation_and_level_index():
+    print("[TEST] LogStore: rotation and level index...")
+    memory_dir = tempfile.mkdtemp()
+    logs = LogStore(memory_dir, segment_bytes=1 << 20, segment_seconds=4 * 3600, grace=0)
+    append_logs(memory_dir, 1, ["INFO", "ERROR", "INFO"])
+    assert logs.maintain(NOW)  # Eleven hours of history: rotated and closed
+    assert not os.path.exists(os.path.join(memory_dir, "genesis_debug.jsonl"))
+    append_logs(memory_dir, 11, ["INFO", "WARN"])
+    assert not logs.maintain(NOW)  # The new active log is recent
+
+    (name, seg), = logs.segments.items()
+    assert name.endswith(".jsonl.gz") and seg["levels"] == {"INFO": 2, "ERROR": 1} and seg["count"] == 3
+    assert [r["message"] for r in logs.query(10)] == ["1/0", "1/1", "1/2", "11/0", "11/1"]
+    assert [r["message"] for r in logs.query(2)] == ["11/0", "11/1"]
+    assert logs.opened == 1  # The active log alone satisfied the second query
+
+    # Segments without the level, or outside the window, are never opened
+    assert [r["message"] for r in logs.query(10, "WARN")] == ["11/1"]
+    assert [r["message"] for r in logs.query(10, since="2026-03-01T10:00")] == ["11/0", "11/1"]
+    assert logs.opened == 1 and logs.skipped == 2
+    assert [r["message"] for r in logs.query(10, "ERROR")] == ["1/1"]
+
+    # The index survives a restart
+    assert LogStore(memory_dir).segments == logs.segments
+    print("  ✓ Rotation test passed.")
+
+def make_archive(memory_dir, hour, level, stamp):
+    append_logs(memory_dir, hour, [level])
+    os.rename(os.path.join(memory_dir, "genesis_debug.jsonl"), os.path.join(memory_dir, f"genesis_debug_{stamp}.jsonl"))
+
+def test_archives_and_retention_are_opt_in():
+    print("[TEST] LogStore: TS archives and retention are opt-in...")
+    memory_dir = tempfile.mkdtemp()
+    make_archive(memory_dir, 2, "DEBUG", "2026-03-01T03-00-00-000Z")
+    logs = LogStore(memory_dir, grace=0)
+    logs.maintain(datetime(2027, 1, 1, tzinfo=timezone.utc))
+    # By default the logger's archive is read where it is, and nothing ever ages out
+    assert logs.segments == {} and os.path.exists(os.path.join(memory_dir, "genesis_debug_2026-03-01T03-00-00-000Z.jsonl"))
+    append_logs(memory_dir, 4, ["INFO"])
+    assert [r["message"] for r in logs.query(5)] == ["2/0", "4/0"]
+    print("  ✓ Default test passed.")
+
+def test_adopts_ts_archives_and_retention():
+    print("[TEST] LogStore: adopted archives and retention...")
+    memory_dir = tempfile.mkdtemp()
+    make_archive(memory_dir, 2, "DEBUG", "2026-03-01T03-00-00-000Z")
+    with open(os.path.join(memory_dir, "genesis_debug_2026-03-01T04-00-00-000Z.jsonl"), "w") as f: f.write('{"message": "no time"}\n')
+    logs = LogStore(memory_dir, grace=0, keep_days=1, adopt_archives=True)
+    logs.maintain(NOW)
+    assert sorted(logs.segments) == ["genesis_debug_2026-03-01T03-00-00-000Z.jsonl.gz", "genesis_debug_2026-03-01T04-00-00-000Z.jsonl.gz"]
+    assert logs.query(5, "DEBUG")[0]["message"] == "2/0"
+    # Only segments known to be old go; one without timestamps is kept
+    logs.maintain(datetime(2026, 3, 5, tzinfo=timezone.utc))
+    assert list(logs.segments) == ["genesis_debug_2026-03-01T04-00-00-000Z.jsonl.gz"]
+    assert sorted(os.listdir(os.path.join(memory_dir, "logs"))) == ["genesis_debug_2026-03-01T04-00-00-000Z.jsonl.gz", "index.json"]
+    print("  ✓ Archive test passed.")
+
+if __name__ == "__main__":
+    test_rotation_and_level_index()
+    test_archives_and_retention_are_opt_in()
+    test_adopts_ts_archives_and_retention()
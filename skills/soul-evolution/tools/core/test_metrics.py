@@ -0,0 +1,33 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.metrics import Histogram, RequestMetrics
+
+def test_histogram_percentiles():
+    print("[TEST] Metrics: histogram percentiles...")
+    h = Histogram()
+    for ms in range(1, 101): h.observe(float(ms))
+    # Bucket bounds are within ~19% of the true value
+    assert 50 <= h.percentile(0.50) <= 50 * 1.19
+    assert 95 <= h.percentile(0.95) <= 95 * 1.19
+    assert h.summary()["max_ms"] == 100.0
+    assert Histogram().percentile(0.5) is None
+    print("  ✓ Percentile test passed.")
+
+def test_route_and_plugin_series():
+    print("[TEST] Metrics: per-route and per-plugin series...")
+    m = RequestMetrics()
+    m.record("GET /api/plugins/vault/", 12.0, 200, 100, plugin="vault")
+    m.record("GET /api/plugins/vault/", 30.0, 500, 50, plugin="vault")
+    m.record("GET /api/dreams", 1.0, 200, 26)
+    snap = m.snapshot()
+    vault = snap["routes"]["GET /api/plugins/vault/"]
+    assert vault["requests"] == 2 and vault["errors"] == 1 and vault["bytes"] == 150
+    assert snap["plugins"]["vault"]["requests"] == 2
+    assert list(snap["routes"])[0] == "GET /api/plugins/vault/"
+    print("  ✓ Series test passed.")
+
+if __name__ == "__main__":
+    test_histogram_percentiles()
+    test_route_and_plugin_series()
@@ -0,0 +1,105 @@
+import sys
+import os
+import json
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.plugin_manager import PluginManager
+from core.router import Router
+from core.workspace_store import WorkspaceStore
+
+BACKEND = '''
+def handle_request(handler, method, action, workspace):
+    return "{version}"
+'''
+
+def write_plugin(plugins_dir, plugin_id, version, routes=None):
+    d = os.path.join(plugins_dir, plugin_id)
+    os.makedirs(d, exist_ok=True)
+    with open(os.path.join(d, "manifest.json"), "w") as f:
+        json.dump({"name": plugin_id, "version": version, "routes": routes or {}}, f)
+    with open(os.path.join(d, "backend.py"), "w") as f:
+        f.write(BACKEND.format(version=version))
+
+def test_lazy_backend_import():
+    print("[TEST] PluginManager: lazy backend import...")
+    plugins_dir = tempfile.mkdtemp()
+    write_plugin(plugins_dir, "demo", "1.0.0")
+    manager = PluginManager("/tmp", plugins_dir)
+    assert manager.stats()["demo"]["loaded"] is False and "plugin_demo" not in sys.modules
+    assert manager.backend("demo").handle_request(None, "GET", "x", "/tmp") == "1.0.0"
+    assert manager.stats()["demo"]["loaded"] is True and manager.stats()["demo"]["load_ms"] is not None
+    assert manager.backend("demo") is sys.modules["plugin_demo"]
+    print("  ✓ Lazy import test passed.")
+
+def test_backends_share_the_managers_store():
+    print("[TEST] PluginManager: shared workspace store...")
+    plugins_dir, workspace = tempfile.mkdtemp(), tempfile.mkdtemp()
+    write_plugin(plugins_dir, "docs", "1.0.0")
+    with open(os.path.join(plugins_dir, "docs", "backend.py"), "w") as f:
+        f.write("from core.workspace_store import workspace_store\n"
+                "def handle_request(handler, method, action, workspace):\n    return workspace_store(workspace)\n")
+    store = WorkspaceStore(workspace)
+    manager = PluginManager(workspace, plugins_dir, store)
+    assert manager.backend("docs").handle_request(None, "GET", "x", workspace) is store
+    print("  ✓ Shared store test passed.")
+
+def test_import_error_is_cached():
+    print("[TEST] PluginManager: failed import cached...")
+    plugins_dir = tempfile.mkdtemp()
+    write_plugin(plugins_dir, "broken", "1.0.0")
+    attempts = os.path.join(plugins_dir, "attempts")
+    with open(os.path.join(plugins_dir, "broken", "backend.py"), "w") as f:
+        f.write(f"open({attempts!r}, 'a').write('x')\nraise RuntimeError('no bridge')\n")
+    manager = PluginManager("/tmp", plugins_dir)
+    assert manager.backend("broken") is None and manager.backend("broken") is None
+    with open(attempts) as f: assert f.read() == "x"  # Imported once, not on every request
+    assert manager.stats()["broken"]["error"] == "no bridge" and "plugin_broken" not in sys.modules
+    assert manager.backend("missing") is None
+    print("  ✓ Import error test passed.")
+
+def test_hot_reload_swaps_and_keeps_old_on_failure():
+    print("[TEST] PluginManager: hot reload...")
+    plugins_dir = tempfile.mkdtemp()
+    write_plugin(plugins_dir, "demo", "1.0.0")
+    manager = PluginManager("/tmp", plugins_dir)
+    router = Router()
+    manager.register_routes(router)
+    manager.backend("demo")
+
+    write_plugin(plugins_dir, "demo", "1.1.0", routes={"status": {"concurrency": "subprocess"}})
+    result = manager.on_changes({os.path.join(plugins_dir, "demo", "backend.py")})
+    assert result == {"demo": "reloaded"}
+    assert manager.backend("demo").handle_request(None, "GET", "x", "/tmp") == "1.1.0"
+    route, _, _ = router.resolve("GET", "/api/plugins/demo/status")
+    assert route.meta["concurrency"] == "subprocess"
+
+    with open(os.path.join(plugins_dir, "demo", "backend.py"), "w") as f: f.write("def broken(:\n")
+    assert manager.reload("demo") == "failed"
+    assert manager.backend("demo").handle_request(None, "GET", "x", "/tmp") == "1.1.0"
+    counters = manager.stats()["demo"]["reload"]
+    assert counters["reloads"] == 1 and counters["failures"] == 1 and "SyntaxError" in counters["last_error"]
+    print("  ✓ Hot reload test passed.")
+
+def test_plugin_added_and_removed():
+    print("[TEST] PluginManager: plugin added and removed at runtime...")
+    plugins_dir = tempfile.mkdtemp()
+    manager = PluginManager("/tmp", plugins_dir)
+    router = Router()
+    manager.register_routes(router)
+    write_plugin(plugins_dir, "late", "0.1.0")
+    assert manager.on_changes({os.path.join(plugins_dir, "late", "manifest.json")}) == {"late": "added"}
+    assert router.resolve("GET", "/api/plugins/late/anything")[0].owner == "late"
+
+    for name in os.listdir(os.path.join(plugins_dir, "late")):
+        os.remove(os.path.join(plugins_dir, "late", name))
+    assert manager.reload("late") == "removed"
+    assert router.resolve("GET", "/api/plugins/late/anything")[0] is None
+    print("  ✓ Add/remove test passed.")
+
+if __name__ == "__main__":
+    test_lazy_backend_import()
+    test_backends_share_the_managers_store()
+    test_import_error_is_cached()
+    test_hot_reload_swaps_and_keeps_old_on_failure()
+    test_plugin_added_and_removed()
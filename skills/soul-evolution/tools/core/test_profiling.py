@@ -0,0 +1,45 @@
+import sys
+import os
+import pstats
+import tempfile
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.profiling import RequestProfiler
+
+def make_handler(path, header=None):
+    handler = MagicMock()
+    handler.path = path
+    handler.headers = {"X-Genesis-Profile": header} if header else {}
+    return handler
+
+def test_profiling_is_opt_in():
+    print("[TEST] Profiling: guarded opt-in...")
+    off = RequestProfiler(tempfile.mkdtemp(), enabled=False)
+    assert not off.wanted(make_handler("/api/dreams?__profile=1"))
+    on = RequestProfiler(tempfile.mkdtemp(), enabled=True)
+    assert on.wanted(make_handler("/api/dreams?__profile=1"))
+    assert on.wanted(make_handler("/api/dreams", header="1"))
+    assert not on.wanted(make_handler("/api/dreams?x=__profile=1"))
+    print("  ✓ Opt-in test passed.")
+
+def test_profile_written_and_listed():
+    print("[TEST] Profiling: dump and listing...")
+    d = tempfile.mkdtemp()
+    profiler = RequestProfiler(d, enabled=True, keep=2)
+    calls = []
+    names = [profiler.run("GET", "/api/plugins/vault/", lambda: calls.append(sum(range(1000)))) for _ in range(3)]
+    assert len(calls) == 3 and all(names)
+    listed = profiler.list()
+    assert len(listed) == 2
+    assert listed[0]["method"] == "GET" and listed[0]["route"] == "api-plugins-vault"
+    pstats.Stats(os.path.join(d, listed[0]["file"]))
+    # Downloads are limited to listed dumps
+    assert profiler.dump_path(listed[0]["file"]) == os.path.join(d, listed[0]["file"])
+    open(os.path.join(d, "character.json"), "w").close()
+    assert profiler.dump_path("character.json") is None and profiler.dump_path("../x.prof") is None
+    print("  ✓ Dump test passed.")
+
+if __name__ == "__main__":
+    test_profiling_is_opt_in()
+    test_profile_written_and_listed()
@@ -0,0 +1,107 @@
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.record_index import RecordIndex
+
+def exp(i, significance="routine", reflected=False):
+    return {"id": f"EXP-20260210-{i:04d}", "content": "x" * i, "significance": significance, "reflected": reflected}
+
+def write_log(fp, records, mode="a"):
+    with open(fp, mode) as f:
+        for r in records: f.write(json.dumps(r) + "\n")
+
+def make_memory():
+    memory_dir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(memory_dir, "experiences"))
+    write_log(os.path.join(memory_dir, "experiences", "2026-02-10.jsonl"), [exp(1), exp(2, "notable"), exp(3, "pivotal", True)])
+    write_log(os.path.join(memory_dir, "reflections.jsonl"), [{"id": "REF-20260210-001", "experience_ids": ["EXP-20260210-0002"]}])
+    return memory_dir
+
+def test_fetch_and_filtered_views():
+    print("[TEST] RecordIndex: fetch and filtered views...")
+    index = RecordIndex(make_memory())
+    assert index.get("EXP-20260210-0002") == exp(2, "notable")
+    assert index.get("REF-20260210-001")["experience_ids"] == ["EXP-20260210-0002"]
+    assert index.get("EXP-missing") is None
+    assert index.ids("notable") == ["EXP-20260210-0002"]
+    assert index.ids(reflected=False, prefix="experiences" + os.sep) == ["EXP-20260210-0001", "EXP-20260210-0002"]
+    assert [r["id"] for r in index.select(prefix="experiences" + os.sep, limit=1)] == ["EXP-20260210-0003"]
+    print("  ✓ Fetch test passed.")
+
+def test_follows_appends_and_rewrites():
+    print("[TEST] RecordIndex: appends and rewrites...")
+    memory_dir = make_memory()
+    fp = os.path.join(memory_dir, "experiences", "2026-02-10.jsonl")
+    index = RecordIndex(memory_dir)
+    assert len(index.ids()) == 4
+
+    # Appended records (and a half-written one) only cost a scan of the new bytes
+    write_log(fp, [exp(4, "notable")])
+    with open(fp, "a") as f: f.write('{"id": "EXP-2026')
+    assert index.get("EXP-20260210-0004") == exp(4, "notable")
+    assert index.rescans == 0
+    with open(fp, "a") as f: f.write('0210-0005"}\n')
+    assert index.get("EXP-20260210-0005") == {"id": "EXP-20260210-0005"}
+
+    # Marking experiences reflected rewrites the file: it is re-scanned on its own
+    write_log(fp, [exp(1, reflected=True), exp(2, "notable", True), exp(3, "pivotal", True)], mode="w")
+    assert index.ids(reflected=False) == []
+    assert index.get("EXP-20260210-0004") is None
+    assert index.get("EXP-20260210-0002") == exp(2, "notable", True)
+    assert index.rescans == 1
+
+    # A fresh process picks up the sidecar instead of parsing the logs again
+    reopened = RecordIndex(memory_dir)
+    assert reopened.ids() == index.ids()
+    assert reopened.refresh() is False
+    assert reopened.get("EXP-20260210-0003") == exp(3, "pivotal", True)
+    print("  ✓ Append test passed.")
+
+def test_one_refresh_per_call():
+    print("[TEST] RecordIndex: one refresh per get/select...")
+    memory_dir = make_memory()
+    for day in range(11, 20):
+        write_log(os.path.join(memory_dir, "experiences", f"2026-02-{day}.jsonl"), [exp(day * 10 + i) for i in range(5)])
+    index = RecordIndex(memory_dir)
+    index.refresh()
+    with patch("os.stat", wraps=os.stat) as stat:
+        index.refresh()
+        per_refresh = stat.call_count
+        stat.reset_mock()
+        assert len(index.select(limit=30)) == 30
+        assert stat.call_count == per_refresh
+        stat.reset_mock()
+        assert index.get("EXP-20260210-0002") == exp(2, "notable")
+        assert stat.call_count == per_refresh
+    print("  ✓ Refresh test passed.")
+
+def test_read_only_counts_every_line():
+    print("[TEST] RecordIndex: read-only counts for the validators...")
+    memory_dir = make_memory()
+    fp = os.path.join(memory_dir, "experiences", "2026-02-10.jsonl")
+    write_log(fp, [exp(2, "notable"), {"significance": "pivotal", "reflected": False}])
+    with open(fp, "a") as f: f.write(json.dumps(exp(4, "pivotal")))  # The agent's last line, without its newline
+    index = RecordIndex(memory_dir, read_only=True)
+    # Duplicated ids and records without one count like the validators' own scans
+    assert index.count("notable", False, "experiences" + os.sep) == 2
+    assert index.count("pivotal", False) == 2 and index.count("pivotal") == 3
+    assert "EXP-20260210-0004" in index.ids(prefix="experiences" + os.sep)
+    assert not os.path.exists(index.index_path)
+
+    # The dashboard's sidecar is followed, never written
+    RecordIndex(memory_dir).refresh()
+    sidecar = os.path.getsize(index.index_path)
+    with open(fp, "a") as f: f.write("\n" + json.dumps(exp(5, "notable")) + "\n")
+    assert RecordIndex(memory_dir, read_only=True).count("notable", False) == 3
+    assert os.path.getsize(index.index_path) == sidecar
+    print("  ✓ Read-only test passed.")
+
+if __name__ == "__main__":
+    test_fetch_and_filtered_views()
+    test_follows_appends_and_rewrites()
+    test_one_refresh_per_call()
+    test_read_only_counts_every_line()
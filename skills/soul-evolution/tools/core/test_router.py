@@ -0,0 +1,55 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.router import Router
+
+def build():
+    router = Router()
+    router.add("/api/dreams", "dreams")
+    router.add("/api/", "api_fallback", methods=("GET", "POST"), prefix=True)
+    router.add("/api/plugins/vault/", "vault", methods=("GET", "POST"), prefix=True, owner="vault")
+    router.add("/api/plugins/vault/status", "vault_status", owner="vault", concurrency="subprocess")
+    router.add("/save-soul", "save_soul", methods=("POST",))
+    return router
+
+def test_exact_and_prefix_resolution():
+    print("[TEST] Router: exact and prefix lookup...")
+    router = build()
+    route, rest, _ = router.resolve("GET", "/api/dreams")
+    assert route.handler == "dreams" and rest == ""
+    route, rest, _ = router.resolve("HEAD", "/api/plugins/vault/status")
+    assert route.handler == "vault_status" and route.meta["concurrency"] == "subprocess"
+    route, rest, _ = router.resolve("POST", "/api/plugins/vault/trade/now")
+    assert route.handler == "vault" and rest == "trade/now"
+    route, rest, _ = router.resolve("GET", "/api/unknown/thing")
+    assert route.handler == "api_fallback" and rest == "unknown/thing"
+    print("  ✓ Lookup test passed.")
+
+def test_method_mismatch_and_missing():
+    print("[TEST] Router: 405/404 resolution...")
+    router = build()
+    route, _, allowed = router.resolve("GET", "/save-soul")
+    assert route is None and allowed == ["POST"]
+    route, _, allowed = router.resolve("GET", "/nowhere")
+    assert route is None and allowed is None
+    try:
+        router.add("/api/dreams", "again")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    print("  ✓ Mismatch test passed.")
+
+def test_remove_owner():
+    print("[TEST] Router: removing a plugin's routes...")
+    router = build()
+    assert router.remove_owner("vault") == 2
+    route, _, _ = router.resolve("GET", "/api/plugins/vault/status")
+    assert route.handler == "api_fallback"
+    assert all(r["owner"] == "core" for r in router.describe())
+    print("  ✓ Removal test passed.")
+
+if __name__ == "__main__":
+    test_exact_and_prefix_resolution()
+    test_method_mismatch_and_missing()
+    test_remove_owner()
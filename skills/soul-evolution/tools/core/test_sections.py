@@ -0,0 +1,61 @@
+import sys
+import os
+import json
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api.data_utils import BOOTSTRAP_SECTIONS, SECTIONS, collect_bootstrap, collect_data, load_section, section_version
+
+def make_workspace():
+    workspace = tempfile.mkdtemp()
+    memory = os.path.join(workspace, "memory")
+    for d in ("experiences", "reality/photos", "proposals", "significant"):
+        os.makedirs(os.path.join(memory, d))
+    with open(os.path.join(workspace, "SOUL.md"), "w") as f:
+        f.write("# SOUL.md\n\n## Personality\n\n### Style\n- Direct and concise [MUTABLE]\n")
+    with open(os.path.join(memory, "reality", "physique.json"), "w") as f: json.dump({"needs": {"energy": 40}}, f)
+    for day in range(1, 10):
+        with open(os.path.join(memory, "experiences", f"2026-03-{day:02d}.jsonl"), "w") as f:
+            f.write(json.dumps({"id": f"EXP-202603{day:02d}-0001", "significance": "routine"}) + "\n")
+    with open(os.path.join(memory, "reflections.jsonl"), "w") as f:
+        for i in range(3): f.write(json.dumps({"id": f"REF-20260309-00{i + 1}"}) + "\n\n")
+    for i in range(2): open(os.path.join(memory, "reality", "photos", f"photo_{i}.png"), "wb").close()
+    return workspace
+
+def test_bootstrap_is_minimal():
+    print("[TEST] Sections: bootstrap payload...")
+    workspace = make_workspace()
+    boot = collect_bootstrap(workspace)
+    assert set(boot) == set(BOOTSTRAP_SECTIONS) | {"counts", "sections"}
+    assert boot["sections"] == SECTIONS and boot["physique"] == {"needs": {"energy": 40}}
+    assert "Direct and concise" in boot["identity_raw"] and boot["soul_tree"]
+    # Counts without the records themselves; experiences cover the last seven days
+    assert boot["counts"] == {"experiences": 7, "reflections": 3, "changes": 0, "proposals_pending": 0,
+                              "significant": 0, "photos": 2}
+    print("  ✓ Bootstrap test passed.")
+
+def test_sections_load_lazily_and_version():
+    print("[TEST] Sections: per-section payloads and versions...")
+    workspace = make_workspace()
+    data = collect_data(workspace)
+    assert set(data) == set(SECTIONS)
+    assert [e["id"] for e in load_section(workspace, "experiences")][0] == "EXP-20260303-0001"
+    assert load_section(workspace, "photos") == ["photo_0.png", "photo_1.png"]
+    assert load_section(workspace, "skills") == {} and load_section(workspace, "changes") == []
+
+    # Only a section's own files move its version
+    v_refl, v_phys = section_version(workspace, "reflections"), section_version(workspace, "physique")
+    with open(os.path.join(workspace, "memory", "reflections.jsonl"), "a") as f: f.write('{"id": "REF-20260309-004"}\n')
+    assert section_version(workspace, "reflections") != v_refl
+    assert section_version(workspace, "physique") == v_phys
+    assert len(load_section(workspace, "reflections")) == 4
+    try:
+        load_section(workspace, "unknown")
+        assert False, "expected KeyError"
+    except KeyError:
+        pass
+    print("  ✓ Section test passed.")
+
+if __name__ == "__main__":
+    test_bootstrap_is_minimal()
+    test_sections_load_lazily_and_version()
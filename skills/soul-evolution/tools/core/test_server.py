@@ -0,0 +1,89 @@
+import sys
+import os
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.server import ConcurrencyClass, ServerBusy, SingleFlight, classify_request
+
+def test_classify_request():
+    print("[TEST] Server: request classification...")
+    assert classify_request("GET", "subprocess") == "subprocess"
+    assert classify_request("POST", "subprocess") == "subprocess"
+    assert classify_request("POST") == "write"
+    assert classify_request("GET") == "read"
+    print("  ✓ Classification test passed.")
+
+def test_concurrency_class_rejects_when_queue_full():
+    print("[TEST] Server: queue limit rejection...")
+    cls = ConcurrencyClass("subprocess", workers=1, queue_limit=0, queue_timeout=0.1)
+    release = threading.Event()
+
+    def hold():
+        with cls.slot():
+            release.wait(2)
+
+    t = threading.Thread(target=hold)
+    t.start()
+    while cls.stats()["active"] == 0: threading.Event().wait(0.01)
+
+    try:
+        with cls.slot(): pass
+        assert False, "expected ServerBusy"
+    except ServerBusy as e:
+        assert e.class_name == "subprocess"
+
+    release.set()
+    t.join()
+    stats = cls.stats()
+    assert stats["rejected"] == 1 and stats["completed"] == 1
+    print("  ✓ Queue limit test passed.")
+
+def test_single_flight_shares_one_call():
+    print("[TEST] Server: request coalescing...")
+    flight = SingleFlight()
+    gate, calls, results = threading.Event(), [], []
+
+    def slow():
+        calls.append(1)
+        gate.wait(2)
+        return "payload"
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do("GET /api/vault/status", slow))) for _ in range(5)]
+    for t in threads: t.start()
+    while flight.stats()["shared"] < 4: threading.Event().wait(0.01)
+    gate.set()
+    for t in threads: t.join()
+    assert calls == [1] and results == ["payload"] * 5
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "shared": 4, "timed_out": 0}
+
+    # The leader's exception reaches the caller too; the next call starts fresh
+    try:
+        flight.do("k", lambda: (_ for _ in ()).throw(ServerBusy("subprocess")))
+        assert False, "expected ServerBusy"
+    except ServerBusy:
+        pass
+    assert flight.do("k", lambda: 42) == 42
+    print("  ✓ Coalescing test passed.")
+
+def test_single_flight_followers_time_out():
+    print("[TEST] Server: coalescing follower timeout...")
+    flight = SingleFlight(timeout=0.1)
+    gate = threading.Event()
+    leader = threading.Thread(target=lambda: flight.do("k", lambda: gate.wait(2)))
+    leader.start()
+    while flight.stats()["in_flight"] == 0: threading.Event().wait(0.01)
+    try:
+        flight.do("k", lambda: "never run")
+        assert False, "expected ServerBusy"
+    except ServerBusy as e:
+        assert e.class_name == "coalesced"
+    gate.set()
+    leader.join()
+    assert flight.stats()["timed_out"] == 1 and flight.do("k", lambda: 7) == 7
+    print("  ✓ Follower timeout test passed.")
+
+if __name__ == "__main__":
+    test_classify_request()
+    test_concurrency_class_rejects_when_queue_full()
+    test_single_flight_shares_one_call()
+    test_single_flight_followers_time_out()
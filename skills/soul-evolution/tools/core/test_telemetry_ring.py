@@ -0,0 +1,79 @@
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.telemetry_ring import TelemetryRing, VitalsTelemetry
+
+def sample(minute, stress, nested=False):
+    values = {"energy": 100 - stress, "stress": stress}
+    ts = f"2026-03-01T10:{minute:02d}:00.000Z"
+    return {"timestamp": ts, "needs": values, "location": "home"} if nested else dict(values, timestamp=ts)
+
+def test_ring_wraps_and_reopens():
+    print("[TEST] TelemetryRing: wrap-around and reopen...")
+    path = os.path.join(tempfile.mkdtemp(), "vitals.ring")
+    ring = TelemetryRing(path, ["energy", "stress"], capacity=4)
+    for minute in range(6): assert ring.append(sample(minute, 10 + minute))
+    assert not ring.append(sample(3, 99))  # Not newer than the last sample
+    points = ring.last(10)
+    assert [p["needs"]["stress"] for p in points] == [12, 13, 14, 15]
+    assert points[-1] == {"timestamp": "2026-03-01T10:05:00.000Z", "needs": {"energy": 85, "stress": 15}}
+    assert ring.column("energy", 2)[1] == [86, 85]
+    ring.close()
+
+    reopened = TelemetryRing(path, ["energy", "stress"], capacity=4)
+    assert reopened.last(10) == points
+    reopened.close()
+    # A different layout starts a fresh ring
+    assert TelemetryRing(path, ["energy"], capacity=4).last(10) == []
+    print("  ✓ Ring test passed.")
+
+def test_incremental_import():
+    print("[TEST] VitalsTelemetry: incremental JSONL import...")
+    telemetry_dir = tempfile.mkdtemp()
+    with open(os.path.join(telemetry_dir, "vitals.jsonl"), "w") as f:
+        for minute in (0, 2): f.write(json.dumps(sample(minute, minute)) + "\n")
+    daily = os.path.join(telemetry_dir, "vitality_2026-03-01.jsonl")
+    with open(daily, "w") as f:
+        f.write(json.dumps(sample(1, 1, nested=True)) + "\n")
+        f.write(json.dumps(sample(2, 50, nested=True)) + "\n")  # Same instant as a vitals.jsonl sample
+        f.write(json.dumps(sample(3, 3, nested=True)) + "\n")
+        f.write('{"timestamp": "2026-03-01T10:04')  # Half-written
+
+    # Overlapping sources interleave by timestamp instead of the later one losing its samples
+    vitals = VitalsTelemetry(telemetry_dir, capacity=16)
+    assert [p["needs"]["stress"] for p in vitals.last(50)] == [0, 1, 2, 3]
+    assert vitals.sync() == 0
+    with open(daily, "a") as f: f.write(':00.000Z", "needs": {"stress": 4}}\n')
+    assert [p["needs"] for p in vitals.last(2)] == [{"energy": 97, "stress": 3}, {"stress": 4}]
+    assert vitals.stats()["imported"] == 5
+
+    # Import cursors live in the ring header: a restart reads nothing again
+    restarted = VitalsTelemetry(telemetry_dir, capacity=16)
+    assert restarted.sync() == 0 and len(restarted.last(50)) == 5
+    print("  ✓ Import test passed.")
+
+def test_sync_checks_only_live_files():
+    print("[TEST] VitalsTelemetry: stats per sync...")
+    telemetry_dir = tempfile.mkdtemp()
+    for day in range(1, 11):
+        with open(os.path.join(telemetry_dir, f"vitality_2026-03-{day:02d}.jsonl"), "w") as f:
+            f.write(json.dumps(dict(sample(day, day), timestamp=f"2026-03-{day:02d}T10:00:00.000Z")) + "\n")
+    vitals = VitalsTelemetry(telemetry_dir, capacity=16)
+    assert len(vitals.last(50)) == 10
+    with patch("os.stat", wraps=os.stat) as stat:
+        assert vitals.sync() == 0
+        assert stat.call_count == 2  # The directory and today's file
+    # A new day's file changes the directory: listed again and imported
+    with open(os.path.join(telemetry_dir, "vitality_2026-03-11.jsonl"), "w") as f:
+        f.write(json.dumps(dict(sample(0, 11), timestamp="2026-03-11T10:00:00.000Z")) + "\n")
+    assert vitals.sync() == 1
+    print("  ✓ Sync test passed.")
+
+if __name__ == "__main__":
+    test_ring_wraps_and_reopens()
+    test_incremental_import()
+    test_sync_checks_only_live_files()
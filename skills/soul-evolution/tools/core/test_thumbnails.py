@@ -0,0 +1,100 @@
+import sys
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import core.thumbnails as thumbnails
+from core.static_files import serve_file
+
+def fake_image():
+    # Stands in for PIL: "resizing" writes the requested format name as the file body
+    image = MagicMock()
+    img = image.open.return_value.__enter__.return_value
+    img.mode = "RGB"
+    img.save.side_effect = lambda fp, format, quality: open(fp, "w").write(format)
+    return image
+
+def make_cache():
+    photos = tempfile.mkdtemp()
+    with open(os.path.join(photos, "beach.png"), "wb") as f: f.write(b"\x89PNG-source")
+    return thumbnails.ThumbnailCache(photos, tempfile.mkdtemp())
+
+def make_handler(headers):
+    handler = MagicMock()
+    handler.command = "HEAD"
+    handler.headers = headers
+    sent = {}
+    handler.send_header.side_effect = lambda k, v: sent.__setitem__(k, v)
+    return handler, sent
+
+def test_format_per_accept_and_accounting():
+    print("[TEST] Thumbnails: format negotiation and byte accounting...")
+    with patch.object(thumbnails, "Image", fake_image()):
+        cache = make_cache()
+        webp, jpeg = cache.get("beach.png", 256, "webp"), cache.get("beach.png", 256, "jpeg")
+        assert webp.endswith("-256.webp") and jpeg.endswith("-256.jpg")
+        assert open(webp).read() == "WEBP" and open(jpeg).read() == "JPEG"
+        assert cache.get("beach.png", 256, "webp") == webp and cache.hits == 1
+        assert cache.get("beach.png", 100) is None and cache.get("../beach.png", 256) == webp
+
+        # Two threads finishing the same derivative count its bytes once
+        cache._generate(cache.source_path("beach.png"), webp, 256, "webp")
+        assert cache.stats()["bytes"] == os.path.getsize(webp) + os.path.getsize(jpeg)
+        assert cache.stats()["files"] == 2
+    print("  ✓ Negotiation test passed.")
+
+def test_negotiated_etag_and_vary():
+    print("[TEST] Thumbnails: ETag and Vary per format...")
+    fp = os.path.join(tempfile.mkdtemp(), "thumb.webp")
+    with open(fp, "wb") as f: f.write(b"RIFF....WEBP")
+    handler, webp_headers = make_handler({})
+    serve_file(handler, fp, negotiated="webp")
+    assert webp_headers["Vary"] == "Accept" and webp_headers["ETag"].endswith('-webp"')
+    handler, jpeg_headers = make_handler({})
+    serve_file(handler, fp, negotiated="jpeg")
+    assert jpeg_headers["ETag"] != webp_headers["ETag"]
+
+    # A revalidation of the WebP copy gets a 304 that still varies on Accept
+    handler, headers = make_handler({"If-None-Match": webp_headers["ETag"]})
+    serve_file(handler, fp, negotiated="webp")
+    handler.send_response.assert_called_once_with(304)
+    assert headers["Vary"] == "Accept"
+    handler, _ = make_handler({"If-None-Match": webp_headers["ETag"]})
+    serve_file(handler, fp, negotiated="jpeg")
+    handler.send_response.assert_called_once_with(200)
+    print("  ✓ ETag test passed.")
+
+def test_one_render_per_derivative():
+    print("[TEST] Thumbnails: concurrent requests for one derivative...")
+    image, active, peak, calls = fake_image(), [0], [0], []
+    def slow_save(fp, format, quality):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        active[0] -= 1
+        calls.append(fp)
+        if len(calls) == 1: raise OSError("decoder hiccup")  # Waiting requests take over
+        open(fp, "w").write(format)
+    image.open.return_value.__enter__.return_value.save.side_effect = slow_save
+    with patch.object(thumbnails, "Image", image):
+        cache, results = make_cache(), []
+        def request():
+            try: results.append(cache.get("beach.png", 256))
+            except OSError: results.append(None)
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for t in threads:
+            t.start()
+            time.sleep(0.05)
+        for t in threads: t.join()
+        # A request arriving after the failed render still queues behind the retry
+        assert peak[0] == 1 and len(calls) == 2 and cache.generated == 1
+        assert results.count(None) == 1 and cache._key_locks == {}
+    print("  ✓ Single render test passed.")
+
+if __name__ == "__main__":
+    test_format_per_accept_and_accounting()
+    test_negotiated_etag_and_vary()
+    test_one_render_per_derivative()
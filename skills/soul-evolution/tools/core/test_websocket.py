@@ -0,0 +1,68 @@
+import sys
+import os
+import json
+import socket
+import struct
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.websocket import WebSocket, accept_key, OP_TEXT
+from core.hot_documents import HotDocument
+from core.state_channel import StateChannel
+
+def client_frame(text, opcode=OP_TEXT, mask=b"\x01\x02\x03\x04"):
+    data = text.encode()
+    masked = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+    return bytes([0x80 | opcode, 0x80 | len(data)]) + mask + masked
+
+def read_frame(sock):
+    b1, b2 = sock.recv(2)
+    n = b2 & 0x7F
+    if n == 126: n = struct.unpack(">H", sock.recv(2))[0]
+    data = b""
+    while len(data) < n: data += sock.recv(n - len(data))
+    return b1 & 0x0F, data
+
+def test_handshake_and_frames():
+    print("[TEST] WebSocket: accept key and masked frames...")
+    # Example from RFC 6455, section 1.3
+    assert accept_key("dGhlIHNhbXBsZSBub25jZQ==") == "s3pPLMBiTxaQ9kYGzzhZRbK+xOo="
+    server, client = socket.socketpair()
+    ws = WebSocket(server)
+    client.sendall(client_frame('{"a": 1}'))
+    assert ws.recv() == (OP_TEXT, b'{"a": 1}')
+    ws.send_text("x" * 300)
+    assert read_frame(client) == (OP_TEXT, b"x" * 300)
+    print("  ✓ Frame test passed.")
+
+def test_channel_coalesces_updates():
+    print("[TEST] StateChannel: coalesced broadcast...")
+    path = os.path.join(tempfile.mkdtemp(), "avatar_state.json")
+    with open(path, "w") as f: json.dump({"pose": "idle"}, f)
+    channel = StateChannel(HotDocument(path), hz=5)
+    server, client = socket.socketpair()
+    threading.Thread(target=channel.serve, args=(WebSocket(server),), daemon=True).start()
+
+    op, first = read_frame(client)
+    assert json.loads(first) == {"type": "snapshot", "seq": 1, "data": {"pose": "idle"}}
+    for i in range(50): channel.apply({"blendShapes": {"joy": i / 50}}, stamp=False)
+    client.sendall(client_frame('{"type": "update", "data": {"pose": "sitting"}}'))
+    time.sleep(0.5)
+    client.setblocking(False)
+    frames = []
+    try:
+        while True: frames.append(json.loads(read_frame(client)[1]))
+    except (BlockingIOError, ValueError):
+        pass
+    # 51 updates, but at 5 Hz only a couple of frames; the last one carries the final values
+    assert 1 <= len(frames) <= 3
+    merged = {}
+    for f in frames: merged.update(f["data"])
+    assert merged["blendShapes"] == {"joy": 49 / 50} and merged["pose"] == "sitting"
+    print("  ✓ Coalescing test passed.")
+
+if __name__ == "__main__":
+    test_handshake_and_frames()
+    test_channel_coalesces_updates()
@@ -0,0 +1,152 @@
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.hot_documents import HotDocuments
+from core.workspace_store import FileCache, WorkspaceStore, load_jsonl, tail_jsonl
+
+def make_workspace():
+    workspace = tempfile.mkdtemp()
+    os.makedirs(os.path.join(workspace, "memory", "reality"))
+    with open(os.path.join(workspace, "memory", "reality", "skills.json"), "w") as f: json.dump({"skills": []}, f)
+    return workspace
+
+def test_cached_reads_and_versions():
+    print("[TEST] WorkspaceStore: cached reads and versions...")
+    store = WorkspaceStore(make_workspace())
+    first = store.read_json("reality/skills.json")
+    assert store.read_json("reality/skills.json") is first
+    assert store.cache.stats()["misses"] == 1
+    v1 = store.version("reality/skills.json")
+    assert store.version("reality/missing.json") == 0
+
+    changes = []
+    store.subscribe(lambda path, version: changes.append((os.path.basename(path), version)))
+    store.update_json("reality/skills.json", lambda data: data["skills"].append("chess"))
+    assert first == {"skills": []}  # Shared value untouched
+    assert store.read_json("reality/skills.json") == {"skills": ["chess"]}
+    assert changes == [("skills.json", v1 + 1)]
+    print("  ✓ Cached read test passed.")
+
+def test_hot_documents_served_from_memory():
+    print("[TEST] WorkspaceStore: hot documents...")
+    workspace = make_workspace()
+    hot = HotDocuments(os.path.join(workspace, "memory", "reality"), names=["physique.json"], flush_delay=60)
+    store = WorkspaceStore(workspace, hot)
+    changes = []
+    store.subscribe(lambda path, version: changes.append(version))
+    store.merge_json("reality/physique.json", {"needs": {"energy": 5}})
+    assert store.read_json(os.path.join(workspace, "memory", "reality", "physique.json")) == {"needs": {"energy": 5}}
+    assert not os.path.exists(os.path.join(workspace, "memory", "reality", "physique.json"))
+    assert changes == [store.version("reality/physique.json")]
+    hot.flush_all()
+    assert os.path.exists(os.path.join(workspace, "memory", "reality", "physique.json"))
+    print("  ✓ Hot document test passed.")
+
+def test_transaction_commits_all_or_nothing():
+    print("[TEST] WorkspaceStore: write transactions...")
+    workspace = make_workspace()
+    store = WorkspaceStore(workspace)
+    with patch.object(os, "fsync", wraps=os.fsync) as fsync:
+        with store.transaction() as tx:
+            tx.write_json("reality/simulation_config.json", {"wizard_completed": True})
+            tx.update_json("reality/skills.json", lambda data: data["skills"].append("chess"))
+            tx.update_json("reality/skills.json", lambda data: data["skills"].append("go"))
+    assert fsync.call_count == 3  # Both documents, then their directory once
+    assert store.read_json("reality/skills.json") == {"skills": ["chess", "go"]}
+    assert store.read_json("reality/simulation_config.json") == {"wizard_completed": True}
+    assert store.commits == 1 and store.syncs == 1 and store.writes == 2
+
+    try:
+        with store.transaction() as tx:
+            tx.write_json("reality/skills.json", {"skills": []})
+            raise RuntimeError("handler failed")
+    except RuntimeError:
+        pass
+    assert store.read_json("reality/skills.json") == {"skills": ["chess", "go"]}
+    assert not [n for n in os.listdir(os.path.join(workspace, "memory", "reality")) if n.endswith(".tmp")]
+
+    # Text documents and logs commit together with the rest
+    with store.transaction() as tx:
+        tx.write_text(os.path.join(workspace, "SOUL.md"), "# SOUL.md\n")
+        tx.write_jsonl("proposals/pending.jsonl", [{"id": "PROP-20260301-002"}])
+        tx.append_jsonl("proposals/history.jsonl", {"id": "PROP-20260301-001"})
+        tx.append_jsonl("proposals/history.jsonl", {"id": "PROP-20260301-003"})
+    with open(os.path.join(workspace, "SOUL.md")) as f: assert f.read() == "# SOUL.md\n"
+    assert store.read_jsonl("proposals/pending.jsonl") == [{"id": "PROP-20260301-002"}]
+    assert store.read_jsonl("proposals/history.jsonl") == [{"id": "PROP-20260301-001"}, {"id": "PROP-20260301-003"}]
+    assert store.commits == 2 and store.syncs == 2
+
+    # Appends never read or replace the log: same inode, only the new record written
+    history = os.path.join(workspace, "memory", "proposals", "history.jsonl")
+    with open(history, "a") as f: f.write('{"id": "PROP-20260301-004"}')
+    inode = os.stat(history).st_ino
+    with patch("builtins.open", wraps=open) as opened:
+        with store.transaction() as tx: tx.append_jsonl("proposals/history.jsonl", {"id": "PROP-20260301-005"})
+    assert [c.args[1] for c in opened.call_args_list] == ["a+b"] and os.stat(history).st_ino == inode
+    assert [r["id"] for r in store.read_jsonl("proposals/history.jsonl")][-2:] == ["PROP-20260301-004", "PROP-20260301-005"]
+
+    # A commit that fails after appending cuts the log back
+    size = os.path.getsize(history)
+    with patch.object(store, "_sync", side_effect=OSError("disk full")):
+        try:
+            with store.transaction() as tx:
+                tx.write_json("reality/skills.json", {"skills": []})
+                tx.append_jsonl("proposals/history.jsonl", {"id": "PROP-20260301-006"})
+            assert False, "expected OSError"
+        except OSError:
+            pass
+    assert os.path.getsize(history) == size and store.read_json("reality/skills.json") == {"skills": ["chess", "go"]}
+    print("  ✓ Transaction test passed.")
+
+def test_tail_reads_backwards():
+    print("[TEST] tail_jsonl: last records from EOF...")
+    fp = os.path.join(tempfile.mkdtemp(), "log.jsonl")
+    with open(fp, "w") as f:
+        for i in range(500):
+            f.write(json.dumps({"i": i, "level": "ERROR" if i % 7 == 0 else "DEBUG", "pad": "x" * (i % 13)}) + "\n")
+            if i == 250: f.write("not json\n\n")
+        f.write('{"i": 500, "half-writ')
+    everything = load_jsonl(fp)
+    for block in (16, 100, 65536):
+        assert tail_jsonl(fp, 20, block=block) == everything[-20:]
+        errors = [r for r in everything if r["level"] == "ERROR"]
+        assert tail_jsonl(fp, 10, lambda r: r["level"] == "ERROR", block=block) == errors[-10:]
+        assert tail_jsonl(fp, 1000, block=block) == everything
+    assert tail_jsonl(fp + ".missing", 5) == []
+    print("  ✓ Tail test passed.")
+
+def test_file_cache_invalidation():
+    print("[TEST] FileCache: invalidation and incremental JSONL...")
+    d = tempfile.mkdtemp()
+    cache, fp = FileCache(), os.path.join(d, "config.json")
+    with open(fp, "w") as f: json.dump({"a": 1}, f)
+    assert cache.get(fp, load_jsonl) == [{"a": 1}] and cache.get(fp, load_jsonl) == [{"a": 1}]
+    assert cache.stats()["hits"] == 1
+    with open(fp, "w") as f: json.dump({"a": 22}, f)
+    assert cache.get(fp, load_jsonl) == [{"a": 22}]
+    os.remove(fp)
+    assert cache.get(fp, load_jsonl, default=list) == []
+
+    log = os.path.join(d, "log.jsonl")
+    with open(log, "w") as f: f.write('{"i": 0}\n{"i": 1}\n{"i": 2')
+    assert cache.get_jsonl(log) == [{"i": 0}, {"i": 1}]
+    with open(log, "a") as f: f.write('}\n{"i": 3}\n')
+    assert cache.get_jsonl(log) == [{"i": 0}, {"i": 1}, {"i": 2}, {"i": 3}]
+
+    # Rewritten in place (same inode) and grown: parsed again, not appended to
+    with open(log, "r+") as f: f.write('{"i": 9}\n{"i": 8}\n{"i": 7}\n{"i": 6}\n{"i": 5}\n')
+    assert cache.get_jsonl(log) == [{"i": 9}, {"i": 8}, {"i": 7}, {"i": 6}, {"i": 5}]
+    with open(log, "w") as f: f.write('{"i": 4}\n')
+    assert cache.get_jsonl(log) == [{"i": 4}]
+    print("  ✓ FileCache test passed.")
+
+if __name__ == "__main__":
+    test_cached_reads_and_versions()
+    test_hot_documents_served_from_memory()
+    test_transaction_commits_all_or_nothing()
+    test_tail_reads_backwards()
+    test_file_cache_invalidation()
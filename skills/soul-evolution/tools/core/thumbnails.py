@@ -0,0 +1,163 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+ALLOWED_SIZES = (128, 256, 512, 1024)
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+
+class ThumbnailCache:
+    """
+    Resized WebP/JPEG derivatives of reality photos, generated on first
+    request and stored content-addressed under cache_dir. A changed source
+    hashes to new keys; stale derivatives are dropped and the directory is
+    held under max_bytes by least-recently-used eviction.
+    """
+
+    def __init__(self, source_dir, cache_dir, max_bytes=256 * 1024 * 1024):
+        self.source_dir = os.path.abspath(source_dir)
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._key_locks = {}  # derivative path -> [lock, requests holding or awaiting it]
+        self._digests = {}   # source name -> (stat signature, content digest)
+        self._lru = OrderedDict()  # derivative path -> size, oldest first
+        self.total_bytes = 0
+        self.hits = 0
+        self.generated = 0
+        self.evicted = 0
+        self._scan()
+
+    @property
+    def available(self):
+        return Image is not None
+
+    def _scan(self):
+        # Rebuild recency order from mtimes, which get bumped on every hit
+        entries = []
+        for dirpath, _, files in os.walk(self.cache_dir):
+            for name in files:
+                fp = os.path.join(dirpath, name)
+                try: st = os.stat(fp)
+                except OSError: continue
+                entries.append((st.st_mtime, fp, st.st_size))
+        for _, fp, size in sorted(entries):
+            self._lru[fp] = size
+            self.total_bytes += size
+
+    def source_path(self, name):
+        """Resolves a photo name, refusing anything outside the source directory."""
+        name = os.path.basename(name)
+        if not name.lower().endswith(SOURCE_EXTENSIONS):
+            return None
+        fp = os.path.join(self.source_dir, name)
+        return fp if os.path.isfile(fp) else None
+
+    def _digest(self, name, fp):
+        st = os.stat(fp)
+        sig = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._digests.get(name)
+        if cached and cached[0] == sig:
+            return cached[1]
+        h = hashlib.blake2b(digest_size=16)
+        with open(fp, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        with self._lock:
+            previous = self._digests.get(name)
+            self._digests[name] = (sig, digest)
+        if previous and previous[1] != digest:
+            self._drop_digest(previous[1])
+        return digest
+
+    def _drop_digest(self, digest):
+        prefix = os.path.join(self.cache_dir, digest[:2], digest)
+        with self._lock:
+            stale = [fp for fp in self._lru if fp.startswith(prefix)]
+        for fp in stale: self._remove(fp)
+
+    def _remove(self, fp):
+        with self._lock:
+            size = self._lru.pop(fp, None)
+            if size is None: return
+            self.total_bytes -= size
+        try: os.remove(fp)
+        except OSError: pass
+
+    def get(self, name, size, fmt="webp"):
+        """Path of the derivative for (name, size, fmt), generating it if needed."""
+        if not self.available or size not in ALLOWED_SIZES:
+            return None
+        src = self.source_path(name)
+        if not src:
+            return None
+        fmt = "webp" if fmt == "webp" else "jpeg"
+        digest = self._digest(name, src)
+        out = os.path.join(self.cache_dir, digest[:2], f"{digest}-{size}.{'webp' if fmt == 'webp' else 'jpg'}")
+
+        # One generator per derivative; concurrent requests wait for it. The lock
+        # lives until the last of them is done, so a late request cannot get a fresh one
+        with self._lock:
+            entry = self._key_locks.setdefault(out, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                if os.path.exists(out):
+                    with self._lock:
+                        self.hits += 1
+                        if out in self._lru: self._lru.move_to_end(out)
+                    try: os.utime(out)
+                    except OSError: pass
+                    return out
+                self._generate(src, out, size, fmt)
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]: del self._key_locks[out]
+        self._evict()
+        return out
+
+    def _generate(self, src, out, size, fmt):
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        tmp = f"{out}.{threading.get_ident()}.tmp"
+        with Image.open(src) as img:
+            img.thumbnail((size, size))
+            if fmt == "jpeg" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            img.save(tmp, format=fmt.upper(), quality=82)
+        os.replace(tmp, out)
+        size = os.path.getsize(out)
+        with self._lock:
+            # Replacing an entry already counted (another thread got here first) must not count it twice
+            self.total_bytes += size - self._lru.pop(out, 0)
+            self._lru[out] = size
+            self.generated += 1
+
+    def _evict(self):
+        while True:
+            with self._lock:
+                if self.total_bytes <= self.max_bytes or len(self._lru) <= 1:
+                    return
+                fp = next(iter(self._lru))
+                self.evicted += 1
+            self._remove(fp)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "available": self.available,
+                "files": len(self._lru),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "generated": self.generated,
+                "evicted": self.evicted,
+            }
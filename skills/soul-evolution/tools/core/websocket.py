@@ -0,0 +1,154 @@
+import base64
+import hashlib
+import os
+import select
+import struct
+import threading
+
+# RFC 6455 opcodes
+OP_CONT, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_MESSAGE = 1 << 20
+
+
+class WebSocketClosed(Exception):
+    pass
+
+
+def accept_key(key):
+    return base64.b64encode(hashlib.sha1((key + GUID).encode()).digest()).decode()
+
+
+def unmask(data, mask):
+    # XOR the whole payload as one big integer instead of byte by byte
+    n = len(data)
+    key = (mask * (n // 4 + 1))[:n]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big")
+
+
+def handshake(handler):
+    """
+    Completes the server side of the opening handshake on a
+    BaseHTTPRequestHandler. Returns a WebSocket, or None after answering 400.
+    """
+    headers = handler.headers
+    key = headers.get("Sec-WebSocket-Key")
+    upgrade = (headers.get("Upgrade") or "").lower()
+    connection = (headers.get("Connection") or "").lower()
+    if not key or upgrade != "websocket" or "upgrade" not in connection or headers.get("Sec-WebSocket-Version") != "13":
+        handler.send_error(400, "Expected a WebSocket upgrade")
+        return None
+    handler.close_connection = True
+    handler.send_response(101)
+    handler.send_header("Upgrade", "websocket")
+    handler.send_header("Connection", "Upgrade")
+    handler.send_header("Sec-WebSocket-Accept", accept_key(key))
+    handler.end_headers()
+    handler.wfile.flush()
+    return WebSocket(handler.connection)
+
+
+class WebSocket:
+    """
+    Minimal server-side RFC 6455 connection over a raw socket: text
+    frames, fragmentation, ping/pong and close. Clients may not send
+    before the 101 response, so nothing is left in the HTTP read buffer.
+    """
+
+    def __init__(self, sock, send_timeout=5.0):
+        self.sock = sock
+        self.sock.settimeout(send_timeout)
+        self._buf = b""
+        self._send_lock = threading.Lock()
+        self._fragments = []
+        self._fragment_op = None
+        self.closed = False
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def readable(self, timeout):
+        """True when a frame (or part of one) is waiting."""
+        if self._buf: return True
+        return bool(select.select([self.sock], [], [], timeout)[0])
+
+    # --- receiving ---
+
+    def _read(self, n):
+        while len(self._buf) < n:
+            chunk = self.sock.recv(max(65536, n - len(self._buf)))
+            if not chunk:
+                self.closed = True
+                raise WebSocketClosed("peer closed the connection")
+            self._buf += chunk
+        data, self._buf = self._buf[:n], self._buf[n:]
+        return data
+
+    def recv(self):
+        """Next complete text/binary message as (opcode, bytes); answers pings itself."""
+        while True:
+            b1, b2 = self._read(2)
+            fin, opcode = b1 & 0x80, b1 & 0x0F
+            length = b2 & 0x7F
+            if not b2 & 0x80:
+                self.close(1002)
+                raise WebSocketClosed("client frames must be masked")
+            if length == 126: length = struct.unpack(">H", self._read(2))[0]
+            elif length == 127: length = struct.unpack(">Q", self._read(8))[0]
+            if length > MAX_MESSAGE:
+                self.close(1009)
+                raise WebSocketClosed("frame too large")
+            mask = self._read(4)
+            payload = unmask(self._read(length), mask) if length else b""
+
+            if opcode == OP_CLOSE:
+                self.close()
+                raise WebSocketClosed("closed by peer")
+            if opcode == OP_PING:
+                self._send_frame(OP_PONG, payload)
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CONT:
+                self._fragments.append(payload)
+                if sum(len(f) for f in self._fragments) > MAX_MESSAGE:
+                    self.close(1009)
+                    raise WebSocketClosed("message too large")
+                if fin:
+                    message, op = b"".join(self._fragments), self._fragment_op
+                    self._fragments, self._fragment_op = [], None
+                    return op, message
+                continue
+            if not fin:
+                self._fragments, self._fragment_op = [payload], opcode
+                continue
+            return opcode, payload
+
+    # --- sending ---
+
+    def _send_frame(self, opcode, payload):
+        header = bytes([0x80 | opcode])
+        n = len(payload)
+        if n < 126: header += bytes([n])
+        elif n < 1 << 16: header += bytes([126]) + struct.pack(">H", n)
+        else: header += bytes([127]) + struct.pack(">Q", n)
+        with self._send_lock:
+            if self.closed and opcode != OP_CLOSE:
+                raise WebSocketClosed("connection closed")
+            try:
+                self.sock.sendall(header + payload)
+            except OSError as e:
+                self.closed = True
+                raise WebSocketClosed(str(e))
+
+    def send_text(self, text):
+        self._send_frame(OP_TEXT, text.encode() if isinstance(text, str) else text)
+
+    def ping(self):
+        self._send_frame(OP_PING, os.urandom(4))
+
+    def close(self, code=1000):
+        if self.closed: return
+        try: self._send_frame(OP_CLOSE, struct.pack(">H", code))
+        except WebSocketClosed: pass
+        self.closed = True
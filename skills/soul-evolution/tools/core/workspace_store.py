@@ -0,0 +1,420 @@
+import copy
+import fnmatch
+import json
+import os
+import threading
+import zlib
+
+def load_json(fp):
+    if not os.path.exists(fp): return {}
+    try:
+        with open(fp, "r") as f: return json.load(f)
+    except: return {}
+
+def load_jsonl(fp):
+    items = []
+    if not os.path.exists(fp): return items
+    try:
+        with open(fp, "r") as f:
+            for line in f:
+                if line.strip():
+                    try: items.append(json.loads(line))
+                    except: pass
+    except: pass
+    return items
+
+def tail_jsonl(fp, n, predicate=None, block=65536):
+    """
+    The last n records of a JSONL file (oldest first), read backwards from
+    EOF in blocks, so the cost follows n rather than the file size.
+    With a predicate, only matching records count towards n.
+    """
+    if n <= 0: return []
+    try:
+        f = open(fp, "rb")
+    except OSError:
+        return []
+    out = []
+    with f:
+        pos = f.seek(0, os.SEEK_END)
+        carry = b""
+        while pos > 0 and len(out) < n:
+            size = min(block, pos)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + carry).split(b"\n")
+            # The first piece may continue in the previous block, unless we reached the start
+            carry = lines.pop(0) if pos > 0 else b""
+            for line in reversed(lines):
+                if not line.strip(): continue
+                try: record = json.loads(line)
+                except ValueError: continue
+                if predicate and not predicate(record): continue
+                out.append(record)
+                if len(out) == n: break
+    out.reverse()
+    return out
+
+
+class FileCache:
+    """
+    Per-file parse cache validated by (inode, mtime_ns, size).
+    Values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def signature(fp):
+        try:
+            st = os.stat(fp)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def get(self, fp, loader, default=None):
+        """Returns loader(fp), re-running the loader only when the file changed."""
+        key = (fp, loader)
+        sig = self.signature(fp)
+        with self._lock:
+            entry = self._entries.get(key)
+            if sig is None:
+                self._entries.pop(key, None)
+                return default() if callable(default) else default
+            if entry and entry[0] == sig:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = loader(fp)
+        with self._lock:
+            self._entries[key] = (sig, value)
+        return value
+
+    def get_jsonl(self, fp):
+        """
+        Like get(fp, load_jsonl), but when an append-only log grew in place
+        only the appended bytes are parsed. The last line parsed is kept as
+        a checksum; if it changed, the file was rewritten rather than
+        appended to and is parsed again from the start.
+        """
+        key = (fp, "jsonl")
+        sig = self.signature(fp)
+        with self._lock:
+            entry = self._entries.get(key)
+            if sig is None:
+                self._entries.pop(key, None)
+                return []
+            if entry and entry[0] == sig:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        items, offset, tail = [], 0, None
+        if entry and entry[0][0] == sig[0] and sig[2] > entry[0][2]:
+            items, offset, tail = entry[1], entry[2], entry[3]
+        try:
+            with open(fp, "rb") as f:
+                if tail:
+                    f.seek(tail[0])
+                    if zlib.crc32(f.read(offset - tail[0])) != tail[1]: items, offset, tail = [], 0, None
+                f.seek(offset)
+                chunk = f.read()
+        except OSError:
+            return []
+
+        # Only consume complete lines; a half-written record is picked up next time
+        end = chunk.rfind(b"\n") + 1
+        new_items = []
+        for line in chunk[:end].splitlines():
+            if line.strip():
+                try: new_items.append(json.loads(line))
+                except: pass
+        if end:
+            last = chunk.rfind(b"\n", 0, end - 1) + 1
+            tail = (offset + last, zlib.crc32(chunk[last:end]))
+        items = items + new_items if new_items else items
+        with self._lock:
+            self._entries[key] = (sig, items, offset + end, tail)
+        return items
+
+    def listdir(self, dir_path, pattern):
+        """Sorted names in dir_path matching pattern, re-listed only when the directory changes."""
+        return self.get(dir_path, _Lister(pattern), default=list)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class _Lister:
+    # Hashable, per-pattern loader so listdir() results are cached separately per glob
+    def __init__(self, pattern): self.pattern = pattern
+    def __eq__(self, other): return isinstance(other, _Lister) and other.pattern == self.pattern
+    def __hash__(self): return hash(("lister", self.pattern))
+    def __call__(self, d):
+        try: return sorted(n for n in os.listdir(d) if fnmatch.fnmatch(n, self.pattern))
+        except OSError: return []
+
+
+class WriteTransaction:
+    """
+    Stages document writes and commits them together: every document is
+    written to a temp file and synced, each temp file is renamed over its
+    target, then the directories holding the renames are synced. A crash
+    leaves each rewritten file either old or new, never truncated. Records
+    appended to a log are written in place at commit and synced with the
+    rest (a crash can at worst leave a partial last line, which readers
+    skip). Hot documents are handed to their in-memory copy at
+    commit (they are written behind as usual). Holds the store's write lock
+    from `with` until commit, so read-modify-write steps cannot interleave.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._staged = {}  # path -> new content
+        self._appends = {}  # path -> lines appended in place at commit
+
+    def __enter__(self):
+        self.store._write_lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None: self.store._commit(self._staged, self._appends)
+        finally:
+            self.store._write_lock.release()
+
+    def _private_copy(self, fp):
+        if fp in self._staged: return self._staged[fp]
+        doc = self.store._hot(fp)
+        return copy.deepcopy(doc.read()) if doc else load_json(fp)
+
+    def write_json(self, rel, data):
+        self._staged[self.store.path(rel)] = data
+
+    def update_json(self, rel, fn):
+        """fn(data) edits a private copy in place; later steps see the staged result."""
+        fp = self.store.path(rel)
+        data = self._private_copy(fp)
+        fn(data)
+        self._staged[fp] = data
+
+    def merge_json(self, rel, delta):
+        self.update_json(rel, lambda data: data.update(delta))
+
+    def write_text(self, rel, text):
+        """Stages a document that is not JSON (SOUL.md, a rewritten log) verbatim."""
+        fp = self.store.path(rel)
+        self._appends.pop(fp, None)
+        self._staged[fp] = _Text(text)
+
+    def write_jsonl(self, rel, records):
+        self.write_text(rel, "".join(json.dumps(r) + "\n" for r in records))
+
+    def append_jsonl(self, rel, record):
+        """Appends to a log as part of the commit, without reading or rewriting what it holds."""
+        fp = self.store.path(rel)
+        line = json.dumps(record) + "\n"
+        text = self._staged.get(fp)
+        if text is not None:
+            # Rewritten in this transaction already: the record joins the new content
+            self._staged[fp] = _Text(text + ("\n" if text and not text.endswith("\n") else "") + line)
+        else:
+            self._appends.setdefault(fp, []).append(line)
+
+
+class _Text(str):
+    # Staged content written as-is instead of being serialized as JSON
+    pass
+
+
+class WorkspaceStore:
+    """
+    Process-wide access to the workspace's memory/ documents for core
+    handlers and plugin backends. Reads go through one parse cache (hot
+    documents come straight from memory), so a document polled by several
+    panels is parsed once per change. Every document has a version number
+    that moves when it changes, and subscribers hear about each change.
+    Values returned by read_*() are shared: never mutate them, use
+    update_json() or write_json() instead.
+    """
+
+    def __init__(self, workspace, hot_docs=None, cache=None):
+        self.workspace = os.path.abspath(workspace)
+        self.memory_dir = os.path.join(self.workspace, "memory")
+        self.cache = cache or FileCache()
+        self.hot = hot_docs
+        self._lock = threading.Lock()
+        self._versions = {}  # path -> (signature, version)
+        self._subscribers = []
+        self._write_lock = threading.RLock()
+        self.writes = 0
+        self.commits = 0
+        self.syncs = 0
+        if hot_docs:
+            for doc in hot_docs.docs.values():
+                doc.subscribe(lambda delta, path=doc.path: self._notify(path))
+
+    def path(self, rel):
+        """Absolute path of a document; relative names are taken from memory/."""
+        return rel if os.path.isabs(rel) else os.path.join(self.memory_dir, rel)
+
+    def _hot(self, fp):
+        return self.hot.for_path(fp) if self.hot else None
+
+    # --- reads ---
+
+    def read_json(self, rel):
+        fp = self.path(rel)
+        doc = self._hot(fp)
+        if doc: return doc.read()
+        return self.cache.get(fp, load_json, default=dict)
+
+    def read_jsonl(self, rel):
+        return self.cache.get_jsonl(self.path(rel))
+
+    def tail_jsonl(self, rel, n, predicate=None):
+        """Last n (matching) records without reading the whole log; see tail_jsonl()."""
+        return tail_jsonl(self.path(rel), n, predicate)
+
+    def version(self, rel):
+        """Increases whenever the document changes; 0 while it does not exist."""
+        fp = self.path(rel)
+        doc = self._hot(fp)
+        if doc: return doc.version
+        sig = FileCache.signature(fp)
+        with self._lock:
+            old_sig, version = self._versions.get(fp, (None, 0))
+            if sig != old_sig:
+                version = version + 1 if sig else version
+                self._versions[fp] = (sig, version)
+            return version if sig else 0
+
+    # --- writes ---
+
+    def transaction(self):
+        """with store.transaction() as tx: tx.update_json(...); tx.write_json(...)"""
+        return WriteTransaction(self)
+
+    def write_json(self, rel, data):
+        fp = self.path(rel)
+        doc = self._hot(fp)
+        if doc: doc.replace(data)
+        else:
+            with self.transaction() as tx: tx.write_json(fp, data)
+
+    def update_json(self, rel, fn):
+        """Read-modify-write: fn(data) edits a private copy in place."""
+        fp = self.path(rel)
+        doc = self._hot(fp)
+        if doc: doc.update(fn)
+        else:
+            with self.transaction() as tx: tx.update_json(fp, fn)
+
+    def merge_json(self, rel, delta):
+        """Shallow dict.update(); hot documents pass the delta on to live viewers."""
+        fp = self.path(rel)
+        doc = self._hot(fp)
+        if doc: doc.merge(delta)
+        else: self.update_json(fp, lambda data: data.update(delta))
+
+    def _commit(self, staged, appends=None):
+        cold = {fp: data for fp, data in staged.items() if not self._hot(fp)}
+        appends = appends or {}
+        files, grown, created = [], [], []
+        try:
+            for fp, data in cold.items():
+                os.makedirs(os.path.dirname(fp), exist_ok=True)
+                f = open(fp + ".tmp", "w")
+                files.append(f)
+                f.write(data if isinstance(data, _Text) else json.dumps(data, indent=2))
+                f.flush()
+            # Logs are appended in place (O_APPEND) and synced with the rest
+            for fp, lines in appends.items():
+                os.makedirs(os.path.dirname(fp), exist_ok=True)
+                if not os.path.exists(fp): created.append(fp)
+                f = open(fp, "a+b")
+                files.append(f)
+                size = f.seek(0, os.SEEK_END)
+                grown.append((f, size))
+                if size:
+                    f.seek(size - 1)
+                    if f.read(1) != b"\n": lines = ["\n"] + lines
+                f.write("".join(lines).encode())
+                f.flush()
+            self._sync(files)
+        except BaseException:
+            # Nothing is renamed yet: drop the temp files and cut the logs back to their old length
+            for f, size in grown:
+                try: f.truncate(size)
+                except OSError: pass
+            for f in files: f.close()
+            for fp in [fp + ".tmp" for fp in cold] + created:
+                try: os.remove(fp)
+                except OSError: pass
+            raise
+        for f in files: f.close()
+        for fp in cold: os.replace(fp + ".tmp", fp)
+        self._sync_dirs(list(cold) + created)
+        for fp, data in staged.items():
+            if fp not in cold: self._hot(fp).replace(data)
+        self.commits += 1
+        self.writes += len(cold) + len(appends)
+        for fp in list(cold) + list(appends): self._notify(fp)
+
+    def _sync(self, files):
+        # Every staged file is on disk before the first rename makes any of them visible
+        if not files: return
+        self.syncs += 1
+        for f in files: os.fsync(f.fileno())
+
+    @staticmethod
+    def _sync_dirs(paths):
+        # The renames themselves: each directory that received one is synced once
+        for d in sorted({os.path.dirname(fp) for fp in paths}):
+            try: fd = os.open(d, os.O_RDONLY)
+            except OSError: continue
+            try: os.fsync(fd)
+            except OSError: pass
+            finally: os.close(fd)
+
+    # --- changes ---
+
+    def subscribe(self, callback):
+        """callback(path, version) after a write through the store or an outside change."""
+        self._subscribers.append(callback)
+
+    def _notify(self, fp):
+        version = self.version(fp)
+        for cb in list(self._subscribers):
+            try: cb(fp, version)
+            except Exception as e: print(f"  ⚠ Workspace store subscriber error: {e}")
+
+    def on_changes(self, paths):
+        """FileWatcher callback for memory/; hot documents report through their own listeners."""
+        for fp in sorted(paths):
+            if fp.startswith(self.memory_dir + os.sep) and not self._hot(fp): self._notify(fp)
+
+    def stats(self):
+        return dict(self.cache.stats(), writes=self.writes, commits=self.commits, syncs=self.syncs,
+                    tracked=len(self._versions), subscribers=len(self._subscribers))
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def workspace_store(workspace, store=None):
+    """
+    The process-wide WorkspaceStore of a workspace, shared by core handlers and
+    plugin backends. The server registers its own (with hot documents) by
+    passing store; otherwise a plain one is created on first use.
+    """
+    key = os.path.abspath(workspace)
+    with _stores_lock:
+        if store is not None: _stores[key] = store
+        elif key not in _stores: _stores[key] = WorkspaceStore(key)
+        return _stores[key]
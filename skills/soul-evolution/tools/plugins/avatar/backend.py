@@ -1,5 +1,7 @@
 import json
 import os
+from core.http_utils import send_json
+from core.workspace_store import workspace_store
 
 def handle_request(handler, method, action, workspace):
     """
@@ -8,33 +10,20 @@ def handle_request(handler, method, action, workspace):
     """
     res_data = {"status": "error", "message": f"Avatar: Unknown action '{action}'"}
     reality_dir = os.path.join(workspace, "memory", "reality")
+    docs = workspace_store(workspace)
     
     if method == "GET":
         if action == "config":
-            p = os.path.join(reality_dir, "avatar_config.json")
-            res_data = load_json(p)
+            res_data = docs.read_json(os.path.join(reality_dir, "avatar_config.json"))
         elif action == "state":
-            p = os.path.join(reality_dir, "avatar_state.json")
-            res_data = load_json(p)
+            res_data = docs.read_json(os.path.join(reality_dir, "avatar_state.json"))
             
     elif method == "POST":
         length = int(handler.headers.get("Content-Length", 0))
         req = json.loads(handler.rfile.read(length).decode("utf-8"))
         
         if action == "update":
-            p = os.path.join(reality_dir, "avatar_state.json")
-            state = load_json(p)
-            state.update(req)
-            with open(p, "w") as f: json.dump(state, f, indent=2)
+            docs.merge_json(os.path.join(reality_dir, "avatar_state.json"), req)
             res_data = {"success": True}
 
-    handler.send_response(200)
-    handler.send_header("Content-Type", "application/json")
-    handler.end_headers()
-    handler.wfile.write(json.dumps(res_data).encode())
-
-def load_json(fp):
-    if not os.path.exists(fp): return {}
-    try:
-        with open(fp, "r") as f: return json.load(f)
-    except: return {}
+    send_json(handler, res_data)
@@ -121,17 +121,46 @@ function applyToMesh(bs) {
 
 const childIsFace = (c) => c.isMesh && c.material && (c.name.toLowerCase().includes('face') || c.name.toLowerCase().includes('head'));
 
+// Live state from /api/avatar/ws: a snapshot on connect, then coalesced deltas
+let avatarSocket = null;
+let avatarState = {};
+
+function connectAvatarSocket() {
+  const ws = new WebSocket(`${location.protocol === 'https:' ? 'wss' : 'ws'}://${location.host}/api/avatar/ws`);
+  ws.onmessage = (ev) => {
+    const msg = JSON.parse(ev.data);
+    avatarState = msg.type === 'snapshot' ? msg.data : { ...avatarState, ...msg.data };
+    applyState(avatarState);
+  };
+  ws.onopen = () => { avatarSocket = ws; };
+  ws.onclose = () => {
+    avatarSocket = null;
+    setTimeout(connectAvatarSocket, 3000);
+  };
+}
+
 function startPolling() {
-  setInterval(async () => {
+  connectAvatarSocket();
+  // Fallback while the socket is down: pushed over /api/stream, 1s poll if that is down too
+  watchDocument('reality/avatar_state.json', async (msg) => {
+    if (avatarSocket) return;
     try {
-      const res = await fetch('/api/plugins/avatar/state');
-      const state = await res.json();
-      if (state.action === 'expression') targetBlendShapes = { ...currentBlendShapes, ...state.blendShapes };
-      if (state.action === 'pose') applyPoseLocal(state.value);
+      const state = msg.data || await (await fetch('/api/plugins/avatar/state')).json();
+      applyState(state);
     } catch(e) {}
   }, 1000);
 }
 
+function sendUpdate(delta) {
+  if (avatarSocket) avatarSocket.send(JSON.stringify({ type: 'update', data: delta }));
+  else fetch('/api/plugins/avatar/update', { method: 'POST', body: JSON.stringify(delta) });
+}
+
+function applyState(state) {
+  if (state.action === 'expression') targetBlendShapes = { ...currentBlendShapes, ...state.blendShapes };
+  if (state.action === 'pose') applyPoseLocal(state.value);
+}
+
 function applyPoseLocal(pose) {
   if (!vrmModel) return;
   vrmModel.position.y = (pose === 'sitting') ? -0.3 : 0;
@@ -140,8 +169,8 @@ function applyPoseLocal(pose) {
 // Global API for the plugin
 window.AvatarPlugin = {
   init: initAvatar,
-  setEmote: (e) => fetch('/api/plugins/avatar/update', { method: 'POST', body: JSON.stringify({action: 'emote', value: e}) }),
-  setPose: (p) => fetch('/api/plugins/avatar/update', { method: 'POST', body: JSON.stringify({action: 'pose', value: p}) })
+  setEmote: (e) => sendUpdate({action: 'emote', value: e}),
+  setPose: (p) => sendUpdate({action: 'pose', value: p})
 };
 
 // Start if tab is already active
@@ -1,6 +1,8 @@
 import json
 import os
 import subprocess
+from core.http_utils import send_json
+from core.workspace_store import workspace_store
 
 def handle_request(handler, method, action, workspace):
     """
@@ -11,12 +13,13 @@ def handle_request(handler, method, action, workspace):
     reality_dir = os.path.join(workspace, "memory", "reality")
     model_config_path = os.path.join(reality_dir, "model_config.json")
     sim_config_path = os.path.join(reality_dir, "simulation_config.json")
+    docs = workspace_store(workspace)
     
     if method == "GET":
         if action == "all":
             res_data = {
-                "simulation": load_json(sim_config_path),
-                "models": load_json(model_config_path)
+                "simulation": docs.read_json(sim_config_path),
+                "models": dict(docs.read_json(model_config_path))
             }
             # Mask keys
             for k in ["api_key", "key_anthropic", "key_gemini", "key_xai", "key_minimax", "key_venice", "key_fal", "key_gemini_img"]:
@@ -37,26 +40,16 @@ def handle_request(handler, method, action, workspace):
         req = json.loads(handler.rfile.read(length).decode("utf-8"))
         
         if action == "save":
-            # 1. Save Models
-            if "models" in req:
-                conf = load_json(model_config_path)
-                for k, v in req["models"].items():
-                    if v != "****": conf[k] = v
-                with open(model_config_path, "w") as f: json.dump(conf, f, indent=2)
-            
-            # 2. Save Simulation
-            if "simulation" in req:
-                with open(sim_config_path, "w") as f: json.dump(req["simulation"], f, indent=2)
+            # Both documents land together, with one sync
+            with docs.transaction() as tx:
+                # 1. Save Models
+                if "models" in req:
+                    tx.update_json(model_config_path, lambda conf: conf.update({k: v for k, v in req["models"].items() if v != "****"}))
+
+                # 2. Save Simulation
+                if "simulation" in req:
+                    tx.write_json(sim_config_path, req["simulation"])
             
             res_data = {"success": True}
 
-    handler.send_response(200)
-    handler.send_header("Content-Type", "application/json")
-    handler.end_headers()
-    handler.wfile.write(json.dumps(res_data).encode())
-
-def load_json(fp):
-    if not os.path.exists(fp): return {}
-    try:
-        with open(fp, "r") as f: return json.load(f)
-    except: return {}
+    send_json(handler, res_data)
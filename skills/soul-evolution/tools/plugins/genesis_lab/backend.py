@@ -1,19 +1,21 @@
 import json
 import os
+from core.http_utils import send_json
+from core.workspace_store import workspace_store
 
 def handle_request(handler, method, action, workspace):
     """
     Plugin Backend Handler for 'genesis_lab'
     """
     reality_dir = os.path.join(workspace, "memory", "reality")
+    docs = workspace_store(workspace)
     res_data = {"status": "error", "message": f"GenesisLab: Unknown action '{action}'"}
     
     print(f"[PLUGIN:genesis_lab] {method} {action}")
 
     if method == "GET":
         if action == "status":
-            p = os.path.join(reality_dir, "simulation_config.json")
-            cfg = load_json(p)
+            cfg = docs.read_json(os.path.join(reality_dir, "simulation_config.json"))
             res_data = {"setup_complete": cfg.get("wizard_completed", False)}
             
     elif method == "POST":
@@ -21,24 +23,11 @@ def handle_request(handler, method, action, workspace):
         req = json.loads(handler.rfile.read(length).decode("utf-8"))
         
         if action == "request":
-            r_path = os.path.join(reality_dir, "genesis_request.json")
-            with open(r_path, "w") as f: json.dump(req, f, indent=2)
+            docs.write_json(os.path.join(reality_dir, "genesis_request.json"), req)
             res_data = {"success": True}
         
         elif action == "complete":
-            p = os.path.join(reality_dir, "simulation_config.json")
-            conf = load_json(p)
-            conf["wizard_completed"] = True
-            with open(p, "w") as f: json.dump(conf, f, indent=2)
+            docs.update_json(os.path.join(reality_dir, "simulation_config.json"), lambda conf: conf.update(wizard_completed=True))
             res_data = {"success": True}
 
-    handler.send_response(200)
-    handler.send_header("Content-Type", "application/json")
-    handler.end_headers()
-    handler.wfile.write(json.dumps(res_data).encode())
-
-def load_json(fp):
-    if not os.path.exists(fp): return {}
-    try:
-        with open(fp, "r") as f: return json.load(f)
-    except: return {}
+    send_json(handler, res_data)
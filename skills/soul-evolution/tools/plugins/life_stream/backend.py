@@ -3,6 +3,8 @@ import os
 import glob
 import base64
 from datetime import datetime
+from core.http_utils import send_json
+from core.workspace_store import workspace_store
 
 def handle_request(handler, method, action, workspace):
     """
@@ -16,7 +18,7 @@ def handle_request(handler, method, action, workspace):
 
     if method == "GET":
         if action == "state":
-            res_data = load_json(os.path.join(reality_dir, "presence_state.json"))
+            res_data = workspace_store(workspace).read_json(os.path.join(reality_dir, "presence_state.json"))
         elif action == "photos":
             photos = [os.path.basename(f) for f in glob.glob(os.path.join(photo_dir, "*.png"))]
             res_data = {"photos": sorted(photos, reverse=True)}
@@ -41,13 +43,4 @@ def handle_request(handler, method, action, workspace):
                 os.remove(full_p)
                 res_data = {"success": True}
 
-    handler.send_response(200)
-    handler.send_header("Content-Type", "application/json")
-    handler.end_headers()
-    handler.wfile.write(json.dumps(res_data).encode())
-
-def load_json(fp):
-    if not os.path.exists(fp): return {}
-    try:
-        with open(fp, "r") as f: return json.load(f)
-    except: return {}
+    send_json(handler, res_data)
@@ -29,12 +29,16 @@ async function initLifeStream() {
 
   loadPresence();
   loadPhotos();
-  setInterval(loadPresence, 10000);
+  watchDocument('reality/presence_state.json', msg => msg.data ? renderPresence(msg.data) : loadPresence());
+  GenesisStream.on('reality/photos/', loadPhotos);
 }
 
 async function loadPresence() {
   const resp = await fetch('/api/plugins/life_stream/state');
-  const state = await resp.json();
+  renderPresence(await resp.json());
+}
+
+function renderPresence(state) {
   const info = document.getElementById('presence-info');
   const feed = document.getElementById('social-feed-plugin');
   
@@ -64,7 +68,7 @@ async function loadPhotos() {
   if (grid) {
     grid.innerHTML = (data.photos || []).map(p => `
       <div class="photo-item">
-        <img src="/media/photos/${p}" onclick="window.LifeStreamPlugin.openPhoto('${p}')">
+        <img src="/media/thumbs/256/${p}" loading="lazy" onclick="window.LifeStreamPlugin.openPhoto('${p}')">
       </div>
     `).join('') || 'No photos captured.';
   }
@@ -1,12 +1,15 @@
 import json
 import os
 from datetime import datetime
+from core.http_utils import send_json
+from core.workspace_store import workspace_store
 
 def handle_request(handler, method, action, workspace):
     """
     Plugin Backend Handler for 'social_psych'
     """
     reality_dir = os.path.join(workspace, "memory", "reality")
+    docs = workspace_store(workspace)
     res_data = {"status": "error", "message": f"SocialPsych: Unknown action '{action}'"}
     
     print(f"[PLUGIN:social_psych] {method} {action}")
@@ -18,41 +21,30 @@ def handle_request(handler, method, action, workspace):
             "entities": "social.json"
         }
         if action in file_map:
-            res_data = load_json(os.path.join(reality_dir, file_map[action]))
+            res_data = docs.read_json(os.path.join(reality_dir, file_map[action]))
             
     elif method == "POST":
         length = int(handler.headers.get("Content-Length", 0))
         req = json.loads(handler.rfile.read(length).decode("utf-8"))
         
         if action == "add-entity":
-            s_path = os.path.join(reality_dir, "social.json")
-            social = load_json(s_path)
-            if "entities" not in social: social["entities"] = []
-            req["id"] = f"npc_{len(social['entities']) + 1}"
-            req["bond"] = req.get("bond", 0)
-            social["entities"].append(req)
-            with open(s_path, "w") as f: json.dump(social, f, indent=2)
+            def add(social):
+                entities = social.setdefault("entities", [])
+                req["id"] = f"npc_{len(entities) + 1}"
+                req["bond"] = req.get("bond", 0)
+                entities.append(req)
+            docs.update_json(os.path.join(reality_dir, "social.json"), add)
             res_data = {"success": True, "id": req["id"]}
             print(f"[PLUGIN:social_psych] Added entity: {req.get('name')}")
 
         elif action == "update-entity":
-            s_path = os.path.join(reality_dir, "social.json")
-            social = load_json(s_path)
             entity_id = req.get("entity_id")
-            for ent in social.get("entities", []):
-                if ent.get("id") == entity_id:
-                    ent.update(req)
-                    break
-            with open(s_path, "w") as f: json.dump(social, f, indent=2)
+            def apply(social):
+                for ent in social.get("entities", []):
+                    if ent.get("id") == entity_id:
+                        ent.update(req)
+                        break
+            docs.update_json(os.path.join(reality_dir, "social.json"), apply)
             res_data = {"success": True}
 
-    handler.send_response(200)
-    handler.send_header("Content-Type", "application/json")
-    handler.end_headers()
-    handler.wfile.write(json.dumps(res_data).encode())
-
-def load_json(fp):
-    if not os.path.exists(fp): return {}
-    try:
-        with open(fp, "r") as f: return json.load(f)
-    except: return {}
+    send_json(handler, res_data)
@@ -1,5 +1,7 @@
 import json
 import os
+from core.http_utils import send_json
+from core.workspace_store import workspace_store
 
 def handle_request(handler, method, action, workspace):
     """
@@ -7,6 +9,7 @@ def handle_request(handler, method, action, workspace):
     Route: /api/plugins/spatial/[action]
     """
     reality_dir = os.path.join(workspace, "memory", "reality")
+    docs = workspace_store(workspace)
     res_data = {"status": "error", "message": f"Spatial: Unknown action '{action}'"}
     
     print(f"[PLUGIN:spatial] Handling {method} request for {action}")
@@ -18,7 +21,7 @@ def handle_request(handler, method, action, workspace):
             "wardrobe": "wardrobe.json"
         }
         if action in file_map:
-            res_data = load_json(os.path.join(reality_dir, file_map[action]))
+            res_data = docs.read_json(os.path.join(reality_dir, file_map[action]))
             
     elif method == "POST":
         length = int(handler.headers.get("Content-Length", 0))
@@ -31,19 +34,8 @@ def handle_request(handler, method, action, workspace):
         }
         
         if action in file_map:
-            p = os.path.join(reality_dir, file_map[action])
-            with open(p, "w") as f:
-                json.dump(req, f, indent=2)
+            docs.write_json(os.path.join(reality_dir, file_map[action]), req)
             res_data = {"success": True}
             print(f"[PLUGIN:spatial] Successfully updated {file_map[action]}")
 
-    handler.send_response(200)
-    handler.send_header("Content-Type", "application/json")
-    handler.end_headers()
-    handler.wfile.write(json.dumps(res_data).encode())
-
-def load_json(fp):
-    if not os.path.exists(fp): return {}
-    try:
-        with open(fp, "r") as f: return json.load(f)
-    except: return {}
+    send_json(handler, res_data)
@@ -1,6 +1,7 @@
 import json
 import os
 import subprocess
+from core.http_utils import send_json
 
 def handle_request(handler, method, action, workspace):
     """
@@ -32,7 +33,4 @@ def handle_request(handler, method, action, workspace):
                 res_data = {"success": False, "error": str(e)}
 
     # Send Response
-    handler.send_response(200)
-    handler.send_header("Content-Type", "application/json")
-    handler.end_headers()
-    handler.wfile.write(json.dumps(res_data).encode())
+    send_json(handler, res_data)
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock
 
 # Path setup to import the plugin
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from vault import backend
 
 def test_vault_get_status():
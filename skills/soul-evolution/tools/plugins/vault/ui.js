@@ -34,7 +34,12 @@ async function loadVaultData() {
 function startEconomyPolling() {
   if (window._economyPolling) clearInterval(window._economyPolling);
   loadVaultData();
-  window._economyPolling = setInterval(loadVaultData, 10000);
+  // The bridge rewrites vault_state.json after every trade; refetch only then
+  if (!window._economyWatched) {
+    window._economyWatched = true;
+    GenesisStream.on('reality/vault_state.json', loadVaultData);
+  }
+  window._economyPolling = setInterval(() => { if (!GenesisStream.live) loadVaultData(); }, 10000);
 }
 
 window.loadVaultData = loadVaultData;
@@ -7,14 +7,35 @@ Plugin architecture enabled.
 """
 
 import json
+import signal
 import sys
 import os
+import hashlib
 import http.server
-import socketserver
-from api.data_utils import collect_data
-from api.handlers_get import handle_get_request
-from api.handlers_post import handle_post_request, handle_legacy_post
+import io
+import time
+from contextlib import nullcontext
+from urllib.parse import parse_qs, unquote, urlparse
+from api.data_utils import SECTIONS, bootstrap_fragment, data_version, fragment_stats, record_index, section_fragment, use_store
+from api.handlers_get import register_get_routes
+from api.handlers_post import register_post_routes
 from core.plugin_manager import PluginManager
+from core.router import Router
+from core.metrics import RequestMetrics
+from core.profiling import RequestProfiler
+from core.server import KEEPALIVE_TIMEOUT, PooledHTTPServer, SingleThreadedHTTPServer, ServerBusy, SingleFlight
+from core.http_utils import discard_body, is_not_modified, send_body, send_empty, send_json, send_not_modified
+from core.compression import StaticAssetCache
+from core.static_files import serve_file
+from core.thumbnails import ThumbnailCache
+from core.fs_watch import FileWatcher
+from core.event_stream import EventStream
+from core.hot_documents import HotDocuments
+from core.log_store import log_store
+from core.telemetry_ring import vitals_telemetry
+from core.workspace_store import WorkspaceStore
+from core.state_channel import StateChannel
+from core.websocket import handshake
 
 # --- HTML GENERATION ---
 
@@ -22,27 +43,35 @@ class DashboardTemplate:
     def __init__(self, template_path):
         self.template_path = template_path
         self.last_mtime = 0
-        self.content = ""
+        self.head, self.tail = b"", b""
 
-    def render(self, data, plugins_manifest):
-        # Inject data and plugin list into the template
-        data["active_plugins"] = plugins_manifest
-        data_json = json.dumps(data, indent=None, default=str)
-        
+    def render(self, bootstrap_json, plugins_manifest):
+        # Splice the pre-serialized bootstrap object and the plugin list into the template
         if not os.path.exists(self.template_path):
-            return f"Template not found at {self.template_path}"
-        
+            return f"Template not found at {self.template_path}".encode()
+
         mtime = os.path.getmtime(self.template_path)
         if mtime > self.last_mtime:
             with open(self.template_path, "r") as f:
-                self.content = f.read()
+                head, _, tail = f.read().partition("{data_json}")
+            self.head, self.tail = head.encode(), tail.encode()
             self.last_mtime = mtime
-            
-        return self.content.replace("{data_json}", data_json)
+
+        plugins_json = json.dumps(plugins_manifest, default=str).encode()
+        return b"".join((self.head, bootstrap_json[:-1], b', "active_plugins": ', plugins_json, b"}", self.tail))
+
+    def etag(self, workspace, plugins_manifest):
+        # Validator for the rendered page that needs only stat() calls, no render
+        h = hashlib.blake2b(digest_size=12)
+        h.update(data_version(workspace).encode())
+        h.update(repr(os.path.getmtime(self.template_path) if os.path.exists(self.template_path) else 0).encode())
+        h.update(json.dumps(plugins_manifest, sort_keys=True, default=str).encode())
+        return '"' + h.hexdigest() + '"'
 
 # --- SERVER IMPLEMENTATION ---
 
 def main():
+    boot_started = time.perf_counter()
     print("--- PROJECT GENESIS DASHBOARD v6.0.0 (PLUGIN ENGINE) STARTING ---", flush=True)
     workspace = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
     port = 8080
@@ -50,100 +79,333 @@ def main():
         idx = sys.argv.index("--serve")
         if idx + 1 < len(sys.argv) and sys.argv[idx + 1].isdigit():
             port = int(sys.argv[idx + 1])
+    workers = 16
+    if "--workers" in sys.argv:
+        idx = sys.argv.index("--workers")
+        if idx + 1 < len(sys.argv) and sys.argv[idx + 1].isdigit():
+            workers = max(1, int(sys.argv[idx + 1]))
 
     web_base = os.path.abspath(os.path.join(os.path.dirname(__file__), "web"))
     plugins_dir = os.path.join(os.path.dirname(__file__), "plugins")
     template_path = os.path.join(web_base, "index.html")
     
+    # Shared document access for handlers and plugins; hot reality documents
+    # live in memory and are written behind (flushed again at shutdown)
+    memory_dir = os.path.join(workspace, "memory")
+    hot_docs = HotDocuments(os.path.join(memory_dir, "reality"))
+    store = WorkspaceStore(workspace, hot_docs)
+    use_store(store)
+
     # Initialize Plugin System
-    plugin_manager = PluginManager(workspace, plugins_dir)
+    plugin_manager = PluginManager(workspace, plugins_dir, store)
     dashboard_tpl = DashboardTemplate(template_path)
+    static_cache = StaticAssetCache([web_base, plugins_dir])
+    photo_dir = os.path.join(workspace, "memory", "reality", "photos")
+    thumbnails = ThumbnailCache(photo_dir, os.path.join(workspace, "memory", "cache", "thumbs"))
+    if not thumbnails.available:
+        print("  ⚠ Pillow not installed: /media/thumbs/ serves original photos")
+    print(f"  ✓ Precompressed {static_cache.warm()} static assets")
+
+    # Live Updates: memory/ changes are pushed to /api/stream clients
+    single_thread = "--single-thread" in sys.argv
+    event_stream = EventStream(memory_dir)
+    fs_watcher = FileWatcher(memory_dir)
+    # genesis_debug.jsonl is rotated into compressed, level-indexed segments under memory/logs/;
+    # nothing is deleted and the TS logger's archives stay put unless asked for
+    keep_days = None
+    if "--log-retention-days" in sys.argv:
+        idx = sys.argv.index("--log-retention-days")
+        if idx + 1 < len(sys.argv) and sys.argv[idx + 1].isdigit():
+            keep_days = int(sys.argv[idx + 1])
+    debug_log = log_store(memory_dir, keep_days=keep_days, adopt_archives="--adopt-log-archives" in sys.argv)
+    fs_watcher.subscribe(event_stream.on_changes)
+    fs_watcher.subscribe(hot_docs.on_changes)
+    fs_watcher.subscribe(store.on_changes)
+    # Each SSE client pins a connection worker, so keep half the pool for everything else
+    max_stream_clients = 0 if single_thread else max(1, workers // 2)
+
+    # Avatar deltas, coalesced to viewers over /api/avatar/ws; sessions pin a worker,
+    # so the serial server has none
+    avatar_channel = None
+    if not single_thread:
+        avatar_channel = StateChannel(hot_docs.get("avatar_state.json"), max_viewers=max(1, workers // 4))
 
     class SoulEvolutionHandler(http.server.SimpleHTTPRequestHandler):
-        def do_HEAD(self): self.do_GET()
-
-        def do_GET(self):
-            # 1. Static Web Assets
-            if self.path.startswith("/web/"):
-                rel = self.path[len("/web/"):]
-                f_path = os.path.join(web_base, rel)
-                if os.path.isfile(f_path):
-                    self.serve_file(f_path)
-                    return
-            
-            # 2. Plugin Assets (CSS/JS from plugin folders)
-            if self.path.startswith("/plugins/"):
-                rel = self.path[len("/plugins/"):]
-                f_path = os.path.join(plugins_dir, rel)
-                if os.path.isfile(f_path):
-                    self.serve_file(f_path)
-                    return
-
-            # 3. Reality Media
-            if self.path.startswith("/media/"):
-                rel = self.path[len("/media/"):]
-                f_path = os.path.join(workspace, "memory", "reality", rel)
-                if os.path.isfile(f_path):
-                    self.serve_file(f_path)
-                    return
-
-            # 4. Application Pages
-            if self.path == "/" or self.path == "/soul-evolution.html":
-                data = collect_data(workspace)
+        # Keep-alive lets the dashboard's many small API calls share connections.
+        # The serial server stays on HTTP/1.0 so one idle browser can't hold it.
+        protocol_version = "HTTP/1.0" if single_thread else "HTTP/1.1"
+        # Idle kept-alive connections give their pool worker back after this many seconds
+        timeout = KEEPALIVE_TIMEOUT
+        # Headers and body go out in separate writes; without this, Nagle plus the
+        # client's delayed ACK stalls every kept-alive response by ~40ms
+        disable_nagle_algorithm = True
+
+        def do_HEAD(self): self.dispatch()
+        def do_GET(self): self.dispatch()
+        def do_POST(self): self.dispatch()
+
+        def send_response(self, code, message=None):
+            self.status_sent = code
+            super().send_response(code, message)
+
+        def send_header(self, keyword, value):
+            if keyword == "Content-Length": self.bytes_sent = int(value)
+            super().send_header(keyword, value)
+
+        def dispatch(self):
+            # One registry lookup per request; the route carries its own admission class
+            route, rest, allowed = router.resolve(self.command, urlparse(self.path).path)
+            if route is None:
+                discard_body(self)
+                if allowed:
+                    send_empty(self, 405, {"Allow": ", ".join(allowed)})
+                else:
+                    self.send_error(404)
+                return
+            if route.meta.get("stream"):
+                route.handler(self, rest)
+                return
+            self.status_sent, self.bytes_sent = 500, 0
+            start = time.perf_counter()
+            try:
+                if route.meta.get("coalesce") and self.command in ("GET", "HEAD"):
+                    self.serve_coalesced(route, rest)
+                else:
+                    self.run_route(route, rest)
+            except ServerBusy as e:
+                discard_body(self)
+                send_json(self, {"status": "error", "message": str(e)}, status=503, headers={"Retry-After": str(e.retry_after)})
+            finally:
+                if self.command == "HEAD": self.bytes_sent = 0
+                metrics.record(f"{self.command} {route.path}", (time.perf_counter() - start) * 1000,
+                               self.status_sent, self.bytes_sent, route.meta.get("plugin"))
+
+        def run_route(self, route, rest):
+            # Endpoint limit first, so a saturated endpoint never holds a class slot while it waits
+            limit = route.meta.get("max_inflight")
+            endpoint = self.server.endpoint_slot(route.meta.get("limit_key", route.path), limit) if limit else nullcontext()
+            with endpoint, self.server.admission(self.command, route.meta.get("concurrency")):
+                if profiler.wanted(self):
+                    name = profiler.run(self.command, route.path, lambda: route.handler(self, rest))
+                    print(f"  ✓ Profiled {self.command} {self.path} -> {name or 'skipped (profiler busy)'}")
+                else:
+                    route.handler(self, rest)
+
+        def serve_coalesced(self, route, rest):
+            # Identical GETs in flight share one run and its response bytes. Validators and
+            # Accept-Encoding are part of the key, so nobody receives a 304 or encoding they didn't ask for.
+            key = (self.command, self.path, self.headers.get("If-None-Match"), self.headers.get("Accept-Encoding"))
+            raw, self.status_sent, self.bytes_sent = coalescer.do(key, lambda: self.capture(route, rest))
+            self.wfile.write(raw)
+
+        def capture(self, route, rest):
+            real, self.wfile = self.wfile, io.BytesIO()
+            try:
+                self.run_route(route, rest)
+            finally:
+                buf, self.wfile = self.wfile, real
+            return buf.getvalue(), self.status_sent, self.bytes_sent
+
+        def serve_under(self, base, rel):
+            # Static roots only ever serve files inside their own directory
+            f_path = os.path.realpath(os.path.join(base, unquote(rel)))
+            if f_path.startswith(os.path.realpath(base) + os.sep) and os.path.isfile(f_path):
+                self.serve_file(f_path)
+            else:
+                self.send_error(404)
+
+        def serve_profile(self, name):
+            # Only dumps the profiler itself lists, never other files of the directory
+            fp = profiler.dump_path(unquote(name))
+            if fp: self.serve_file(fp)
+            else: self.send_error(404)
+
+        def serve_page(self):
+            manifests = plugin_manager.get_manifests()
+            etag = dashboard_tpl.etag(workspace, manifests)
+            if is_not_modified(self, etag):
+                send_not_modified(self, etag)
+                return
+            if self.command == "HEAD":
                 self.send_response(200)
                 self.send_header("Content-Type", "text/html")
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
                 self.end_headers()
-                self.wfile.write(dashboard_tpl.render(data, plugin_manager.get_manifests()).encode())
                 return
-            
-            # 5. API Endpoints (Plugins First, then Core)
-            if self.path.startswith("/api/plugins/"):
-                if plugin_manager.handle_api(self, "GET"):
-                    return
-
-            if self.path.startswith("/api/"):
-                if self.path == "/api/core/plugins":
-                    self.send_response(200)
-                    self.send_header("Content-Type", "application/json")
-                    self.end_headers()
-                    self.wfile.write(json.dumps(plugin_manager.get_manifests()).encode())
-                    return
-                handle_get_request(self, workspace)
+            html = dashboard_tpl.render(bootstrap_fragment(workspace), manifests)
+            send_body(self, html, "text/html", etag=etag)
+
+        def serve_plugin_status(self):
+            # Manifests as before, each with its load and hot-reload state
+            stats = plugin_manager.stats()
+            send_json(self, [dict(m, status=stats.get(m["id"])) for m in plugin_manager.get_manifests()])
+
+        def serve_server_stats(self):
+            send_json(self, dict(self.server.stats(), static_cache=static_cache.stats(), fragments=fragment_stats(), thumbnails=thumbnails.stats(),
+                                 stream=dict(event_stream.stats(), watcher=fs_watcher.backend), coalescing=coalescer.stats(),
+                                 avatar_channel=avatar_channel.stats() if avatar_channel else None, hot_documents=hot_docs.stats(),
+                                 store=store.stats(), records=record_index(workspace).stats(), logs=debug_log.stats(),
+                                 vitals=vitals_telemetry(os.path.join(memory_dir, "telemetry")).stats(),
+                                 startup_ms=startup_ms, plugins=plugin_manager.stats()))
+
+        def serve_thumbnail(self, rel):
+            # /media/thumbs/<size>/<name>: resized derivative, WebP when the browser takes it
+            size, _, name = rel.partition("/")
+            src = thumbnails.source_path(name)
+            if not size.isdigit() or not src:
+                self.send_error(404)
+                return
+            if not thumbnails.available:
+                self.serve_file(src)
                 return
+            fmt = "webp" if "image/webp" in (self.headers.get("Accept") or "") else "jpeg"
+            try:
+                thumb = thumbnails.get(name, int(size), fmt)
+            except Exception as e:
+                print(f"  ⚠ Thumbnail failed for {name}: {e}")
+                thumb = None
+            if not thumb:
+                self.send_error(404)
+                return
+            self.serve_file(thumb, negotiated=fmt)
 
-            self.send_error(404)
+        def serve_section(self, name):
+            # Per-tab payloads split out of the page
+            if name not in SECTIONS:
+                send_json(self, {"status": "error", "message": f"Unknown section '{name}'"}, status=404)
+                return
+            # Cached bytes are reused until a source file changes; send_body answers 304 itself
+            version, body = section_fragment(workspace, name)
+            send_body(self, body, "application/json", etag='"' + version + '"')
 
-        def do_POST(self):
-            # API POST (Plugins First)
-            if self.path.startswith("/api/plugins/"):
-                if plugin_manager.handle_api(self, "POST"):
-                    return
+        def serve_stream(self):
+            # Server-Sent Events: one long-lived response per dashboard tab
+            query = parse_qs(urlparse(self.path).query)
+            docs = [d for d in query.get("docs", [""])[0].split(",") if d]
+            resume = self.headers.get("Last-Event-ID") or query.get("last_id", [""])[0]
+            last_id = int(resume) if resume.isdigit() else event_stream.last_id
 
-            if self.path.startswith("/api/"):
-                handle_post_request(self, workspace)
+            if not event_stream.add_client(max_stream_clients):
+                send_empty(self, 503, {"Retry-After": "30"})
                 return
-            
-            handle_legacy_post(self, workspace)
-
-        def serve_file(self, path):
-            ext = os.path.splitext(path)[1].lower()
-            ct = {
-                ".html":"text/html", ".css":"text/css", ".js":"application/javascript",
-                ".png":"image/png", ".jpg":"image/jpeg", ".jpeg":"image/jpeg", ".svg":"image/svg+xml"
-            }.get(ext, "application/octet-stream")
+
             try:
-                with open(path, "rb") as f: data = f.read()
+                # No Content-Length: the stream ends when the connection does
+                self.close_connection = True
                 self.send_response(200)
-                self.send_header("Content-Type", ct)
-                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
                 self.end_headers()
-                self.wfile.write(data)
-            except: self.send_error(404)
+                self.wfile.write(b"retry: 3000\n\n")
+                self.wfile.flush()
+                while True:
+                    events, reset = event_stream.since(last_id)
+                    if reset:
+                        last_id = events[-1][0] if events else event_stream.last_id
+                        self.wfile.write(f"id: {last_id}\nevent: reset\ndata: {{}}\n\n".encode())
+                        events = []
+                    for ev_id, event, payload in events:
+                        last_id = ev_id
+                        if docs and not any(payload["doc"].startswith(d) for d in docs): continue
+                        self.wfile.write(f"id: {ev_id}\nevent: {event}\ndata: {json.dumps(payload)}\n\n".encode())
+                    if not events and not reset:
+                        self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                pass
+            finally:
+                event_stream.remove_client()
+
+        def serve_avatar_socket(self):
+            # WebSocket upgrade; the session holds this connection worker until it closes
+            if not avatar_channel:
+                send_empty(self, 503, {"Retry-After": "30"})
+                return
+            ws = handshake(self)
+            if ws: avatar_channel.serve(ws)
+            self.close_connection = True
+
+        def serve_file(self, path, negotiated=None):
+            serve_file(self, path, static_cache, negotiated=negotiated)
+
+    def publish_plugin_reloads(results):
+        # Open dashboards learn about swapped plugins over /api/stream
+        for plugin_id, outcome in results.items():
+            if outcome: event_stream.publish("plugin", {"doc": f"plugins/{plugin_id}", "result": outcome})
+
+    # Backpressure: identical in-flight GETs on coalescing routes share one bridge call
+    coalescer = SingleFlight()
+
+    # Request Metrics: per-route and per-plugin counters and latency histograms
+    metrics = RequestMetrics()
+
+    # Opt-in cProfile capture of single requests (see core/profiling.py)
+    # Dumps live under cache/: memory/profiles/ holds character profiles
+    profiler = RequestProfiler(os.path.join(workspace, "memory", "cache", "profiles"), enabled="--allow-profiling" in sys.argv)
+    if profiler.enabled:
+        print("  ⚠ Request profiling enabled (X-Genesis-Profile: 1 or ?__profile=1)")
+
+    # Routing Table: built once, resolved with a single lookup per request
+    router = Router()
+    media_dir = os.path.join(workspace, "memory", "reality")
+    router.add("/web/", lambda h, rest: h.serve_under(web_base, rest), prefix=True, endpoint="static")
+    router.add("/plugins/", lambda h, rest: h.serve_under(plugins_dir, rest), prefix=True, endpoint="plugin_assets")
+    router.add("/media/thumbs/", lambda h, rest: h.serve_thumbnail(rest), prefix=True, endpoint="thumbnail")
+    router.add("/media/", lambda h, rest: h.serve_under(media_dir, rest), prefix=True, endpoint="media")
+    router.add("/", lambda h, rest: h.serve_page(), endpoint="page")
+    router.add("/soul-evolution.html", lambda h, rest: h.serve_page(), endpoint="page")
+    router.add("/api/stream", lambda h, rest: h.serve_stream(), endpoint="stream", stream=True)
+    router.add("/api/avatar/ws", lambda h, rest: h.serve_avatar_socket(), endpoint="avatar_socket", stream=True)
+    router.add("/api/core/plugins", lambda h, rest: h.serve_plugin_status(), endpoint="plugins")
+    router.add("/api/core/sections/", lambda h, rest: h.serve_section(rest), prefix=True, endpoint="section")
+    router.add("/api/core/server", lambda h, rest: h.serve_server_stats(), endpoint="server_stats")
+    router.add("/api/core/routes", lambda h, rest: send_json(h, router.describe()), endpoint="routes")
+    router.add("/api/core/metrics", lambda h, rest: send_json(h, metrics.snapshot()), endpoint="metrics")
+    if profiler.enabled:
+        router.add("/api/core/profiles", lambda h, rest: send_json(h, profiler.list()), endpoint="profiles")
+        router.add("/api/core/profiles/", lambda h, rest: h.serve_profile(rest), prefix=True, endpoint="profile_download")
+    plugin_manager.register_routes(router)
+    register_get_routes(router, workspace)
+    register_post_routes(router, workspace)
+    print(f"  ✓ Routing table compiled ({len(router.describe())} routes)")
+
+    if single_thread:
+        httpd = SingleThreadedHTTPServer(("", port), SoulEvolutionHandler)
+    else:
+        httpd = PooledHTTPServer(("", port), SoulEvolutionHandler, connection_workers=workers)
+
+    # Hot reload: plugin manifest/backend edits are swapped in without a restart
+    plugin_watcher = None
+    if "--no-plugin-reload" not in sys.argv:
+        plugin_watcher = FileWatcher(plugins_dir)
+        plugin_watcher.subscribe(lambda paths: publish_plugin_reloads(plugin_manager.on_changes(paths)))
+        plugin_watcher.start()
+        print(f"  ✓ Plugin hot reload active ({plugin_watcher.backend})")
+
+    if max_stream_clients:
+        fs_watcher.start()
+        print(f"  ✓ Live update stream active ({fs_watcher.backend})")
+    debug_log.start()
+    if avatar_channel:
+        print(f"  ✓ Avatar channel at /api/avatar/ws (max {avatar_channel.max_viewers} viewers, {avatar_channel.stats()['max_hz']} Hz)")
+
+    startup_ms = round((time.perf_counter() - boot_started) * 1000, 1)
+    # Backends import lazily on first request; warm them now that the socket is bound
+    if "--no-plugin-warmup" not in sys.argv:
+        plugin_manager.warm()
 
-    socketserver.TCPServer.allow_reuse_address = True
-    with socketserver.TCPServer(("", port), SoulEvolutionHandler) as httpd:
-        print(f"Server active at http://localhost:{port}")
-        httpd.serve_forever()
+    with httpd:
+        print(f"Server active at http://localhost:{port} ({httpd.stats()['mode']}, listening after {startup_ms} ms)")
+        # SIGTERM unwinds like Ctrl+C so pending hot documents still reach the disk
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            hot_docs.flush_all()
 
 if __name__ == "__main__":
     main()
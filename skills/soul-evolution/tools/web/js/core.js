@@ -42,9 +42,75 @@ function showToast(msg, type = 'info') {
   setTimeout(() => t.remove(), 3000);
 }
 
+// --- LIVE UPDATES (SSE) ---
+// Panels subscribe to workspace documents (paths relative to memory/) instead of polling.
+// A key ending in '/' matches every document below that directory.
+
+const GenesisStream = {
+  source: null,
+  handlers: {},
+
+  connect() {
+    if (this.source || !window.EventSource) return;
+    this.source = new EventSource('/api/stream');
+    ['document', 'append', 'file'].forEach(type => {
+      this.source.addEventListener(type, ev => this.dispatch(JSON.parse(ev.data)));
+    });
+    // Missed events (backlog overflow or server restart): everyone refetches
+    this.source.addEventListener('reset', () => this.dispatch({ doc: '*', reset: true }));
+  },
+
+  on(doc, cb) {
+    (this.handlers[doc] = this.handlers[doc] || []).push(cb);
+    this.connect();
+  },
+
+  dispatch(msg) {
+    Object.entries(this.handlers).forEach(([key, cbs]) => {
+      const match = msg.doc === '*' || key === msg.doc || (key.endsWith('/') && msg.doc.startsWith(key));
+      if (match) cbs.forEach(cb => { try { cb(msg); } catch (e) { console.error('Stream handler error:', e); } });
+    });
+  },
+
+  get live() { return !!this.source && this.source.readyState === EventSource.OPEN; }
+};
+
+// Runs fn on every change of doc, and every intervalMs while the stream is down
+function watchDocument(doc, fn, intervalMs = 10000) {
+  GenesisStream.on(doc, fn);
+  return setInterval(() => { if (!GenesisStream.live) fn({ doc, poll: true }); }, intervalMs);
+}
+
+// --- LAZY SECTIONS ---
+// The page only inlines a bootstrap payload (soul tree, vitals, counts).
+// Everything else is fetched per section when a panel first needs it.
+
+const sectionRequests = {};
+
+function loadSection(name) {
+  if (!sectionRequests[name]) {
+    sectionRequests[name] = fetch(`/api/core/sections/${name}`)
+      .then(r => r.json())
+      .then(value => (DATA[name] = value))
+      .catch(e => { delete sectionRequests[name]; throw e; });
+  }
+  return sectionRequests[name];
+}
+
+function invalidateSection(name) {
+  delete sectionRequests[name];
+}
+
 // --- MAIN DASHBOARD RENDERERS ---
 
 function initDashboard() {
+  if (!window._vitalsWatch) {
+    window._vitalsWatch = true;
+    GenesisStream.on('reality/physique.json', msg => {
+      if (msg.data) { DATA.physique = msg.data; renderVitals(); }
+    });
+    GenesisStream.on('experiences/', () => { invalidateSection('experiences'); renderFeed(); });
+  }
   renderAgentName();
   renderStats();
   renderSoulTree();
@@ -67,8 +133,8 @@ function renderStats() {
   const bar = document.getElementById('stats-bar');
   if (!bar) return;
   const stats = [
-    { num: DATA.experiences?.length || 0, label: 'Experiences' },
-    { num: DATA.reflections?.length || 0, label: 'Reflections' },
+    { num: DATA.counts?.experiences || 0, label: 'Experiences' },
+    { num: DATA.counts?.reflections || 0, label: 'Reflections' },
     { num: DATA.soul_tree?.length || 0, label: 'Sections' }
   ];
   bar.innerHTML = stats.map(s => `<div class="stat"><div class="num">${s.num}</div><div class="label">${s.label}</div></div>`).join('');
@@ -92,12 +158,17 @@ function renderSoulTree() {
 function renderFeed() {
   const container = document.getElementById('exp-feed');
   if (!container) return;
-  container.innerHTML = (DATA.experiences || []).slice(-10).reverse().map(e => `
-    <div class="exp-entry">
-      <small>${esc(e.source)}</small>
-      <p>${esc(e.content)}</p>
-    </div>
-  `).join('') || 'No experiences yet.';
+  if (!DATA.experiences) container.innerHTML = 'Loading experiences...';
+  loadSection('experiences').then(experiences => {
+    DATA.counts = { ...DATA.counts, experiences: experiences.length };
+    renderStats();
+    container.innerHTML = experiences.slice(-10).reverse().map(e => `
+      <div class="exp-entry">
+        <small>${esc(e.source)}</small>
+        <p>${esc(e.content)}</p>
+      </div>
+    `).join('') || 'No experiences yet.';
+  }).catch(() => { container.innerHTML = 'Error loading experiences.'; });
 }
 
 function renderVitals() {
@@ -136,3 +207,7 @@ window.switchTab = switchTab;
 window.initDashboard = initDashboard;
 window.showToast = showToast;
 window.esc = esc;
+window.GenesisStream = GenesisStream;
+window.watchDocument = watchDocument;
+window.loadSection = loadSection;
+window.invalidateSection = invalidateSection;
@@ -81,6 +81,16 @@ def count_unreflected(jsonl_path):
     return count
 
 
+def load_record_index(memory_dir):
+    """The dashboard's record index (tools/core/record_index.py), read-only; None if the tools are not installed."""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tools'))
+    try:
+        from core.record_index import RecordIndex
+        return RecordIndex(memory_dir, read_only=True)
+    except (ImportError, OSError):
+        return None
+
+
 def validate(memory_dir, since_minutes=30):
     errors = []
     warnings = []
@@ -116,8 +126,15 @@ def validate(memory_dir, since_minutes=30):
     # 2. Notable/pivotal promotion to significant.jsonl
     # ========================================
     sig_file = os.path.join(memory_dir, 'significant', 'significant.jsonl')
-    notable_count = count_significance(today_file, 'notable') if os.path.exists(today_file) else 0
-    pivotal_count = count_significance(today_file, 'pivotal') if os.path.exists(today_file) else 0
+    index = load_record_index(memory_dir) if os.path.isdir(exp_dir) else None
+    today_prefix = os.path.join('experiences', f'{today_str}.jsonl')
+    if index is not None:
+        # Counts every record line, duplicated ids and records without an id included
+        notable_count = index.count('notable', prefix=today_prefix)
+        pivotal_count = index.count('pivotal', prefix=today_prefix)
+    else:
+        notable_count = count_significance(today_file, 'notable') if os.path.exists(today_file) else 0
+        pivotal_count = count_significance(today_file, 'pivotal') if os.path.exists(today_file) else 0
     findings['notable_today'] = notable_count
     findings['pivotal_today'] = pivotal_count
 
@@ -136,7 +153,10 @@ def validate(memory_dir, since_minutes=30):
     unreflected_pivotal = 0
 
     # Check across all experience files, not just today
-    if os.path.isdir(exp_dir):
+    if index is not None:
+        unreflected_notable = index.count('notable', False, 'experiences' + os.sep)
+        unreflected_pivotal = index.count('pivotal', False, 'experiences' + os.sep)
+    elif os.path.isdir(exp_dir):
         for exp_file in glob.glob(os.path.join(exp_dir, '*.jsonl')):
             if os.path.exists(exp_file):
                 with open(exp_file) as f:
@@ -29,11 +29,26 @@ REQUIRED_FIELDS = {
 REQUIRED_DECISION_FIELDS = {'should_propose', 'triggers_fired', 'reasoning'}
 
 
+def load_record_index(memory_dir):
+    """The dashboard's record index (tools/core/record_index.py), read-only; None if the tools are not installed."""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tools'))
+    try:
+        from core.record_index import RecordIndex
+        return RecordIndex(memory_dir, read_only=True)
+    except (ImportError, OSError):
+        return None
+
+
 def load_experience_ids(exp_dir):
     """Load all known experience IDs from experience files."""
     known = set()
     if not exp_dir or not os.path.isdir(exp_dir):
         return None  # Can't verify — return None to skip check
+    exp_dir = os.path.abspath(exp_dir)
+    if os.path.basename(exp_dir) == 'experiences':
+        index = load_record_index(os.path.dirname(exp_dir))
+        if index is not None:
+            return set(index.ids(prefix='experiences' + os.sep))
     for filepath in glob.glob(os.path.join(exp_dir, '*.jsonl')):
         try:
             with open(filepath) as f: